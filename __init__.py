@@ -4,8 +4,12 @@ MyStrategy Strategy Package.
 Generated by: almanak strat new
 """
 
+from .portfolio import PortfolioStrategy
+from .screener import ScreenerStrategy
 from .strategy import MyStrategyStrategy
 
 __all__ = [
     "MyStrategyStrategy",
+    "PortfolioStrategy",
+    "ScreenerStrategy",
 ]
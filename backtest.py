@@ -0,0 +1,349 @@
+"""
+Offline backtest engine for MyStrategyStrategy.
+
+``run_backtest`` scans price/RSI arrays with NumPy to find the bars where
+``decide()`` can change state, and only calls the real ``decide()`` on those
+bars.  ``replay_backtest`` calls ``decide()`` on every bar and is the
+reference the vectorized engine must agree with.
+"""
+
+import contextlib
+import os
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable
+
+import numpy as np
+
+from .indicators import closed_candle_rsi
+from .strategy import MyStrategyStrategy
+
+_EPS = 1e-9
+_MIN_SCAN_WINDOW = 1024
+
+
+@dataclass
+class BacktestTrade:
+    side: str
+    index: int
+    ts: int
+    price: Decimal
+    base_amount: Decimal
+    quote_amount: Decimal
+    max_slippage: Decimal
+    trigger: str | None
+    filled: bool
+
+
+@dataclass
+class BacktestResult:
+    trades: list[BacktestTrade]
+    quote_balance: Decimal
+    base_balance: Decimal
+    final_value_usd: Decimal
+    starting_capital_usd: Decimal
+    decide_calls: int
+    bars: int
+
+    @property
+    def total_profit_usd(self) -> Decimal:
+        return self.final_value_usd - self.starting_capital_usd
+
+    @property
+    def filled_trades(self) -> list[BacktestTrade]:
+        return [trade for trade in self.trades if trade.filled]
+
+
+class ReplayMarket:
+    """Market stand-in that serves one bar of historical data at a time."""
+
+    def __init__(
+        self,
+        strategy: MyStrategyStrategy,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        rsi: np.ndarray,
+        quote_balance: Decimal,
+        base_balance: Decimal = Decimal("0"),
+    ) -> None:
+        self.chain = strategy.chain
+        self.wallet_address = strategy.wallet_address
+        self.timestamps = timestamps
+        self.prices = prices
+        self.rsi_values = rsi
+        self.index = 0
+        self.quote_balance = quote_balance
+        self.base_balance = base_balance
+        self._price_ids = {strategy.base_token_price_id, strategy.base_token_symbol, strategy.base_token_address}
+        self._base_ids = {strategy.base_token_symbol, strategy.base_token_balance_id, strategy.base_token_address}
+        self._quote_ids = {strategy.quote_token_symbol, strategy.quote_token, strategy.quote_token_address}
+        self._price_ids.discard("")
+        self._base_ids.discard("")
+        self._quote_ids.discard("")
+
+    def now(self) -> float:
+        return float(self.timestamps[self.index])
+
+    def price(self, token: str) -> float:
+        if token not in self._price_ids:
+            raise KeyError(f"No price history for {token}")
+        return float(self.prices[self.index])
+
+    def balance(self, token: str) -> Decimal:
+        if token in self._quote_ids:
+            return self.quote_balance
+        if token in self._base_ids:
+            return self.base_balance
+        raise KeyError(f"No balance for {token}")
+
+    def rsi(self, token: str, period: int = 14, timeframe: str = "1h") -> float | None:
+        value = float(self.rsi_values[self.index])
+        return None if np.isnan(value) else value
+
+
+class _Simulation:
+    def __init__(
+        self,
+        strategy: MyStrategyStrategy,
+        timestamps: Any,
+        prices: Any,
+        rsi: Any | None,
+        initial_quote_usd: Decimal | None,
+        initial_base: Decimal,
+        fee_pct: Decimal,
+        swap_fails: Any | None,
+    ) -> None:
+        self.strategy = strategy
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        if self.timestamps.shape != self.prices.shape:
+            raise ValueError("timestamps and prices must have the same length")
+        if rsi is None:
+            rsi = closed_candle_rsi(self.timestamps, self.prices, strategy.rsi_period, strategy.rsi_timeframe)
+        self.rsi = np.asarray(rsi, dtype=np.float64)
+        if self.rsi.shape != self.prices.shape:
+            raise ValueError("rsi must have the same length as prices")
+        self.swap_fails = None if swap_fails is None else np.asarray(swap_fails, dtype=bool)
+        self.fee_pct = fee_pct
+        self.n = int(self.prices.shape[0])
+        self.live = (self.prices > 0) & ~np.isnan(self.rsi)
+        quote = strategy.starting_capital_usd if initial_quote_usd is None else initial_quote_usd
+        self.market = ReplayMarket(strategy, self.timestamps, self.prices, self.rsi, quote, initial_base)
+        self.trades: list[BacktestTrade] = []
+        self.decide_calls = 0
+        self.candles_fed = 0
+        strategy._clock = self.market.now
+
+    def step(self, index: int) -> BacktestTrade | None:
+        self.market.index = index
+        strategy = self.strategy
+        if index > self.candles_fed:
+            # decide() only runs on candidate bars; the bars skipped in between still build candles
+            # and advance the local RSI, exactly as decide() would have on each of them.
+            skipped = slice(self.candles_fed, index)
+            if strategy._candles is not None:
+                strategy._candles.update_many(self.timestamps[skipped], self.prices[skipped])
+            if strategy._local_rsi is not None:
+                strategy._local_rsi.update_many(self.timestamps[skipped], self.prices[skipped])
+        self.candles_fed = index + 1
+        intent = self.strategy.decide(self.market)
+        self.decide_calls += 1
+        if getattr(intent, "from_token", None) is None:
+            return None
+        trade = self._fill(intent, index)
+        self.trades.append(trade)
+        return trade
+
+    def _fill(self, intent: Any, index: int) -> BacktestTrade:
+        strategy = self.strategy
+        market = self.market
+        price = strategy._to_decimal(float(self.prices[index]), Decimal("0"))
+        filled = self.swap_fails is None or not bool(self.swap_fails[index])
+        keep = Decimal("1") - self.fee_pct
+        if intent.from_token == strategy.quote_token:
+            quote_amount = strategy._to_decimal(intent.amount_usd, Decimal("0"))
+            base_amount = quote_amount * keep / price
+            if filled:
+                market.quote_balance -= quote_amount
+                market.base_balance += base_amount
+            side, trigger = "buy", None
+        else:
+            base_amount = strategy._to_decimal(intent.amount, Decimal("0"))
+            quote_amount = base_amount * price * keep
+            if filled:
+                market.base_balance -= base_amount
+                market.quote_balance += quote_amount
+            side, trigger = "sell", strategy._last_exit_reason
+        return BacktestTrade(
+            side=side,
+            index=index,
+            ts=int(self.timestamps[index]),
+            price=price,
+            base_amount=base_amount,
+            quote_amount=quote_amount,
+            max_slippage=strategy._to_decimal(intent.max_slippage, Decimal("0")),
+            trigger=trigger,
+            filled=filled,
+        )
+
+    def entry_blocked_while_flat(self) -> bool:
+        # With no base dust the buy size cannot change until a trade happens,
+        # so a size or gas-guard rejection holds for the rest of the run.
+        strategy = self.strategy
+        if self.market.base_balance != 0:
+            return False
+        buy_amount_usd = strategy._compute_buy_amount_usd(self.market.quote_balance)
+        if buy_amount_usd < strategy.min_trade_amount_usd:
+            return True
+        return not strategy._entry_passes_gas_guard(buy_amount_usd)[0]
+
+    def next_candidate(self, start: int) -> int:
+        strategy = self.strategy
+        if self.market.base_balance < strategy.min_base_position:
+            return self._scan(start, self._flat_mask())
+        if strategy._entry_price is None:
+            return self._scan(start, lambda lo, hi: self.live[lo:hi])
+        if strategy._last_exit_attempt_ts is not None:
+            retry_ts = strategy._last_exit_attempt_ts + strategy._thresholds.exit_retry_cooldown_seconds
+            start = max(start, int(np.searchsorted(self.timestamps, retry_ts, side="left")))
+        return self._scan(start, self._position_mask())
+
+    def _flat_mask(self) -> Callable[[int, int], np.ndarray]:
+        strategy = self.strategy
+        buy_rsi = float(strategy.buy_rsi) + _EPS
+        ready_ts = None
+        if strategy._last_buy_ts is not None:
+            ready_ts = strategy._last_buy_ts + strategy._thresholds.cooldown_seconds
+
+        def mask(lo: int, hi: int) -> np.ndarray:
+            hits = self.live[lo:hi] & (self.rsi[lo:hi] < buy_rsi)
+            if ready_ts is not None:
+                hits &= self.timestamps[lo:hi] >= ready_ts
+            return hits
+
+        return mask
+
+    def _position_mask(self) -> Callable[[int, int], np.ndarray]:
+        strategy = self.strategy
+        levels = strategy.get_trigger_levels()
+        if levels is None:
+            return lambda lo, hi: self.live[lo:hi]
+        entry = float(levels.entry_price)
+        base = float(self.market.base_balance)
+        take_profit_price = float(levels.take_profit_price) * (1 - _EPS)
+        stop_loss_price = None
+        if levels.stop_loss_price is not None:
+            stop_loss_price = float(levels.stop_loss_price) * (1 + _EPS)
+        required = float(strategy._thresholds.exit_required_profit_usd)
+        required -= _EPS * max(1.0, abs(required))
+        deadline_ts = levels.deadline_ts
+
+        def mask(lo: int, hi: int) -> np.ndarray:
+            prices = self.prices[lo:hi]
+            if strategy.enable_gas_guard:
+                guard_ok = base * (prices - entry) >= required
+            else:
+                guard_ok = np.ones_like(prices, dtype=bool)
+            hits = (prices >= take_profit_price) & guard_ok
+            if stop_loss_price is not None:
+                hits |= prices <= stop_loss_price
+            if deadline_ts is not None:
+                hits |= (self.timestamps[lo:hi] >= deadline_ts) & (prices > entry * (1 - _EPS)) & guard_ok
+            return hits & self.live[lo:hi]
+
+        return mask
+
+    def _scan(self, start: int, mask: Callable[[int, int], np.ndarray]) -> int:
+        width = _MIN_SCAN_WINDOW
+        while start < self.n:
+            stop = min(self.n, start + width)
+            hits = np.flatnonzero(mask(start, stop))
+            if hits.size:
+                return start + int(hits[0])
+            start = stop
+            width *= 2
+        return self.n
+
+    def result(self) -> BacktestResult:
+        market = self.market
+        last_price = Decimal("0")
+        if self.n:
+            last_price = self.strategy._to_decimal(float(self.prices[-1]), Decimal("0"))
+        return BacktestResult(
+            trades=self.trades,
+            quote_balance=market.quote_balance,
+            base_balance=market.base_balance,
+            final_value_usd=market.quote_balance + market.base_balance * last_price,
+            starting_capital_usd=self.strategy.starting_capital_usd,
+            decide_calls=self.decide_calls,
+            bars=self.n,
+        )
+
+
+def _make_strategy(strategy: MyStrategyStrategy | dict[str, Any]) -> MyStrategyStrategy:
+    if isinstance(strategy, MyStrategyStrategy):
+        return strategy
+    return MyStrategyStrategy(config=strategy, chain=str(strategy.get("chain", "base")))
+
+
+@contextlib.contextmanager
+def _maybe_quiet(quiet: bool):
+    if not quiet:
+        yield
+        return
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        yield
+
+
+def run_backtest(
+    strategy: MyStrategyStrategy | dict[str, Any],
+    timestamps: Any,
+    prices: Any,
+    rsi: Any | None = None,
+    *,
+    initial_quote_usd: Decimal | None = None,
+    initial_base: Decimal = Decimal("0"),
+    fee_pct: Decimal = Decimal("0"),
+    swap_fails: Any | None = None,
+    quiet: bool = True,
+) -> BacktestResult:
+    sim = _Simulation(
+        _make_strategy(strategy), timestamps, prices, rsi, initial_quote_usd, initial_base, fee_pct, swap_fails
+    )
+    with _maybe_quiet(quiet):
+        index = 0
+        force_next = False
+        while index < sim.n:
+            if not force_next:
+                index = sim.next_candidate(index)
+                if index >= sim.n:
+                    break
+            trade = sim.step(index)
+            # The tick after any swap settles entry tracking, so it always runs.
+            force_next = trade is not None
+            if trade is None and sim.market.base_balance < sim.strategy.min_base_position:
+                if sim.entry_blocked_while_flat():
+                    break
+            index += 1
+    return sim.result()
+
+
+def replay_backtest(
+    strategy: MyStrategyStrategy | dict[str, Any],
+    timestamps: Any,
+    prices: Any,
+    rsi: Any | None = None,
+    *,
+    initial_quote_usd: Decimal | None = None,
+    initial_base: Decimal = Decimal("0"),
+    fee_pct: Decimal = Decimal("0"),
+    swap_fails: Any | None = None,
+    quiet: bool = True,
+) -> BacktestResult:
+    sim = _Simulation(
+        _make_strategy(strategy), timestamps, prices, rsi, initial_quote_usd, initial_base, fee_pct, swap_fails
+    )
+    with _maybe_quiet(quiet):
+        for index in range(sim.n):
+            sim.step(index)
+    return sim.result()
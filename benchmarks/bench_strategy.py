@@ -0,0 +1,352 @@
+"""
+Reproducible microbenchmarks and load tests for MyStrategyStrategy.
+
+Run from the directory that contains the strategy package:
+
+    python -m my_strategy.benchmarks.bench_strategy --save-baseline
+    python -m my_strategy.benchmarks.bench_strategy --check
+
+``--check`` exits non-zero when any benchmark is slower than the stored
+baseline by more than ``--tolerance``, or allocates more per op than it by
+more than ``--alloc-tolerance``.  A baseline recorded on the reference
+machine is committed as ``benchmarks/baseline.json``.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from ..backtest import replay_backtest, run_backtest
+from ..strategy import MyStrategyStrategy
+from ..tape import TapeMarket, replay_tape
+
+NOW_TS = 1_700_000_000
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+class FastMarket:
+    """Deterministic market stand-in with plain attribute reads and no mocking overhead."""
+
+    def __init__(
+        self,
+        price: Decimal = Decimal("0.01"),
+        rsi: Decimal | None = Decimal("60"),
+        quote_balance: Decimal = Decimal("100"),
+        base_balance: Decimal = Decimal("0"),
+    ) -> None:
+        self.chain = "base"
+        self.price_value = price
+        self.rsi_value = rsi
+        self.quote_balance = quote_balance
+        self.base_balance = base_balance
+
+    def price(self, token: str) -> Decimal:
+        return self.price_value
+
+    def balance(self, token: str) -> Decimal:
+        if token in ("USDC", "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"):
+            return self.quote_balance
+        return self.base_balance
+
+    def rsi(self, token: str, period: int = 14, timeframe: str = "1h") -> Decimal | None:
+        return self.rsi_value
+
+
+@dataclass
+class Scenario:
+    name: str
+    expect: str
+    market: FastMarket
+    prepare: Callable[[MyStrategyStrategy], None]
+
+
+def _config() -> dict[str, Any]:
+    with open(Path(__file__).parent.parent / "config.json") as f:
+        cfg = json.load(f)
+    cfg.update(
+        {
+            "starting_capital_usd": 100,
+            "trade_amount_usd": 10,
+            "max_trade_amount_usd": 10,
+            "event_log_path": "",
+            "event_log_echo": False,
+            "event_log_hold_repeat_seconds": 0,
+        }
+    )
+    return cfg
+
+
+def _position(entry: str, entry_age_s: int = 600, exit_attempt_age_s: int | None = None):
+    def prepare(strategy: MyStrategyStrategy) -> None:
+        strategy._entry_price = Decimal(entry)
+        strategy._entry_ts = NOW_TS - entry_age_s
+        strategy._last_buy_ts = NOW_TS - entry_age_s
+        strategy._last_exit_attempt_ts = None if exit_attempt_age_s is None else NOW_TS - exit_attempt_age_s
+        strategy._last_exit_reason = None if exit_attempt_age_s is None else "stop_loss"
+
+    return prepare
+
+
+def _flat(last_buy_age_s: int | None = None):
+    def prepare(strategy: MyStrategyStrategy) -> None:
+        strategy._entry_price = None
+        strategy._entry_ts = None
+        strategy._last_buy_ts = None if last_buy_age_s is None else NOW_TS - last_buy_age_s
+        strategy._last_exit_attempt_ts = None
+        strategy._last_exit_reason = None
+
+    return prepare
+
+
+def scenarios() -> list[Scenario]:
+    holding = Decimal("1000")
+    return [
+        Scenario("no_price", "No price", FastMarket(price=Decimal("0")), _flat()),
+        Scenario("no_rsi", "No RSI", FastMarket(rsi=None), _flat()),
+        Scenario("cooldown", "Cooldown active", FastMarket(rsi=Decimal("20")), _flat(last_buy_age_s=60)),
+        Scenario("no_entry", "No entry", FastMarket(), _flat()),
+        Scenario("buy", "buy", FastMarket(rsi=Decimal("20")), _flat()),
+        Scenario("hold_in_position", "Holding", FastMarket(base_balance=holding), _position("0.01")),
+        Scenario("take_profit", "take_profit", FastMarket(base_balance=holding), _position("0.0095")),
+        Scenario("stop_loss", "stop_loss", FastMarket(base_balance=holding), _position("0.0105")),
+        Scenario(
+            "time_exit",
+            "time_exit",
+            FastMarket(base_balance=holding),
+            _position("0.00998", entry_age_s=1_000_000),
+        ),
+        Scenario(
+            "exit_cooldown",
+            "Exit cooldown active",
+            FastMarket(base_balance=holding),
+            _position("0.0105", exit_attempt_age_s=30),
+        ),
+    ]
+
+
+def make_strategy(config: dict[str, Any] | None = None) -> MyStrategyStrategy:
+    strategy = MyStrategyStrategy(config=config or _config(), chain="base", wallet_address="0x" + "1" * 40)
+    strategy._clock = lambda: NOW_TS
+    return strategy
+
+
+def outcome(strategy: MyStrategyStrategy, intent: Any) -> str:
+    """Branch label for an intent: trigger label for sells, "buy" for buys, else the hold reason."""
+    if getattr(intent, "from_token", None) is None:
+        return str(getattr(intent, "reason", ""))
+    if intent.from_token == strategy.quote_token:
+        return "buy"
+    return str(strategy._last_exit_reason)
+
+
+def _best_of(repeats: int, iterations: int, body: Callable[[], None]) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            body()
+        best = min(best, time.perf_counter() - started)
+    return iterations / best
+
+
+def _peak_bytes(body: Callable[[], None], iterations: int = 50) -> int:
+    body()
+    tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            body()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_branches(iterations: int, repeats: int) -> dict[str, dict[str, float]]:
+    results = {}
+    for scenario in scenarios():
+        strategy = make_strategy()
+
+        def tick(strategy: MyStrategyStrategy = strategy, scenario: Scenario = scenario) -> None:
+            scenario.prepare(strategy)
+            strategy.decide(scenario.market)
+
+        scenario.prepare(strategy)
+        label = outcome(strategy, strategy.decide(scenario.market))
+        if scenario.expect not in label:
+            raise RuntimeError(f"Scenario {scenario.name} hit {label!r}, expected {scenario.expect!r}")
+        results[f"decide.{scenario.name}"] = {
+            "ops_per_sec": _best_of(repeats, iterations, tick),
+            "peak_bytes_per_op": _peak_bytes(tick),
+        }
+    return results
+
+
+def bench_helpers(iterations: int, repeats: int) -> dict[str, dict[str, float]]:
+    strategy = make_strategy()
+    amount = Decimal("10")
+    helpers: dict[str, Callable[[], Any]] = {
+        "to_decimal.float": lambda: strategy._to_decimal(0.0123456789, Decimal("0")),
+        "to_decimal.decimal": lambda: strategy._to_decimal(amount, Decimal("0")),
+        "compute_buy_amount_usd": lambda: strategy._compute_buy_amount_usd(Decimal("100")),
+        "entry_gas_guard": lambda: strategy._entry_passes_gas_guard(amount),
+        "exit_gas_guard": lambda: strategy._exit_passes_gas_guard(Decimal("0.01")),
+        "get_status": strategy.get_status,
+    }
+    return {
+        name: {"ops_per_sec": _best_of(repeats, iterations, call), "peak_bytes_per_op": _peak_bytes(call)}
+        for name, call in helpers.items()
+    }
+
+
+def bench_replay(ticks: int, replay_ticks: int) -> dict[str, dict[str, float]]:
+    rng = np.random.default_rng(42)
+    timestamps = NOW_TS + 60 * np.arange(ticks, dtype=np.int64)
+    prices = np.round(0.01 * np.exp(np.cumsum(rng.normal(0.0, 0.002, ticks))), 8)
+    cfg = {**_config(), "rsi_timeframe": "15m", "buy_rsi": 45}
+
+    started = time.perf_counter()
+    run_backtest(dict(cfg), timestamps, prices)
+    vectorized = ticks / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    replay_backtest(dict(cfg), timestamps[:replay_ticks], prices[:replay_ticks])
+    replayed = replay_ticks / (time.perf_counter() - started)
+    return {
+        "replay.vectorized": {"ops_per_sec": vectorized},
+        "replay.decide_every_tick": {"ops_per_sec": replayed},
+    }
+
+
+def bench_tape(tape_ticks: int) -> dict[str, dict[str, float]]:
+    """Record ``tape_ticks`` live ticks, then time tape lookups alone and full replay through decide()."""
+    rng = np.random.default_rng(7)
+    prices = np.round(0.01 * np.exp(np.cumsum(rng.normal(0.0, 0.002, tape_ticks))), 8)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.tape")
+        live = make_strategy({**_config(), "market_tape_path": path, "cooldown_minutes": 0})
+        market = FastMarket(rsi=Decimal("40"))
+        now = [NOW_TS]
+        live._clock = lambda: now[0]
+        for price in prices:
+            now[0] += 60
+            market.price_value = Decimal(str(price))
+            live.decide(market)
+        live._tape.close()
+
+        tape = TapeMarket(path)
+        base, quote = live.base_token_symbol, live.quote_token_symbol
+        started = time.perf_counter()
+        for tick in range(tape.ticks):
+            tape.select(tick)
+            tape.price(base)
+            tape.balance(quote)
+        lookup = tape.ticks / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for _ in replay_tape(make_strategy({**_config(), "cooldown_minutes": 0}), path):
+            pass
+        replayed = tape.ticks / (time.perf_counter() - started)
+    return {"tape.lookup": {"ops_per_sec": lookup}, "tape.replay": {"ops_per_sec": replayed}}
+
+
+def run(
+    iterations: int = 2000,
+    repeats: int = 5,
+    ticks: int = 2_000_000,
+    replay_ticks: int = 100_000,
+    tape_ticks: int = 20_000,
+) -> dict:
+    results: dict[str, dict[str, float]] = {}
+    results.update(bench_branches(iterations, repeats))
+    results.update(bench_helpers(iterations * 10, repeats))
+    results.update(bench_replay(ticks, replay_ticks))
+    results.update(bench_tape(tape_ticks))
+    return {
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+# Allocation peaks of a few hundred bytes move with interpreter internals, so growth below this is ignored.
+ALLOC_SLACK_BYTES = 512
+
+
+def compare(current: dict, baseline: dict, tolerance: float, alloc_tolerance: float = 0.2) -> list[str]:
+    regressions = []
+    for name, stats in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        floor = base["ops_per_sec"] * (1 - tolerance)
+        if stats["ops_per_sec"] < floor:
+            regressions.append(
+                f"{name}: {stats['ops_per_sec']:.0f} ops/s < {floor:.0f} "
+                f"(baseline {base['ops_per_sec']:.0f}, tolerance {tolerance:.0%})"
+            )
+        peak, base_peak = stats.get("peak_bytes_per_op"), base.get("peak_bytes_per_op")
+        if peak is None or base_peak is None:
+            continue
+        ceiling = max(base_peak * (1 + alloc_tolerance), base_peak + ALLOC_SLACK_BYTES)
+        if peak > ceiling:
+            regressions.append(
+                f"{name}: {peak:.0f} B/op > {ceiling:.0f} "
+                f"(baseline {base_peak:.0f}, tolerance {alloc_tolerance:.0%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="MyStrategyStrategy benchmarks")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--alloc-tolerance", type=float, default=0.2)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--ticks", type=int, default=2_000_000)
+    parser.add_argument("--replay-ticks", type=int, default=100_000)
+    parser.add_argument("--tape-ticks", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    report = run(args.iterations, args.repeats, args.ticks, args.replay_ticks, args.tape_ticks)
+    for name, stats in report["results"].items():
+        peak = stats.get("peak_bytes_per_op")
+        suffix = f"  peak={peak / 1024:.1f}KiB" if peak is not None else ""
+        print(f"[BENCH] {name:<28} {stats['ops_per_sec']:>14,.0f} ops/s{suffix}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[BENCH] baseline saved to {args.baseline}")
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline.get("python"), baseline.get("machine")) != (report["python"], report["machine"]):
+            print(
+                f"[BENCH] baseline is from python {baseline.get('python')} on {baseline.get('machine')}; "
+                "timings may not be comparable, re-record with --save-baseline"
+            )
+        regressions = compare(report, baseline, args.tolerance, args.alloc_tolerance)
+        for line in regressions:
+            print(f"[REGRESSION] {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
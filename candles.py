@@ -0,0 +1,191 @@
+"""
+Fixed-size multi-timeframe candle buffers built from price ticks.
+
+Each timeframe keeps its closed bars in preallocated NumPy ring buffers, so
+memory is fixed at construction (``CandleStore.nbytes``) no matter how long the
+strategy runs.  Ticks are bucketed into every timeframe as they arrive, and
+indicators are computed from the buffers instead of being fetched again.
+"""
+
+from typing import Any, Iterable
+
+import numpy as np
+
+from .indicators import timeframe_seconds, wilder_rsi
+
+_OPEN, _HIGH, _LOW, _CLOSE = range(4)
+
+
+class CandleSeries:
+    """Ring buffer of the last ``capacity`` closed OHLC bars for one timeframe, plus the forming bar."""
+
+    __slots__ = ("timeframe", "bucket_seconds", "capacity", "starts", "bars", "head", "count", "current", "_rsi")
+
+    def __init__(self, timeframe: str, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("Candle capacity must be positive")
+        self.timeframe = timeframe
+        self.bucket_seconds = timeframe_seconds(timeframe)
+        self.capacity = int(capacity)
+        self.starts = np.zeros(self.capacity, dtype=np.int64)
+        self.bars = np.zeros((4, self.capacity))
+        self.head = 0
+        self.count = 0
+        # Forming bar as [start, open, high, low, close]; None before the first tick.
+        self.current: list[Any] | None = None
+        self._rsi: dict[int, float | None] = {}
+
+    def _push(self, starts: np.ndarray, bars: np.ndarray) -> None:
+        size = starts.shape[0]
+        if size == 0:
+            return
+        if size > self.capacity:
+            starts, bars = starts[-self.capacity :], bars[:, -self.capacity :]
+            size = self.capacity
+        index = (self.head + np.arange(size)) % self.capacity
+        self.starts[index] = starts
+        self.bars[:, index] = bars
+        self.head = (self.head + size) % self.capacity
+        self.count = min(self.capacity, self.count + size)
+        self._rsi.clear()
+
+    def _close_current(self) -> None:
+        start, open_, high, low, close = self.current
+        self._push(np.array([start]), np.array([[open_], [high], [low], [close]]))
+
+    def update(self, ts: int, price: float) -> bool:
+        """Feed one tick; returns True when it closed a bar."""
+        if not price > 0:
+            return False
+        bucket = ts - ts % self.bucket_seconds
+        current = self.current
+        if current is not None:
+            if bucket < current[0]:
+                return False
+            if bucket == current[0]:
+                current[2] = max(current[2], price)
+                current[3] = min(current[3], price)
+                current[4] = price
+                return False
+            self._close_current()
+        self.current = [bucket, price, price, price, price]
+        return current is not None
+
+    def update_many(self, timestamps: Any, prices: Any) -> int:
+        """Feed ticks in time order in one vectorized pass; returns the number of bars closed."""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        buckets = timestamps - timestamps % self.bucket_seconds
+        keep = prices > 0
+        if self.current is not None:
+            keep &= buckets >= self.current[0]
+        buckets, prices = buckets[keep], prices[keep]
+        if buckets.shape[0] == 0:
+            return 0
+        first = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        last = np.r_[first[1:], buckets.shape[0]] - 1
+        group_starts = buckets[first]
+        groups = np.vstack(
+            (prices[first], np.maximum.reduceat(prices, first), np.minimum.reduceat(prices, first), prices[last])
+        )
+        closed = 0
+        skip = 0
+        if self.current is not None:
+            if group_starts[0] == self.current[0]:
+                self.current[2] = max(self.current[2], float(groups[_HIGH, 0]))
+                self.current[3] = min(self.current[3], float(groups[_LOW, 0]))
+                self.current[4] = float(groups[_CLOSE, 0])
+                skip = 1
+            if skip < group_starts.shape[0]:
+                self._close_current()
+                closed += 1
+        if skip < group_starts.shape[0]:
+            self._push(group_starts[skip:-1], groups[:, skip:-1])
+            closed += group_starts.shape[0] - 1 - skip
+            self.current = [int(group_starts[-1]), *(float(value) for value in groups[:, -1])]
+        return closed
+
+    def seed(self, closes: Iterable[float]) -> None:
+        """Load closed bars from candle history; only closes are known, so O/H/L are set to the close."""
+        closes = np.asarray(list(closes), dtype=np.float64)
+        self.head = 0
+        self.count = 0
+        self.current = None
+        self._push(np.full(closes.shape[0], -1, dtype=np.int64), np.tile(closes, (4, 1)))
+
+    def _ordered(self, row: np.ndarray) -> np.ndarray:
+        if self.count < self.capacity:
+            return row[: self.count]
+        return np.concatenate((row[self.head :], row[: self.head]))
+
+    def closes(self) -> np.ndarray:
+        """Closed-bar closes, oldest first."""
+        return self._ordered(self.bars[_CLOSE])
+
+    def ohlc(self) -> dict[str, np.ndarray]:
+        return {
+            "start": self._ordered(self.starts),
+            "open": self._ordered(self.bars[_OPEN]),
+            "high": self._ordered(self.bars[_HIGH]),
+            "low": self._ordered(self.bars[_LOW]),
+            "close": self.closes(),
+        }
+
+    def rsi(self, period: int) -> float | None:
+        """Wilder RSI over the closed bars; recomputed only after a new bar closes."""
+        if period not in self._rsi:
+            closes = self.closes()
+            value = float(wilder_rsi(closes, period)[-1]) if closes.shape[0] > period else float("nan")
+            self._rsi[period] = None if np.isnan(value) else value
+        return self._rsi[period]
+
+    @property
+    def nbytes(self) -> int:
+        return self.starts.nbytes + self.bars.nbytes
+
+
+class CandleStore:
+    """CandleSeries for several timeframes of one token, fed from the same tick stream."""
+
+    def __init__(self, timeframes: Iterable[str], capacity: int = 250) -> None:
+        series = {}
+        for timeframe in timeframes:
+            key = str(timeframe).strip().lower()
+            series.setdefault(key, CandleSeries(key, capacity))
+        if not series:
+            raise ValueError("CandleStore needs at least one timeframe")
+        self._series = dict(sorted(series.items(), key=lambda item: item[1].bucket_seconds))
+
+    @property
+    def timeframes(self) -> tuple[str, ...]:
+        return tuple(self._series)
+
+    def __contains__(self, timeframe: str) -> bool:
+        return str(timeframe).strip().lower() in self._series
+
+    def series(self, timeframe: str) -> CandleSeries:
+        return self._series[str(timeframe).strip().lower()]
+
+    def update(self, ts: int, price: float) -> tuple[str, ...]:
+        """Feed one tick to every timeframe; returns the timeframes that closed a bar."""
+        return tuple(timeframe for timeframe, series in self._series.items() if series.update(ts, price))
+
+    def update_many(self, timestamps: Any, prices: Any) -> None:
+        for series in self._series.values():
+            series.update_many(timestamps, prices)
+
+    def rsi(self, timeframe: str, period: int) -> float | None:
+        return self.series(timeframe).rsi(period)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(series.nbytes for series in self._series.values())
+
+    def stats(self, period: int) -> dict[str, Any]:
+        return {
+            "nbytes": self.nbytes,
+            "timeframes": {
+                timeframe: {"bars": series.count, "rsi": series.rsi(period)}
+                for timeframe, series in self._series.items()
+            },
+        }
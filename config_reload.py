@@ -0,0 +1,192 @@
+"""
+Hot reload of trading parameters from config.json.
+
+A background thread watches the file's mtime, validates a changed file and
+parses it into an immutable mapping.  The strategy swaps the mapping in at the
+start of its next tick, so parsing never runs inside decide().
+"""
+
+import json
+import os
+import threading
+from decimal import Decimal, InvalidOperation
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+# Keys that can change on a running instance, with their validation rule:
+# (kind, lower bound, upper bound); bounds are inclusive and None means unbounded.
+RELOADABLE_KEYS: dict[str, tuple[str, float | None, float | None]] = {
+    "buy_rsi": ("number", 0, 100),
+    "trade_amount_usd": ("number", 0, None),
+    "max_trade_amount_usd": ("number", 0, None),
+    "min_trade_amount_usd": ("number", 0, None),
+    "min_quote_reserve_usd": ("number", 0, None),
+    "starting_capital_usd": ("number", 0, None),
+    "take_profit_pct": ("number", 0, None),
+    "stop_loss_pct": ("number", 0, 1),
+    "max_hold_minutes": ("int", 0, None),
+    "cooldown_minutes": ("int", 0, None),
+    "sell_fraction": ("number", 0, 1),
+    "min_base_position": ("number", 0, None),
+    "max_slippage": ("number", 0, 1),
+    "buy_max_slippage": ("number", 0, 1),
+    "sell_max_slippage": ("number", 0, 1),
+    "failed_exit_max_slippage": ("number", 0, 1),
+    "exit_retry_cooldown_minutes": ("int", 0, None),
+    "exit_escalation_window_minutes": ("int", 0, None),
+    "compound_profits": ("bool", None, None),
+    "compound_factor": ("number", 0, None),
+    "enable_gas_guard": ("bool", None, None),
+    "estimated_buy_gas_usd": ("number", 0, None),
+    "estimated_sell_gas_usd": ("number", 0, None),
+    "gas_safety_multiplier": ("number", 0, None),
+    "min_net_profit_usd": ("number", 0, None),
+    "enforce_profit_only_exit": ("bool", None, None),
+    "confirm_min_rsi": ("number", 0, 100),
+    "interval": ("int", 1, None),
+    "min_interval_seconds": ("int", 1, None),
+    "max_interval_seconds": ("int", 1, None),
+    "profile_ticks": ("int", 0, None),
+}
+
+
+class ConfigError(ValueError):
+    """Raised for a config that fails validation; the message lists every problem."""
+
+
+def validate_config(cfg: Mapping[str, Any]) -> list[str]:
+    problems = []
+    for key, (kind, low, high) in RELOADABLE_KEYS.items():
+        if key not in cfg:
+            continue
+        value = cfg[key]
+        if kind == "bool":
+            if not isinstance(value, bool):
+                problems.append(f"{key} must be true or false (got {value!r})")
+            continue
+        if isinstance(value, bool):
+            problems.append(f"{key} must be a number (got {value!r})")
+            continue
+        try:
+            number = Decimal(str(value))
+        except (InvalidOperation, ValueError):
+            problems.append(f"{key} must be a number (got {value!r})")
+            continue
+        if not number.is_finite():
+            problems.append(f"{key} must be finite (got {value!r})")
+            continue
+        if kind == "int" and number != number.to_integral_value():
+            problems.append(f"{key} must be a whole number (got {value!r})")
+            continue
+        if (low is not None and number < Decimal(str(low))) or (high is not None and number > Decimal(str(high))):
+            bounds = f"between {low} and {high}" if high is not None else f"at least {low}"
+            problems.append(f"{key} must be {bounds} (got {value!r})")
+    if "sell_fraction" in cfg and not problems and Decimal(str(cfg["sell_fraction"])) == 0:
+        problems.append("sell_fraction must be greater than 0")
+    return problems
+
+
+def reload_problems(cfg: Mapping[str, Any], baseline: Mapping[str, Any], partial: bool = False) -> list[str]:
+    """validate_config plus every key outside RELOADABLE_KEYS whose value differs from ``baseline``.
+
+    A full config (``partial=False``) also changes keys it leaves out; a partial one only those it sets.
+    """
+    problems = validate_config(cfg)
+    keys = set(cfg) if partial else set(cfg) | set(baseline)
+    fixed = sorted(key for key in keys if key not in RELOADABLE_KEYS and cfg.get(key) != baseline.get(key))
+    if fixed:
+        problems.append(f"changing {', '.join(fixed)} requires a restart")
+    return problems
+
+
+class ConfigWatcher:
+    """Polls ``path`` every ``poll_seconds``; changed files are validated and parsed off the tick path.
+
+    Keys outside ``RELOADABLE_KEYS`` must keep the value they had when the
+    watcher started, since they wire up tokens, files and components.  If the
+    file is missing or unreadable at start, ``baseline`` stands in for it and the
+    problem is reported through ``error`` like any later failed read.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        parse: Callable[[Mapping[str, Any]], dict[str, Any]],
+        poll_seconds: float = 2.0,
+        start: bool = True,
+        baseline: Mapping[str, Any] | None = None,
+    ) -> None:
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self.pending: Mapping[str, Any] | None = None
+        self.config: Mapping[str, Any] | None = None
+        self.error: str | None = None
+        self.reloads = 0
+        self.rejected = 0
+        self._parse = parse
+        self._lock = threading.Lock()
+        try:
+            self._mtime: int | None = os.stat(path).st_mtime_ns
+            self._baseline = self._read()
+        except (OSError, ValueError) as exc:
+            self._mtime = None
+            self._baseline = dict(baseline or {})
+            self.error = f"{path}: {exc}"
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        if start:
+            self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+            self._thread.start()
+
+    def _read(self) -> dict[str, Any]:
+        with open(self.path, encoding="utf-8") as f:
+            cfg = json.load(f)
+        if not isinstance(cfg, dict):
+            raise ConfigError(f"{self.path} must contain a JSON object")
+        return cfg
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            self.check()
+
+    def check(self) -> bool:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        try:
+            cfg = self._read()
+            problems = reload_problems(cfg, self._baseline)
+            if problems:
+                raise ConfigError("; ".join(problems))
+            parsed = MappingProxyType(self._parse(cfg))
+        except (OSError, ValueError) as exc:
+            with self._lock:
+                self.error = f"{self.path}: {exc}"
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.pending = parsed
+            self.config = MappingProxyType(cfg)
+            self.error = None
+            self.reloads += 1
+        return True
+
+    def take(self) -> tuple[Mapping[str, Any] | None, str | None]:
+        with self._lock:
+            pending, error = self.pending, self.error
+            self.pending = None
+            self.error = None
+        return pending, error
+
+    def stats(self) -> dict[str, Any]:
+        return {"path": self.path, "reloads": self.reloads, "rejected": self.rejected}
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+
@@ -0,0 +1,160 @@
+"""
+Structured, non-blocking event log for strategy status and actions.
+"""
+
+import atexit
+import json
+import queue
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+LEVELS = {"debug": 10, "status": 20, "hold": 20, "buy": 30, "sell": 30, "warn": 40, "error": 50}
+
+_open_sinks: "weakref.WeakSet[EventSink]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_sinks() -> None:
+    # Flush whatever is still queued when the process exits without the strategy being closed.
+    for sink in list(_open_sinks):
+        sink.close()
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    ts: float
+    kind: str
+    message: str
+    fields: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"ts": self.ts, "kind": self.kind, "message": self.message, **self.fields}
+
+
+class EventSink:
+    """Typed event records with level filtering, HOLD de-duplication and a recent-events ring.
+
+    With ``path`` set, events are pushed onto a bounded queue and a background
+    thread appends them to a JSONL file; a full queue drops the event rather
+    than blocking the caller.  ``close()`` flushes the queue; sinks still open
+    at interpreter exit are closed by an ``atexit`` hook.  With ``echo`` set, events are also printed in the
+    legacy ``[STATUS]`` / ``[ACTION]`` line format.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        level: str = "status",
+        echo: bool = True,
+        hold_repeat_seconds: float = 0.0,
+        queue_size: int = 10000,
+        recent_size: int = 100,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if level not in LEVELS:
+            raise ValueError(f"Unknown event level {level!r}; expected one of {', '.join(LEVELS)}")
+        self.path = path
+        self.level = level
+        self.echo = echo
+        self.hold_repeat_seconds = hold_repeat_seconds
+        self.emitted = 0
+        self.dropped = 0
+        self.suppressed = 0
+        self._min_level = LEVELS[level]
+        self._clock = clock
+        self._recent: deque[Event] = deque(maxlen=recent_size)
+        self._last_hold: tuple[str, float] | None = None
+        self._hold_repeats = 0
+        self._queue: queue.Queue[Event | None] | None = None
+        self._writer: threading.Thread | None = None
+        if path:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._writer = threading.Thread(
+                target=self._drain, args=(path, self._queue), name="event-log-writer", daemon=True
+            )
+            self._writer.start()
+            _open_sinks.add(self)
+
+    def enabled(self, kind: str) -> bool:
+        return LEVELS.get(kind, 0) >= self._min_level
+
+    def emit(self, kind: str, message: str, **fields: Any) -> bool:
+        if not self.enabled(kind):
+            return False
+        now = self._clock()
+        if kind == "hold" and self.hold_repeat_seconds > 0:
+            if self._last_hold is not None and self._last_hold[0] == message:
+                if now - self._last_hold[1] < self.hold_repeat_seconds:
+                    self._hold_repeats += 1
+                    self.suppressed += 1
+                    return False
+            if self._hold_repeats:
+                fields["repeats_suppressed"] = self._hold_repeats
+            self._last_hold = (message, now)
+            self._hold_repeats = 0
+        event = Event(ts=now, kind=kind, message=message, fields=fields)
+        self._recent.append(event)
+        self.emitted += 1
+        if self.echo:
+            if kind == "status":
+                print(f"[STATUS] {message}")
+            else:
+                print(f"[ACTION] {kind.upper()}: {message}")
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self.dropped += 1
+        return True
+
+    def recent(self, limit: int | None = None) -> list[dict[str, Any]]:
+        events = list(self._recent)
+        if limit is not None:
+            events = events[-limit:]
+        return [event.to_dict() for event in events]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "level": self.level,
+            "emitted": self.emitted,
+            "dropped": self.dropped,
+            "suppressed": self.suppressed,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    @staticmethod
+    def _drain(path: str, pending: "queue.Queue[Event | None]") -> None:
+        with open(path, "a", encoding="utf-8") as f:
+            while True:
+                event = pending.get()
+                batch = [event]
+                while len(batch) < 512:
+                    try:
+                        batch.append(pending.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(item is None for item in batch)
+                for item in batch:
+                    if item is not None:
+                        f.write(json.dumps(item.to_dict(), default=str, separators=(",", ":")) + "\n")
+                f.flush()
+                if stop:
+                    return
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write out queued events and stop the writer; later events are only echoed and kept in ``recent``."""
+        if self._queue is None or self._writer is None:
+            return
+        _open_sinks.discard(self)
+        writer, pending = self._writer, self._queue
+        self._queue = self._writer = None
+        try:
+            pending.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        writer.join(timeout=timeout)
@@ -0,0 +1,92 @@
+"""
+Memoized token-identifier resolution for the strategy's market-data fallback chains.
+"""
+
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class IdResolutionCache:
+    """Remembers which identifier answered each (operation, fallback chain).
+
+    A fresh entry is tried first and alone; the chain is only re-probed after
+    that identifier fails or the entry is older than ``ttl_seconds``.  A TTL of
+    zero disables memoization, so every call probes the full chain.  Safe to
+    share between threads; fetches run outside the lock.
+    """
+
+    def __init__(self, ttl_seconds: float = 900.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = float(ttl_seconds)
+        self._clock = clock
+        self._entries: dict[tuple[str, tuple[str, ...]], tuple[str, float, int]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.calls = 0
+        self.calls_avoided = 0
+        self.failures: dict[str, int] = {}
+
+    def resolve(self, op: str, ids: tuple[str, ...], fetch: Callable[[str], T | None]) -> T | None:
+        key = (op, ids)
+        now = self._clock()
+        cached = self._entries.get(key)
+        tried: set[str] = set()
+        if cached is not None and now < cached[1]:
+            value = self._attempt(op, fetch, cached[0])
+            with self._lock:
+                if value is not None:
+                    self.hits += 1
+                    self.calls_avoided += cached[2]
+                    return value
+                self._entries.pop(key, None)
+            tried.add(cached[0])
+
+        with self._lock:
+            self.misses += 1
+        failed = 0
+        for token_id in ids:
+            if not token_id or token_id in tried:
+                continue
+            tried.add(token_id)
+            value = self._attempt(op, fetch, token_id)
+            if value is not None:
+                if self.ttl_seconds > 0:
+                    with self._lock:
+                        self._entries[key] = (token_id, now + self.ttl_seconds, failed)
+                return value
+            failed += 1
+        return None
+
+    def _attempt(self, op: str, fetch: Callable[[str], T | None], token_id: str) -> T | None:
+        with self._lock:
+            self.calls += 1
+        try:
+            value = fetch(token_id)
+        except Exception:
+            value = None
+        if value is None:
+            with self._lock:
+                self.failures[op] = self.failures.get(op, 0) + 1
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries = dict(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "entries": {f"{op}:{ids[0] if ids else ''}": entry[0] for (op, ids), entry in entries.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "calls": self.calls,
+            "calls_avoided": self.calls_avoided,
+            "failures": dict(self.failures),
+        }
@@ -0,0 +1,286 @@
+"""
+Indicator math shared by the strategy and its offline tools.
+"""
+
+from typing import Any
+
+import numpy as np
+
+_TIMEFRAME_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    value = str(timeframe).strip().lower()
+    if len(value) < 2 or value[-1] not in _TIMEFRAME_UNITS or not value[:-1].isdigit():
+        raise ValueError(f"Unsupported timeframe: {timeframe!r}")
+    return int(value[:-1]) * _TIMEFRAME_UNITS[value[-1]]
+
+
+def wilder_rsi(closes: np.ndarray, period: int) -> np.ndarray:
+    closes = np.asarray(closes, dtype=np.float64)
+    out = np.full(closes.shape[0], np.nan)
+    if period <= 0 or closes.shape[0] <= period:
+        return out
+
+    deltas = np.diff(closes)
+    gains = np.clip(deltas, 0.0, None)
+    losses = np.clip(-deltas, 0.0, None)
+    avg_gain = float(gains[:period].mean())
+    avg_loss = float(losses[:period].mean())
+    out[period] = _rsi_from_averages(avg_gain, avg_loss)
+
+    # Wilder smoothing is a recurrence; iterate over plain floats to keep it cheap.
+    keep = (period - 1) / period
+    scale = 1.0 / period
+    for i, (gain, loss) in enumerate(zip(gains[period:].tolist(), losses[period:].tolist()), start=period + 1):
+        avg_gain = avg_gain * keep + gain * scale
+        avg_loss = avg_loss * keep + loss * scale
+        out[i] = _rsi_from_averages(avg_gain, avg_loss)
+    return out
+
+
+def _rsi_from_averages(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def resample_closes(timestamps: np.ndarray, prices: np.ndarray, bucket_seconds: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return (bucket_start_ts, close) for every bucket that has at least one tick."""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+    buckets = timestamps // bucket_seconds
+    last_in_bucket = np.flatnonzero(np.append(buckets[1:] != buckets[:-1], True))
+    return buckets[last_in_bucket] * bucket_seconds, prices[last_in_bucket]
+
+
+def closed_candle_rsi(
+    timestamps: np.ndarray,
+    prices: np.ndarray,
+    period: int,
+    timeframe: str,
+) -> np.ndarray:
+    """RSI per tick, computed from candles of ``timeframe`` that closed before the tick."""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    bucket_seconds = timeframe_seconds(timeframe)
+    candle_ts, candle_close = resample_closes(timestamps, prices, bucket_seconds)
+    candle_rsi = wilder_rsi(candle_close, period)
+    # A candle counts as closed once a tick lands at or after its end.
+    closed = np.searchsorted(candle_ts + bucket_seconds, timestamps, side="right") - 1
+    out = np.full(timestamps.shape[0], np.nan)
+    has_closed = closed >= 0
+    out[has_closed] = candle_rsi[closed[has_closed]]
+    return out
+
+
+class WilderRSI:
+    """Incremental Wilder RSI over candles built from price ticks; O(1) per closed candle."""
+
+    __slots__ = (
+        "period",
+        "bucket_seconds",
+        "avg_gain",
+        "avg_loss",
+        "last_close",
+        "warmup_changes",
+        "candle_start",
+        "candle_close",
+    )
+
+    def __init__(self, period: int, timeframe: str) -> None:
+        if period <= 0:
+            raise ValueError("RSI period must be positive")
+        self.period = int(period)
+        self.bucket_seconds = timeframe_seconds(timeframe)
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.last_close: float | None = None
+        self.warmup_changes = 0
+        self.candle_start: int | None = None
+        self.candle_close: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.warmup_changes >= self.period
+
+    @property
+    def value(self) -> float | None:
+        if not self.ready:
+            return None
+        return _rsi_from_averages(self.avg_gain, self.avg_loss)
+
+    def seed(self, closes: Any) -> None:
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.last_close = None
+        self.warmup_changes = 0
+        # Seeded closes replace any candle being built, or its close would be counted after them.
+        self.candle_start = None
+        self.candle_close = None
+        for close in closes:
+            self.update_close(float(close))
+
+    def update_close(self, close: float) -> None:
+        if self.last_close is None:
+            self.last_close = close
+            return
+        change = close - self.last_close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        self.last_close = close
+        if self.warmup_changes < self.period:
+            # Seed with a simple average of the first `period` changes.
+            self.warmup_changes += 1
+            self.avg_gain += (gain - self.avg_gain) / self.warmup_changes
+            self.avg_loss += (loss - self.avg_loss) / self.warmup_changes
+            return
+        self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+        self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+    def update_tick(self, ts: int, price: float) -> bool:
+        """Feed one price tick; returns True when it closed a candle."""
+        bucket = ts - ts % self.bucket_seconds
+        if self.candle_start is None or self.candle_close is None:
+            self.candle_start, self.candle_close = bucket, price
+            return False
+        if bucket < self.candle_start:
+            return False
+        if bucket == self.candle_start:
+            self.candle_close = price
+            return False
+        self.update_close(self.candle_close)
+        self.candle_start, self.candle_close = bucket, price
+        return True
+
+    def update_many(self, timestamps: Any, prices: Any) -> int:
+        """Feed ticks in time order at once; returns the number of candles closed.
+
+        Only the last positive tick of each bucket can change a candle's close, so the
+        result matches calling update_tick on every tick.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        keep = prices > 0
+        buckets, prices = (timestamps - timestamps % self.bucket_seconds)[keep], prices[keep]
+        if buckets.shape[0] == 0:
+            return 0
+        last = np.flatnonzero(np.r_[buckets[1:] != buckets[:-1], True])
+        return sum(self.update_tick(int(buckets[i]), float(prices[i])) for i in last)
+
+    def to_state(self) -> dict[str, Any]:
+        return {
+            "period": self.period,
+            "bucket_seconds": self.bucket_seconds,
+            "avg_gain": self.avg_gain,
+            "avg_loss": self.avg_loss,
+            "last_close": self.last_close,
+            "warmup_changes": self.warmup_changes,
+            "candle_start": self.candle_start,
+            "candle_close": self.candle_close,
+        }
+
+    def load_state(self, state: dict[str, Any]) -> bool:
+        if int(state.get("period", 0)) != self.period or int(state.get("bucket_seconds", 0)) != self.bucket_seconds:
+            return False
+        self.avg_gain = float(state.get("avg_gain", 0.0))
+        self.avg_loss = float(state.get("avg_loss", 0.0))
+        self.last_close = state.get("last_close")
+        self.warmup_changes = int(state.get("warmup_changes", 0))
+        self.candle_start = state.get("candle_start")
+        self.candle_close = state.get("candle_close")
+        return True
+
+
+class BatchWilderRSI:
+    """WilderRSI for many tokens at once: one vectorized update per closed candle for the whole universe.
+
+    Missing prices are NaN; a token with no price in a candle simply skips that change.
+    """
+
+    def __init__(self, size: int, period: int, timeframe: str) -> None:
+        if period <= 0:
+            raise ValueError("RSI period must be positive")
+        self.period = int(period)
+        self.bucket_seconds = timeframe_seconds(timeframe)
+        self.avg_gain = np.zeros(size)
+        self.avg_loss = np.zeros(size)
+        self.last_close = np.full(size, np.nan)
+        self.warmup_changes = np.zeros(size, dtype=np.int64)
+        self.candle_start: int | None = None
+        self.candle_close = np.full(size, np.nan)
+
+    def values(self) -> np.ndarray:
+        """RSI per token; NaN until a token has ``period`` closed-candle changes."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+        rsi[self.avg_loss == 0] = 100.0
+        rsi[self.warmup_changes < self.period] = np.nan
+        return rsi
+
+    def update_closes(self, closes: np.ndarray) -> None:
+        closes = np.asarray(closes, dtype=np.float64)
+        seen = ~np.isnan(closes)
+        step = seen & ~np.isnan(self.last_close)
+        change = np.where(step, closes - np.nan_to_num(self.last_close), 0.0)
+        gain = np.clip(change, 0.0, None)
+        loss = np.clip(-change, 0.0, None)
+        warm = step & (self.warmup_changes < self.period)
+        steady = step & ~warm
+        # Seed with a running mean of the first `period` changes, exactly like WilderRSI.
+        self.warmup_changes[warm] += 1
+        count = self.warmup_changes[warm]
+        self.avg_gain[warm] += (gain[warm] - self.avg_gain[warm]) / count
+        self.avg_loss[warm] += (loss[warm] - self.avg_loss[warm]) / count
+        self.avg_gain[steady] = (self.avg_gain[steady] * (self.period - 1) + gain[steady]) / self.period
+        self.avg_loss[steady] = (self.avg_loss[steady] * (self.period - 1) + loss[steady]) / self.period
+        self.last_close[seen] = closes[seen]
+
+    def seed_row(self, index: int, closes: Any) -> None:
+        """Replace one token's averages with those of a WilderRSI seeded from ``closes``."""
+        # Seeding only replays closes, so the single-token bucket size never matters.
+        single = WilderRSI(self.period, "1m")
+        single.seed(closes)
+        self.avg_gain[index] = single.avg_gain
+        self.avg_loss[index] = single.avg_loss
+        self.last_close[index] = np.nan if single.last_close is None else single.last_close
+        self.warmup_changes[index] = single.warmup_changes
+
+    def update_tick(self, ts: int, prices: np.ndarray) -> bool:
+        """Feed one tick of prices for every token; returns True when it closed a candle."""
+        prices = np.where(np.asarray(prices, dtype=np.float64) > 0, prices, np.nan)
+        bucket = ts - ts % self.bucket_seconds
+        if self.candle_start is not None and bucket < self.candle_start:
+            return False
+        closed = self.candle_start is not None and bucket > self.candle_start
+        if closed:
+            self.update_closes(self.candle_close)
+            self.candle_close = np.full_like(self.candle_close, np.nan)
+        self.candle_start = bucket
+        seen = ~np.isnan(prices)
+        self.candle_close[seen] = prices[seen]
+        return closed
+
+    def to_state(self) -> dict[str, Any]:
+        return {
+            "period": self.period,
+            "bucket_seconds": self.bucket_seconds,
+            "avg_gain": self.avg_gain.tolist(),
+            "avg_loss": self.avg_loss.tolist(),
+            "last_close": np.where(np.isnan(self.last_close), None, self.last_close).tolist(),
+            "warmup_changes": self.warmup_changes.tolist(),
+            "candle_start": self.candle_start,
+            "candle_close": np.where(np.isnan(self.candle_close), None, self.candle_close).tolist(),
+        }
+
+    def load_state(self, state: dict[str, Any]) -> bool:
+        if int(state.get("period", 0)) != self.period or int(state.get("bucket_seconds", 0)) != self.bucket_seconds:
+            return False
+        if len(state.get("avg_gain") or ()) != self.avg_gain.shape[0]:
+            return False
+        self.avg_gain = np.asarray(state["avg_gain"], dtype=np.float64)
+        self.avg_loss = np.asarray(state["avg_loss"], dtype=np.float64)
+        self.last_close = np.asarray(state["last_close"], dtype=np.float64)
+        self.warmup_changes = np.asarray(state["warmup_changes"], dtype=np.int64)
+        self.candle_start = state.get("candle_start")
+        self.candle_close = np.asarray(state["candle_close"], dtype=np.float64)
+        return True
@@ -0,0 +1,100 @@
+"""
+Per-stage latency histograms and counters for the decide() hot path.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# Upper bucket bounds in microseconds; the last bucket catches everything slower.
+BUCKET_BOUNDS_US = (
+    50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000,
+    100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000, float("inf"),
+)
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(BUCKET_BOUNDS_US)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS_US, seconds * 1e6)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile_ms(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile, capped at the observed max."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, bucket in zip(BUCKET_BOUNDS_US, self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(bound, self.max * 1e6) / 1000
+        return self.max * 1000
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": (self.total / self.count) * 1000 if self.count else 0.0,
+            "max_ms": self.max * 1000,
+            "p50_ms": self.percentile_ms(0.50),
+            "p95_ms": self.percentile_ms(0.95),
+            "p99_ms": self.percentile_ms(0.99),
+        }
+
+
+class StageInstrumentation:
+    """Fixed-bucket wall-time histograms plus exception counts, keyed by stage name."""
+
+    def __init__(self) -> None:
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.exceptions: dict[str, int] = {}
+        # Stage the tick thread is in, for attributing an exception that ends the tick; only
+        # the tick thread writes it.
+        self.current: str | None = None
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def record_exception(self, stage: str) -> None:
+        with self._lock:
+            self.exceptions[stage] = self.exceptions.get(stage, 0) + 1
+
+    def timed(self, stage: str, call: Callable[[], T]) -> Callable[[], T]:
+        """Wrap ``call`` to record its own time and exceptions; safe to run on a worker thread."""
+
+        def wrapper() -> T:
+            started = time.perf_counter()
+            try:
+                return call()
+            except Exception:
+                self.record_exception(stage)
+                raise
+            finally:
+                self.record(stage, time.perf_counter() - started)
+
+        return wrapper
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "stages": {stage: histogram.snapshot() for stage, histogram in self.histograms.items()},
+                "exceptions": dict(self.exceptions),
+            }
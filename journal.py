@@ -0,0 +1,189 @@
+"""
+Append-only write-ahead journal of persistent strategy state.
+
+Each record holds only the top-level state fields that changed since the last
+record, plus any entries passed in ``merge``: those are merged into a dict field
+instead of replacing it, so a growing table (the trade ledger) is journaled one
+changed row at a time.  Records reach the OS on every write, so a process crash
+loses nothing; ``fsync`` runs on a background thread once per ``fsync_every``
+records to bound the power-loss window without stalling the caller.  After
+``compact_every`` records the full state is written to a snapshot and the
+journal is truncated.  ``load`` returns the snapshot with the journal tail
+applied, and cuts a torn final line off the file so later records follow the
+last intact one.
+"""
+
+import json
+import os
+import threading
+from typing import Any
+
+_MISSING = object()
+
+
+class StateJournal:
+    def __init__(self, path: str, fsync_every: int = 10, compact_every: int = 1000) -> None:
+        self.path = path
+        self.snapshot_path = f"{path}.snapshot"
+        self.fsync_every = max(1, fsync_every)
+        self.compact_every = max(1, compact_every)
+        self.records = 0
+        self.fsyncs = 0
+        self.compactions = 0
+        self.truncated_bytes = 0
+        self._seq = 0
+        self._state: dict[str, Any] = {}
+        self._merged: dict[str, dict[str, Any]] = {}
+        self._unsynced = 0
+        self._since_compaction = 0
+        self._file = None
+        # Guards _file against the syncer while it is opened, swapped or closed; writes never wait on an fsync.
+        self._lock = threading.Lock()
+        self._sync_wanted = threading.Event()
+        self._syncer: threading.Thread | None = None
+        self._closing = False
+
+    def load(self) -> dict[str, Any]:
+        state: dict[str, Any] = {}
+        merged: dict[str, dict[str, Any]] = {}
+        seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            state = dict(snapshot.get("state") or {})
+            merged = {key: dict(entries) for key, entries in (snapshot.get("merge") or {}).items()}
+            seq = int(snapshot.get("seq", 0))
+        tail = 0
+        if os.path.exists(self.path):
+            good = 0
+            with open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line) if line.endswith(b"\n") else None
+                    except json.JSONDecodeError:
+                        record = None
+                    if record is None:
+                        # A torn final write from a crash; everything before it is intact.
+                        break
+                    good += len(line)
+                    if record["seq"] <= seq:
+                        continue
+                    state.update(record.get("set") or {})
+                    for key in record.get("unset") or ():
+                        state.pop(key, None)
+                    for key, entries in (record.get("merge") or {}).items():
+                        merged.setdefault(key, {}).update(entries)
+                    seq = record["seq"]
+                    tail += 1
+            size = os.path.getsize(self.path)
+            if good < size:
+                # Appends would otherwise land after the torn line and be skipped by the next load.
+                os.truncate(self.path, good)
+                self.truncated_bytes += size - good
+        self._seq = seq
+        self._state = state
+        self._merged = merged
+        self._since_compaction = tail
+        return {**state, **{key: dict(entries) for key, entries in merged.items()}}
+
+    def record(self, state: dict[str, Any], merge: dict[str, dict[str, Any]] | None = None) -> bool:
+        changed = {key: value for key, value in state.items() if self._state.get(key, _MISSING) != value}
+        removed = [key for key in self._state if key not in state]
+        merge = {key: entries for key, entries in (merge or {}).items() if entries}
+        if not changed and not removed and not merge:
+            return False
+        self._seq += 1
+        entry: dict[str, Any] = {"seq": self._seq, "set": changed}
+        if removed:
+            entry["unset"] = removed
+        if merge:
+            entry["merge"] = merge
+        if self._file is None:
+            with self._lock:
+                self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(entry, default=str, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self._state = dict(state)
+        for key, entries in merge.items():
+            self._merged.setdefault(key, {}).update(entries)
+        self.records += 1
+        self._unsynced += 1
+        self._since_compaction += 1
+        if self._unsynced >= self.fsync_every:
+            self._request_sync()
+        if self._since_compaction >= self.compact_every:
+            self.compact()
+        return True
+
+    def _request_sync(self) -> None:
+        self._unsynced = 0
+        if self._syncer is None:
+            self._syncer = threading.Thread(target=self._sync_loop, name="state-journal-fsync", daemon=True)
+            self._syncer.start()
+        self._sync_wanted.set()
+
+    def _sync_loop(self) -> None:
+        while True:
+            self._sync_wanted.wait()
+            self._sync_wanted.clear()
+            # Read before the fsync so a close that arrives mid-fsync gets one more pass.
+            closing = self._closing
+            with self._lock:
+                fd = os.dup(self._file.fileno()) if self._file is not None else None
+            if fd is not None:
+                try:
+                    os.fsync(fd)
+                    self.fsyncs += 1
+                finally:
+                    os.close(fd)
+            if closing:
+                return
+
+    def sync(self) -> None:
+        if self._file is None or self._unsynced == 0:
+            return
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self.fsyncs += 1
+
+    def compact(self) -> None:
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            snapshot = {"seq": self._seq, "state": self._state, "merge": self._merged}
+            json.dump(snapshot, f, default=str, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # Records up to seq are now in the snapshot; a crash before the truncate is harmless.
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.path, "w", encoding="utf-8")
+        self._unsynced = 0
+        self._since_compaction = 0
+        self.compactions += 1
+
+    def close(self) -> None:
+        if self._syncer is not None:
+            self._closing = True
+            self._sync_wanted.set()
+            self._syncer.join()
+            self._syncer = None
+            self._closing = False
+        if self._file is None:
+            return
+        self.sync()
+        with self._lock:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "seq": self._seq,
+            "records": self.records,
+            "fsyncs": self.fsyncs,
+            "compactions": self.compactions,
+            "unsynced": self._unsynced,
+            "truncated_bytes": self.truncated_bytes,
+        }
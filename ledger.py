@@ -0,0 +1,173 @@
+"""
+Columnar round-trip trade ledger with vectorized analytics.
+
+One row per position: opened on entry, updated on every exit attempt and
+closed when the position is seen gone.  Rows live in a preallocated NumPy
+structured array that doubles when full.  Values are floats; the ledger is for
+reporting and never feeds back into trading decisions.
+"""
+
+import base64
+import zlib
+from typing import Any
+
+import numpy as np
+
+TRIGGERS = ("open", "take_profit", "stop_loss", "time_exit", "external")
+_TRIGGER_CODES = {label: code for code, label in enumerate(TRIGGERS)}
+
+TRADE = np.dtype(
+    [
+        ("entry_ts", "<i8"),
+        ("exit_ts", "<i8"),
+        ("entry_price", "<f8"),
+        ("exit_price", "<f8"),
+        ("base_amount", "<f8"),
+        ("entry_usd", "<f8"),
+        ("entry_slippage", "<f4"),
+        ("exit_slippage", "<f4"),
+        ("gas_usd", "<f8"),
+        ("exit_attempts", "<i4"),
+        ("trigger", "u1"),
+        ("closed", "?"),
+    ]
+)
+
+
+class TradeLedger:
+    def __init__(self, capacity: int = 256) -> None:
+        self.rows = np.zeros(max(1, capacity), dtype=TRADE)
+        self.count = 0
+        self._encoded: dict[str, Any] | None = None
+        self._analytics: dict[str, Any] | None = None
+        self._dirty: set[int] = set()
+
+    def _append(self) -> int:
+        if self.count == len(self.rows):
+            grown = np.zeros(len(self.rows) * 2, dtype=TRADE)
+            grown[: self.count] = self.rows[: self.count]
+            self.rows = grown
+        self.count += 1
+        return self.count - 1
+
+    def open(
+        self,
+        ts: int,
+        price: Any,
+        base_amount: Any,
+        entry_usd: Any,
+        slippage: Any,
+        gas_usd: Any,
+    ) -> int:
+        row = self._append()
+        self.rows[row] = (ts, 0, float(price), 0.0, float(base_amount), float(entry_usd),
+                          float(slippage), 0.0, float(gas_usd), 0, _TRIGGER_CODES["open"], False)
+        self._encoded = None
+        self._analytics = None
+        self._dirty.add(row)
+        return row
+
+    def mark_exit(self, row: int, ts: int, price: Any, trigger: str, slippage: Any, gas_usd: Any) -> None:
+        record = self.rows[row]
+        record["exit_ts"] = ts
+        record["exit_price"] = float(price)
+        record["exit_slippage"] = float(slippage)
+        record["gas_usd"] += float(gas_usd)
+        record["exit_attempts"] += 1
+        record["trigger"] = _TRIGGER_CODES[trigger]
+        self._encoded = None
+        self._analytics = None
+        self._dirty.add(row)
+
+    def close(self, row: int, ts: int, price: Any) -> None:
+        record = self.rows[row]
+        if record["exit_attempts"] == 0:
+            # Closed outside the strategy; value it at the first price seen flat.
+            record["exit_ts"] = ts
+            record["exit_price"] = float(price)
+            record["trigger"] = _TRIGGER_CODES["external"]
+        record["closed"] = True
+        self._encoded = None
+        self._analytics = None
+        self._dirty.add(row)
+
+    def closed_trades(self) -> np.ndarray:
+        rows = self.rows[: self.count]
+        return rows[rows["closed"]]
+
+    def analytics(self) -> dict[str, Any]:
+        """Summary of closed trades; computed once per ledger change, so status polling stays cheap."""
+        if self._analytics is None:
+            self._analytics = self._compute_analytics()
+        return self._analytics
+
+    def _compute_analytics(self) -> dict[str, Any]:
+        trades = self.closed_trades()
+        pnl = trades["base_amount"] * (trades["exit_price"] - trades["entry_price"]) - trades["gas_usd"]
+        held = trades["exit_ts"] - trades["entry_ts"]
+        equity = np.cumsum(pnl)
+        drawdown = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:] - equity
+        per_trigger = {}
+        counts = np.bincount(trades["trigger"], minlength=len(TRIGGERS))
+        totals = np.bincount(trades["trigger"], weights=pnl, minlength=len(TRIGGERS))
+        wins = np.bincount(trades["trigger"], weights=pnl > 0, minlength=len(TRIGGERS))
+        for code, label in enumerate(TRIGGERS):
+            if counts[code]:
+                per_trigger[label] = {
+                    "trades": int(counts[code]),
+                    "pnl_usd": float(totals[code]),
+                    "win_rate": float(wins[code] / counts[code]),
+                }
+        percentiles = np.percentile(held, [50, 90, 100]) if len(held) else np.zeros(3)
+        return {
+            "trades": int(len(trades)),
+            "open_trades": int(self.count - len(trades)),
+            "win_rate": float(np.mean(pnl > 0)) if len(pnl) else 0.0,
+            "realized_pnl_usd": float(pnl.sum()),
+            "gas_usd": float(trades["gas_usd"].sum()),
+            "max_drawdown_usd": float(drawdown.max()) if len(drawdown) else 0.0,
+            "holding_seconds": {
+                "p50": float(percentiles[0]),
+                "p90": float(percentiles[1]),
+                "max": float(percentiles[2]),
+            },
+            "per_trigger": per_trigger,
+        }
+
+    def to_state(self) -> dict[str, Any]:
+        if self._encoded is None:
+            packed = zlib.compress(self.rows[: self.count].tobytes())
+            self._encoded = {"count": self.count, "rows": base64.b64encode(packed).decode("ascii")}
+        return self._encoded
+
+    def load_state(self, state: dict[str, Any]) -> None:
+        count = int(state.get("count", 0))
+        rows = np.frombuffer(zlib.decompress(base64.b64decode(state["rows"])), dtype=TRADE) if count else None
+        self.rows = np.zeros(max(256, count * 2), dtype=TRADE)
+        if rows is not None:
+            self.rows[:count] = rows
+        self.count = count
+        self._encoded = None
+        self._analytics = None
+        self._dirty = set(range(count))
+
+    def take_dirty_rows(self) -> dict[str, str]:
+        """Rows changed since the last call, encoded one by one and keyed by row index."""
+        if not self._dirty:
+            return {}
+        rows = {str(row): base64.b64encode(self.rows[row].tobytes()).decode("ascii") for row in sorted(self._dirty)}
+        self._dirty.clear()
+        return rows
+
+    def load_rows(self, rows: dict[str, str]) -> None:
+        """Overlay rows from ``take_dirty_rows`` output, growing the ledger as needed."""
+        for key, encoded in rows.items():
+            row = int(key)
+            while row >= len(self.rows):
+                grown = np.zeros(len(self.rows) * 2, dtype=TRADE)
+                grown[: self.count] = self.rows[: self.count]
+                self.rows = grown
+            self.rows[row] = np.frombuffer(base64.b64decode(encoded), dtype=TRADE)[0]
+            self.count = max(self.count, row + 1)
+        self._encoded = None
+        self._analytics = None
@@ -0,0 +1,167 @@
+"""
+Process-wide market-data cache shared by every strategy instance in a process.
+
+Entries are keyed by ``(chain, token id, indicator, period, timeframe)``, expire
+after ``ttl_seconds`` and are evicted least-recently-used beyond ``max_entries``.
+Concurrent misses on the same key wait for a single upstream fetch, for at
+most ``wait_seconds`` so a hung fetch cannot stall every caller behind it.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class _Pending:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SharedMarketCache:
+    def __init__(
+        self,
+        ttl_seconds: float = 5.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.wait_timeouts = 0
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, _Pending] = {}
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any], wait_seconds: float | None = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._clock() < entry[0]:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = _Pending()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not pending.done.wait(wait_seconds):
+                with self._lock:
+                    self.wait_timeouts += 1
+                raise TimeoutError(f"Shared fetch for {key!r} still running after {wait_seconds}s")
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            value = fetch()
+        except BaseException as exc:
+            # Failures are shared with waiting callers but never cached.
+            pending.error = exc
+            raise
+        else:
+            pending.value = value
+            with self._lock:
+                self._entries[key] = (self._clock() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            return value
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            pending.done.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "wait_timeouts": self.wait_timeouts,
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
+
+
+_shared: dict[tuple[float, int], SharedMarketCache] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_market_cache(ttl_seconds: float = 5.0, max_entries: int = 1024) -> SharedMarketCache:
+    """Process-wide cache instance for the given settings."""
+    with _shared_lock:
+        cache = _shared.get((ttl_seconds, max_entries))
+        if cache is None:
+            cache = _shared[(ttl_seconds, max_entries)] = SharedMarketCache(ttl_seconds, max_entries)
+        return cache
+
+
+class CachedMarket:
+    """Market wrapper that serves price, balance and RSI reads through a SharedMarketCache.
+
+    Balances are wallet-specific, so the wallet address is part of their key.  A read
+    waiting on another caller's fetch raises TimeoutError after ``wait_seconds``.
+    """
+
+    def __init__(
+        self,
+        market: Any,
+        cache: SharedMarketCache,
+        chain: str,
+        wallet_address: str = "",
+        wait_seconds: float | None = None,
+    ) -> None:
+        self._market = market
+        self._cache = cache
+        self._chain = chain
+        self._wallet = wallet_address
+        self._wait_seconds = wait_seconds
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._market, name)
+
+    def price(self, token: str, *args: Any, **kwargs: Any) -> Any:
+        return self._cache.get_or_fetch(
+            (self._chain, token, "price", None, None),
+            lambda: self._market.price(token, *args, **kwargs),
+            self._wait_seconds,
+        )
+
+    def balance(self, token: str, *args: Any, **kwargs: Any) -> Any:
+        return self._cache.get_or_fetch(
+            (self._chain, token, f"balance:{self._wallet}", None, None),
+            lambda: self._market.balance(token, *args, **kwargs),
+            self._wait_seconds,
+        )
+
+    def rsi(self, token: str, period: int = 14, timeframe: str = "1h", **kwargs: Any) -> Any:
+        return self._cache.get_or_fetch(
+            (self._chain, token, "rsi", period, timeframe),
+            lambda: self._market.rsi(token, period=period, timeframe=timeframe, **kwargs),
+            self._wait_seconds,
+        )
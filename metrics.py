@@ -0,0 +1,203 @@
+"""
+Prometheus metrics for running strategies, served from a local HTTP endpoint.
+
+The tick path only bumps numbers in a plain dict and, at the end of a tick
+that changed something, publishes an immutable copy with one reference swap.
+Counters bumped on every tick (``ticks_total``) do not force a publish on
+their own; they ride along with the next real change or go out once per
+``publish_interval`` seconds.
+Scrapes read the published copies and re-render the text only when one of
+them changed, so a scrape never takes a lock the tick path holds.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+# name -> (type, help); every metric is prefixed with PREFIX when rendered.
+PREFIX = "my_strategy_"
+METRICS: dict[str, tuple[str, str]] = {
+    "ticks_total": ("counter", "decide() calls by the branch that ended the tick"),
+    "buys_total": ("counter", "Buy swaps emitted"),
+    "sells_total": ("counter", "Sell swaps emitted, by exit trigger"),
+    "exit_retries_total": ("counter", "Sell swaps sent after an earlier exit attempt on the same position"),
+    "gas_guard_blocks_total": ("counter", "Swaps held back by the gas guard, by side"),
+    "errors_total": ("counter", "Ticks that ended in an error"),
+    "portfolio_value_usd": ("gauge", "Quote balance plus base holdings at the last price"),
+    "total_profit_usd": ("gauge", "Portfolio value minus starting capital"),
+    "position_open": ("gauge", "1 while a position is tracked for the token"),
+    "entry_price": ("gauge", "Entry price of the open position, 0 when flat"),
+    "price": ("gauge", "Last base token price seen by decide()"),
+    "rsi": ("gauge", "Last RSI seen by decide()"),
+}
+
+# Bumped on every tick, so they alone would publish every tick; see StrategyMetrics.publish.
+_EVERY_TICK = frozenset({"ticks_total"})
+
+_Key = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class StrategyMetrics:
+    """Counters and gauges for one strategy instance; ``labels`` are added to every sample."""
+
+    def __init__(
+        self, publish_interval: float = 1.0, clock: Callable[[], float] = time.monotonic, **labels: str
+    ) -> None:
+        self.labels = tuple(sorted((name, str(value)) for name, value in labels.items()))
+        self.publish_interval = publish_interval
+        self.version = 0
+        self.published: tuple[tuple[_Key, float], ...] = ()
+        self._values: dict[_Key, float] = {}
+        self._dirty = False
+        self._pending = False
+        self._clock = clock
+        self._published_at: float | None = None
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        self._values[key] = self._values.get(key, 0.0) + amount
+        if name in _EVERY_TICK:
+            self._pending = True
+        else:
+            self._dirty = True
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        if self._values.get(key) != value:
+            self._values[key] = value
+            self._dirty = True
+
+    def publish(self) -> None:
+        """Make this tick's values visible to scrapes; a no-op when nothing changed."""
+        if not self._dirty:
+            if not self._pending:
+                return
+            now = self._clock()
+            if self._published_at is not None and now - self._published_at < self.publish_interval:
+                return
+        else:
+            now = self._clock()
+        self._dirty = self._pending = False
+        self._published_at = now
+        # Readers see either the old or the new tuple, never a half-updated dict.
+        self.published = tuple(self._values.items())
+        self.version += 1
+
+
+def render(registries: list[StrategyMetrics]) -> bytes:
+    """Prometheus text exposition (format 0.0.4) for the published values of ``registries``."""
+    families: dict[str, list[str]] = {}
+    for registry in registries:
+        for (name, labels), value in registry.published:
+            pairs = sorted(registry.labels + labels)
+            label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in pairs)
+            label_text = f"{{{label_text}}}" if label_text else ""
+            families.setdefault(name, []).append(f"{PREFIX}{name}{label_text} {_format(value)}")
+    lines = []
+    for name in sorted(families):
+        kind, help_text = METRICS.get(name, ("untyped", name))
+        lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+        lines.extend(families[name])
+    return ("\n".join(lines) + "\n").encode() if lines else b""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsServer:
+    """HTTP endpoint serving ``/metrics`` for every registered StrategyMetrics."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9464) -> None:
+        self.registries: list[StrategyMetrics] = []
+        self.scrapes = 0
+        self.renders = 0
+        self._cache: tuple[tuple[tuple[int, int], ...], bytes] = ((), b"")
+        # Guards registration and the render cache; only scrapes and setup take it, never a tick.
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self.host, self.port = self._httpd.server_address[:2]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+
+    def register(self, metrics: StrategyMetrics) -> None:
+        with self._lock:
+            self.registries.append(metrics)
+
+    def unregister(self, metrics: StrategyMetrics) -> None:
+        with self._lock:
+            self.registries = [registry for registry in self.registries if registry is not metrics]
+
+    def render(self) -> bytes:
+        with self._lock:
+            self.scrapes += 1
+            registries = list(self.registries)
+            versions = tuple((id(registry), registry.version) for registry in registries)
+            if versions != self._cache[0]:
+                self._cache = (versions, render(registries))
+                self.renders += 1
+            return self._cache[1]
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = server.render()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "address": f"http://{self.host}:{self.port}/metrics",
+            "registries": len(self.registries),
+            "scrapes": self.scrapes,
+            "renders": self.renders,
+        }
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+_servers: dict[tuple[str, int], MetricsServer] = {}
+_servers_lock = threading.Lock()
+
+
+def metrics_server(host: str = "127.0.0.1", port: int = 9464) -> MetricsServer:
+    """Process-wide server for ``host:port``, so a fleet of instances shares one endpoint."""
+    with _servers_lock:
+        server = _servers.get((host, port))
+        if server is None:
+            server = _servers[(host, port)] = MetricsServer(host, port)
+        return server
+
+
+def release_metrics_server(server: MetricsServer, metrics: StrategyMetrics) -> None:
+    """Unregister ``metrics``; the last instance to leave shuts the shared server down."""
+    with _servers_lock:
+        server.unregister(metrics)
+        if server.registries:
+            return
+        for key in [key for key, value in _servers.items() if value is server]:
+            del _servers[key]
+    server.close()
@@ -0,0 +1,389 @@
+"""
+Multi-asset portfolio mode: one strategy instance trading several base tokens
+against a shared quote balance.
+"""
+
+import contextlib
+import time
+from decimal import Decimal
+from typing import Any, Iterator, Mapping
+
+from almanak.framework.intents import Intent
+
+from .candles import CandleStore
+from .indicators import WilderRSI
+from .market_cache import CachedMarket
+from .scheduler import VolatilityTracker
+from .strategy import MyStrategyStrategy
+from .triggers import TriggerLevels
+
+_SLOT_IDS = (
+    "base_token",
+    "base_token_symbol",
+    "base_token_address",
+    "base_token_price_id",
+    "base_token_rsi_id",
+    "base_token_balance_id",
+    "base_token_trade_id",
+    "base_token_decimals",
+    "base_token_coingecko_id",
+)
+_SLOT_STATE = (
+    "_entry_price",
+    "_entry_ts",
+    "_triggers",
+    "_last_buy_ts",
+    "_last_exit_attempt_ts",
+    "_last_exit_reason",
+    "_ledger_row",
+    "_last_tick_price",
+    "_last_tick_rsi",
+    "_volatility",
+    "_candles",
+    "_candles_seeded",
+    "_local_rsi",
+    "_local_rsi_seeded",
+)
+
+
+class TokenSlot:
+    """Identifiers and position state for one base token; field names mirror MyStrategyStrategy."""
+
+    __slots__ = _SLOT_IDS + _SLOT_STATE + ("last_value_usd",)
+
+    def __init__(self, entry: str | dict[str, Any]) -> None:
+        cfg = {"base_token": entry} if isinstance(entry, str) else dict(entry)
+        self.base_token_symbol = str(cfg.get("base_token", "")).strip().lstrip("$").upper()
+        if not self.base_token_symbol:
+            raise ValueError(f"Portfolio token entry has no base_token: {entry!r}")
+        self.base_token_address = str(cfg.get("base_token_address", "")).strip()
+        token_id = self.base_token_address if self.base_token_address.startswith("0x") else self.base_token_symbol
+        self.base_token = self.base_token_symbol
+        self.base_token_price_id = (
+            str(cfg.get("base_token_price_id", self.base_token_symbol)).strip() or self.base_token_symbol
+        )
+        self.base_token_rsi_id = token_id
+        self.base_token_balance_id = token_id
+        self.base_token_trade_id = token_id
+        self.base_token_decimals = int(cfg.get("base_token_decimals", 18))
+        self.base_token_coingecko_id = str(cfg.get("base_token_coingecko_id", "")).strip() or None
+        self._entry_price: Decimal | None = None
+        self._entry_ts: int | None = None
+        self._triggers: TriggerLevels | None = None
+        self._last_buy_ts: int | None = None
+        self._last_exit_attempt_ts: int | None = None
+        self._last_exit_reason: str | None = None
+        self._ledger_row: int | None = None
+        self._last_tick_price: Decimal | None = None
+        self._last_tick_rsi: Decimal | None = None
+        self._volatility = VolatilityTracker()
+        self._candles: CandleStore | None = None
+        self._candles_seeded = False
+        self._local_rsi: WilderRSI | None = None
+        self._local_rsi_seeded = False
+        # Base holdings at the last complete price and balance read, for ticks where either is missing.
+        self.last_value_usd: Decimal | None = None
+
+    def to_state(self) -> dict[str, Any]:
+        return {
+            "entry_price": str(self._entry_price) if self._entry_price is not None else None,
+            "entry_ts": self._entry_ts,
+            "last_buy_ts": self._last_buy_ts,
+            "last_exit_attempt_ts": self._last_exit_attempt_ts,
+            "last_exit_reason": self._last_exit_reason,
+            "ledger_row": self._ledger_row,
+            "local_rsi": self._local_rsi.to_state() if self._local_rsi is not None else None,
+        }
+
+    def load_state(self, state: dict[str, Any]) -> None:
+        self._entry_price = Decimal(str(state["entry_price"])) if state.get("entry_price") else None
+        self._entry_ts = state.get("entry_ts")
+        self._last_buy_ts = state.get("last_buy_ts")
+        self._last_exit_attempt_ts = state.get("last_exit_attempt_ts")
+        self._last_exit_reason = state.get("last_exit_reason")
+        self._ledger_row = state.get("ledger_row")
+        if self._local_rsi is not None and state.get("local_rsi") and self._local_rsi.load_state(state["local_rsi"]):
+            self._local_rsi_seeded = True
+
+
+class PortfolioStrategy(MyStrategyStrategy):
+    """Runs the MyStrategyStrategy entry/exit rules for every token in ``portfolio_tokens``.
+
+    The quote balance is fetched once per tick and shared, so ``min_quote_reserve_usd``
+    and compounding apply to the whole portfolio.  At most one swap is emitted per
+    tick: exits on open positions first, then entries by lowest RSI.
+    """
+
+    def __init__(
+        self,
+        config: dict[str, Any] | None = None,
+        chain: str = "base",
+        wallet_address: str = "",
+        **kwargs: Any,
+    ) -> None:
+        cfg = config or {}
+        super().__init__(config=cfg, chain=chain, wallet_address=wallet_address, **kwargs)
+        entries = cfg.get("portfolio_tokens") or [
+            {
+                "base_token": self.base_token_symbol,
+                "base_token_address": self.base_token_address,
+                "base_token_price_id": self.base_token_price_id,
+                "base_token_decimals": self.base_token_decimals,
+                "base_token_coingecko_id": self.base_token_coingecko_id or "",
+            }
+        ]
+        self._slots = [TokenSlot(entry) for entry in entries]
+        symbols = [slot.base_token_symbol for slot in self._slots]
+        if len(set(symbols)) != len(symbols):
+            raise ValueError(f"Duplicate portfolio tokens: {symbols}")
+        # Local RSI and candles are per token, so each slot gets its own and the shared one goes unused.
+        self._local_rsi = None
+        for slot in self._slots:
+            slot._candles = self._new_candle_store()
+            slot._local_rsi = WilderRSI(self.rsi_period, self.rsi_timeframe) if self.use_local_rsi else None
+
+    def _register_tokens(self) -> None:
+        # Only the configured tokens; the default base_token is not traded unless it is one of them.
+        for slot in self._slots:
+            with self._bound(slot):
+                self._register_base_token()
+
+    @contextlib.contextmanager
+    def _bound(self, slot: TokenSlot) -> Iterator[None]:
+        saved = {name: getattr(self, name) for name in _SLOT_IDS + _SLOT_STATE}
+        for name in _SLOT_IDS + _SLOT_STATE:
+            setattr(self, name, getattr(slot, name))
+        try:
+            yield
+        finally:
+            for name in _SLOT_STATE:
+                setattr(slot, name, getattr(self, name))
+            for name, value in saved.items():
+                setattr(self, name, value)
+
+    def _apply_tunables(self, tunables: Mapping[str, Any]) -> None:
+        super()._apply_tunables(tunables)
+        for slot in self._slots:
+            with self._bound(slot):
+                self._refresh_triggers()
+
+    def _fetch_portfolio_inputs(self, market: Any) -> tuple[dict[str, Any], tuple[str, ...]]:
+        fetchers = {
+            "quote_balance": lambda: self._balance_with_fallback(
+                market,
+                self.quote_token_symbol,
+                self.quote_token,
+                self.quote_token_address,
+            ),
+        }
+        for slot in self._slots:
+            symbol = slot.base_token_symbol
+            fetchers[f"{symbol}:price"] = (
+                lambda s=slot: self._price_with_fallback(
+                    market, s.base_token_price_id, s.base_token_symbol, s.base_token_address
+                )
+            )
+            fetchers[f"{symbol}:base_balance"] = (
+                lambda s=slot: self._balance_with_fallback(
+                    market, s.base_token_symbol, s.base_token_balance_id, s.base_token_address
+                )
+            )
+            with self._bound(slot):
+                if self._has_local_rsi():
+                    continue
+            fetchers[f"{symbol}:rsi"] = (
+                lambda s=slot: self._rsi_with_fallback(market, s.base_token_rsi_id, s.base_token_symbol)
+            )
+        fetchers = self._instrument_fetchers(fetchers)
+        if self._prefetcher is not None:
+            return self._prefetcher.fetch(fetchers)
+        return {name: fetch() for name, fetch in fetchers.items()}, ()
+
+    def decide(self, market: Any) -> Any:
+        instrumentation = self._instrumentation
+        tick_started = time.perf_counter() if instrumentation is not None else 0.0
+        profiling = self._profiler is not None and self._profiler.begin_tick()
+        if profiling:
+            market = self._profiler.wrap_market(market)
+        try:
+            if self._journal is not None and not self._journal_restored:
+                self._restore_from_journal()
+            if not self._tokens_registered:
+                self._ensure_tokens_registered()
+            if self._config_watcher is not None:
+                self._apply_pending_config()
+            now_ts = int(self._clock())
+            self._tick_branch = "hold"
+            if self._market_cache is not None:
+                market = CachedMarket(
+                    market, self._market_cache, self.chain, self.wallet_address, self.fetch_timeout_seconds
+                )
+            if self._tape is not None:
+                market = self._tape.wrap(market, now_ts)
+            if instrumentation is not None:
+                instrumentation.current = "fetch"
+            values, timed_out = self._fetch_portfolio_inputs(market)
+            if "quote_balance" in timed_out:
+                reason = f"Balance fetch timed out for {self.quote_token_symbol}"
+                self._tick_branch = "balance_timeout"
+                self._print_action("HOLD", reason)
+                return Intent.hold(reason=reason)
+
+            quote_balance = values["quote_balance"]
+            portfolio_value: Decimal | None = quote_balance
+            rows = []
+            for slot in self._slots:
+                symbol = slot.base_token_symbol
+                price = values.get(f"{symbol}:price", Decimal("0"))
+                base_balance = values.get(f"{symbol}:base_balance")
+                if price > 0 and base_balance is not None:
+                    slot.last_value_usd = base_balance * price
+                    with self._bound(slot):
+                        rsi = self._update_slot_rsi(market, now_ts, price)
+                else:
+                    rsi = None
+                if portfolio_value is not None and slot.last_value_usd is not None:
+                    portfolio_value += slot.last_value_usd
+                else:
+                    # A token never valued yet would read as a drawdown, so keep last tick's totals.
+                    portfolio_value = None
+                rows.append((slot, price, base_balance, rsi if rsi is not None else values.get(f"{symbol}:rsi")))
+
+            if instrumentation is None:
+                if portfolio_value is not None:
+                    self._update_portfolio_value(portfolio_value)
+                self._print_portfolio_status(quote_balance, len(rows))
+                return self._decide_rows(now_ts, quote_balance, rows)
+
+            instrumentation.current = "status"
+            stage_started = time.perf_counter()
+            if portfolio_value is not None:
+                self._update_portfolio_value(portfolio_value)
+            self._print_portfolio_status(quote_balance, len(rows))
+            instrumentation.record("status", time.perf_counter() - stage_started)
+            instrumentation.current = "decision"
+            stage_started = time.perf_counter()
+            intent = self._decide_rows(now_ts, quote_balance, rows)
+            instrumentation.record("decision", time.perf_counter() - stage_started)
+            return intent
+        except Exception as exc:
+            if instrumentation is not None:
+                instrumentation.record_exception(instrumentation.current or "tick")
+            self._tick_branch = "error"
+            self._print_action("ERROR", str(exc))
+            return Intent.hold(reason=f"Error: {exc}")
+        finally:
+            if self._tape is not None:
+                self._tape.end_tick()
+            if self._journal is not None:
+                self._record_journal()
+            if self._metrics is not None:
+                self._record_metrics()
+            if instrumentation is not None:
+                instrumentation.record("tick", time.perf_counter() - tick_started)
+                instrumentation.current = None
+            if profiling:
+                self._profiler.end_tick(self._tick_branch)
+
+    def _decide_rows(self, now_ts: int, quote_balance: Decimal, rows: list[tuple]) -> Any:
+        """Run the entry/exit rules per token; the first swap wins, otherwise one HOLD lists every token."""
+        # Exits on open positions take priority over new entries.
+        rows.sort(
+            key=lambda row: (
+                row[2] is None or row[2] < self.min_base_position,
+                row[3] if row[3] is not None else Decimal("100"),
+            )
+        )
+        holds = []
+        for slot, price, base_balance, rsi in rows:
+            symbol = slot.base_token_symbol
+            if price <= 0:
+                holds.append(f"{symbol}: no price")
+                continue
+            if base_balance is None:
+                holds.append(f"{symbol}: balance timed out")
+                continue
+            if rsi is None:
+                holds.append(f"{symbol}: no RSI")
+                continue
+            with self._bound(slot):
+                intent = self._decide_position(now_ts, price, quote_balance, base_balance, rsi)
+            if self._metrics is not None and self._tick_branch.startswith("gas_guard_"):
+                # Only the tick's final branch reaches _record_metrics, so count per-token blocks here.
+                self._metrics.inc("gas_guard_blocks_total", side=self._tick_branch.removeprefix("gas_guard_"))
+            if getattr(intent, "from_token", None) is not None:
+                return intent
+            holds.append(f"{symbol}: {getattr(intent, 'reason', '')}")
+        self._tick_branch = "hold"
+        return Intent.hold(reason=" | ".join(holds))
+
+    def _update_slot_rsi(self, market: Any, now_ts: int, price: Decimal) -> Decimal | None:
+        """Feed this tick's price to the bound slot's local RSI and candles; returns their RSI if ready."""
+        if self._local_rsi is not None:
+            if not self._local_rsi_seeded:
+                self._seed_local_rsi(market)
+            self._update_local_rsi(now_ts, price)
+        if self._candles is not None:
+            if not self._candles_seeded:
+                self._seed_candles(market)
+            self._candles.update(now_ts, float(price))
+        rsi = self._local_rsi_value()
+        return rsi if rsi is not None else self._candle_rsi()
+
+    def _record_position_metrics(self) -> None:
+        for slot in self._slots:
+            with self._bound(slot):
+                super()._record_position_metrics()
+
+    def _print_portfolio_status(self, quote_balance: Decimal, tokens: int) -> None:
+        if not self._events.enabled("status"):
+            return
+        message = ""
+        if self._events.echo:
+            message = (
+                f"portfolio tokens={tokens} | "
+                f"{self.quote_token_symbol}={quote_balance:.4f} | "
+                f"Portfolio=${self._last_portfolio_value_usd:.2f} | "
+                f"Profit=${self._last_total_profit_usd:.2f} ({self._last_total_profit_pct * Decimal('100'):.2f}%)"
+            )
+        self._events.emit(
+            "status",
+            message,
+            tokens=tokens,
+            quote_balance=quote_balance,
+            portfolio_value_usd=self._last_portfolio_value_usd,
+            total_profit_usd=self._last_total_profit_usd,
+            total_profit_pct=self._last_total_profit_pct,
+        )
+
+    def get_next_tick_seconds(self, now_ts: int | None = None) -> int:
+        if now_ts is None:
+            now_ts = int(self._clock())
+        delays = []
+        for slot in self._slots:
+            with self._bound(slot):
+                delays.append(super().get_next_tick_seconds(now_ts))
+        return min(delays)
+
+    def _journal_state(self) -> dict[str, Any]:
+        return {"portfolio": {slot.base_token_symbol: slot.to_state() for slot in self._slots}}
+
+    def load_persistent_state(self, state: dict[str, Any]) -> None:
+        saved = state.get("portfolio") or {}
+        if state.get("ledger"):
+            self._ledger.load_state(state["ledger"])
+        if state.get("ledger_rows"):
+            self._ledger.load_rows(state["ledger_rows"])
+        for slot in self._slots:
+            if slot.base_token_symbol in saved:
+                slot.load_state(saved[slot.base_token_symbol])
+                with self._bound(slot):
+                    self._refresh_triggers()
+
+    def get_status(self) -> dict[str, Any]:
+        status = super().get_status()
+        status["portfolio_tokens"] = [
+            {"base_token": slot.base_token_symbol, "base_token_id": slot.base_token_trade_id, **slot.to_state()}
+            for slot in self._slots
+        ]
+        return status
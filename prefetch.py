@@ -0,0 +1,65 @@
+"""
+Concurrent market-data fetch stage for decide().
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class TickInputs:
+    price: Decimal
+    quote_balance: Decimal = Decimal("0")
+    base_balance: Decimal = Decimal("0")
+    rsi: Decimal | None = None
+    timed_out: tuple[str, ...] = ()
+
+
+class MarketPrefetcher:
+    """Runs independent market reads on a small thread pool with one shared deadline.
+
+    Reads that miss the deadline are reported in ``timed_out`` instead of
+    blocking the tick.  A running thread cannot be cancelled, so a read that is
+    still in flight from an earlier tick is not submitted again: it is reported
+    as timed out until it finishes, and a hung RPC holds at most one worker per
+    call name.  A read that raises re-raises from ``fetch`` so callers see the
+    same error as a sequential fetch.
+    """
+
+    def __init__(self, timeout_seconds: float = 10.0, max_workers: int = 8) -> None:
+        self.timeout_seconds = timeout_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="market-prefetch")
+        self._stragglers: dict[str, Future] = {}
+
+    def fetch(self, calls: dict[str, Callable[[], Any]]) -> tuple[dict[str, Any], tuple[str, ...]]:
+        futures: dict[str, Future] = {}
+        for name, call in calls.items():
+            straggler = self._stragglers.get(name)
+            if straggler is not None and not straggler.done():
+                continue
+            self._stragglers.pop(name, None)
+            futures[name] = self._pool.submit(call)
+        done, _ = wait(futures.values(), timeout=self.timeout_seconds)
+        results: dict[str, Any] = {}
+        error: BaseException | None = None
+        for name, future in futures.items():
+            if future not in done:
+                if not future.cancel():
+                    self._stragglers[name] = future
+            elif future.exception() is not None:
+                error = error or future.exception()
+            else:
+                results[name] = future.result()
+        if error is not None:
+            raise error
+        return results, tuple(name for name in calls if name not in results)
+
+    @property
+    def in_flight(self) -> tuple[str, ...]:
+        """Names of reads from earlier ticks that are still running."""
+        return tuple(name for name, future in self._stragglers.items() if not future.done())
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
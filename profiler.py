@@ -0,0 +1,214 @@
+"""
+On-demand sampling profiler for live decide() ticks.
+
+A ``TickProfiler`` is armed for the next N ticks by config, a signal or a
+control file.  While armed, a background thread samples the tick thread's
+stack every ``interval_seconds`` and market calls are timed.  When the last
+tick ends it writes collapsed stacks (flamegraph.pl / speedscope input) and
+a per-tick JSONL summary, stops the sampler and goes back to idle.  Idle
+cost is a couple of attribute reads per tick.
+"""
+
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from types import FrameType
+from typing import Any
+
+_armed_by_signal: "weakref.WeakSet[TickProfiler]" = weakref.WeakSet()
+
+
+def _on_signal(signum: int, frame: FrameType | None) -> None:
+    for profiler in list(_armed_by_signal):
+        profiler.request(profiler.default_ticks)
+
+
+def install_signal(profiler: "TickProfiler", signal_name: str) -> None:
+    """Arm ``profiler`` whenever the process receives ``signal_name`` (e.g. "SIGUSR2")."""
+    signum = getattr(signal, signal_name.upper())
+    signal.signal(signum, _on_signal)
+    _armed_by_signal.add(profiler)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}".replace(";", ":").replace(" ", "_")
+
+
+class _TimedMarket:
+    """Market wrapper that records call counts and wall time per method during a profiled tick."""
+
+    def __init__(self, market: Any, calls: dict[str, list[float]]) -> None:
+        self._market = market
+        self._calls = calls
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._market, name)
+        if not callable(attr):
+            return attr
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                entry = self._calls.setdefault(name, [0, 0.0])
+                entry[0] += 1
+                entry[1] += time.perf_counter() - started
+
+        return timed
+
+
+class TickProfiler:
+    """Samples the next N decide() ticks and writes ``<output_dir>/profile-<stamp>.{collapsed,jsonl}``."""
+
+    def __init__(
+        self,
+        output_dir: str,
+        interval_seconds: float = 0.001,
+        default_ticks: int = 10,
+        control_path: str | None = None,
+        control_poll_seconds: float = 5.0,
+    ) -> None:
+        self.output_dir = output_dir
+        self.interval_seconds = interval_seconds
+        self.default_ticks = max(1, default_ticks)
+        self.control_path = control_path
+        self.control_poll_seconds = control_poll_seconds
+        self.remaining = 0
+        self.sessions = 0
+        self.last_output: str | None = None
+        self._requested = 0
+        self._next_control_check = 0.0
+        self._stacks: Counter[tuple[str, ...]] = Counter()
+        self._summaries: list[dict[str, Any]] = []
+        self._tick_index = 0
+        self._tick_started = 0.0
+        self._tick_samples = 0
+        self._tick_calls: dict[str, list[float]] = {}
+        self._tick_stacks: Counter[tuple[str, ...]] = Counter()
+        self._target: tuple[int, FrameType] | None = None
+        # Taken by the sampler for each sample and by end_tick once; never touched while idle.
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def request(self, ticks: int) -> None:
+        """Profile the next ``ticks`` ticks; safe to call from a signal handler or another thread."""
+        self._requested = max(1, int(ticks))
+
+    def _poll_control_file(self) -> None:
+        now = time.monotonic()
+        if now < self._next_control_check:
+            return
+        self._next_control_check = now + self.control_poll_seconds
+        try:
+            with open(self.control_path, encoding="utf-8") as f:
+                text = f.read().strip()
+            os.remove(self.control_path)
+        except OSError:
+            return
+        self.request(int(text) if text.isdigit() else self.default_ticks)
+
+    def begin_tick(self) -> bool:
+        """Called first thing in decide(); returns True when this tick is profiled."""
+        if self.remaining == 0:
+            if self.control_path is not None:
+                self._poll_control_file()
+            if not self._requested:
+                return False
+            self._start_session()
+        self._tick_started = time.perf_counter()
+        self._tick_samples = 0
+        self._tick_calls = {}
+        self._tick_stacks = Counter()
+        self._target = (threading.get_ident(), sys._getframe(1))
+        return True
+
+    def wrap_market(self, market: Any) -> Any:
+        return _TimedMarket(market, self._tick_calls)
+
+    def end_tick(self, branch: str | None = None) -> None:
+        wall = time.perf_counter() - self._tick_started
+        with self._lock:
+            self._target = None
+        self._stacks.update(self._tick_stacks)
+        leaves: Counter[str] = Counter()
+        for stack, samples in self._tick_stacks.items():
+            leaves[stack[-1]] += samples
+        self._summaries.append(
+            {
+                "tick": self._tick_index,
+                "wall_ms": wall * 1000,
+                "samples": self._tick_samples,
+                "branch": branch,
+                "market_calls": {
+                    name: {"count": count, "ms": seconds * 1000} for name, (count, seconds) in self._tick_calls.items()
+                },
+                "top": [{"frame": frame, "samples": samples} for frame, samples in leaves.most_common(5)],
+            }
+        )
+        self._tick_index += 1
+        self.remaining -= 1
+        if self.remaining == 0:
+            self._finish_session()
+
+    def _start_session(self) -> None:
+        self.remaining, self._requested = self._requested, 0
+        self._stacks = Counter()
+        self._summaries = []
+        self._tick_index = 0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="tick-profiler", daemon=True)
+        self._thread.start()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            with self._lock:
+                if self._target is None:
+                    continue
+                thread_id, root = self._target
+                frame = sys._current_frames().get(thread_id)
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    if frame is root:
+                        break
+                    frame = frame.f_back
+                else:
+                    # Not inside decide() yet or any more; nothing to attribute.
+                    continue
+                self._tick_stacks[tuple(reversed(stack))] += 1
+                self._tick_samples += 1
+
+    def _finish_session(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sessions += 1
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{self.sessions}")
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+            for stack, samples in sorted(self._stacks.items()):
+                f.write(f"{';'.join(stack)} {samples}\n")
+        with open(f"{base}.jsonl", "w", encoding="utf-8") as f:
+            for summary in self._summaries:
+                f.write(json.dumps(summary) + "\n")
+        self.last_output = base
+        self._stacks = Counter()
+        self._summaries = []
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "active": self.remaining > 0,
+            "remaining_ticks": self.remaining,
+            "sessions": self.sessions,
+            "last_output": self.last_output,
+        }
@@ -0,0 +1,29 @@
+"""
+Runs many strategy instances side by side in one process.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Sequence
+
+
+class FleetRunner:
+    """Calls ``decide()`` on every strategy each tick using a shared thread pool.
+
+    ``market`` may be a single market object shared by all instances or a
+    callable returning the market for a given strategy.  Pair it with
+    ``shared_market_cache`` so identical reads across instances hit upstream once.
+    """
+
+    def __init__(self, strategies: Sequence[Any], max_workers: int = 8) -> None:
+        self.strategies = list(strategies)
+        self.ticks = 0
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fleet")
+
+    def tick(self, market: Any | Callable[[Any], Any]) -> list[Any]:
+        resolve = market if callable(market) and not hasattr(market, "price") else (lambda strategy: market)
+        futures = [self._pool.submit(strategy.decide, resolve(strategy)) for strategy in self.strategies]
+        self.ticks += 1
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,96 @@
+"""
+Recommended delay until the next tick, derived from how close the strategy is
+to acting.
+"""
+
+import math
+from decimal import Decimal
+
+from .triggers import TriggerLevels
+
+# RSI points above buy_rsi at which an idle flat strategy backs off to the maximum delay.
+RSI_GAP_FOR_MAX_DELAY = 20.0
+# Fraction of the expected time-to-level actually slept, so a typical move is caught early.
+SAFETY_FACTOR = 0.25
+
+
+class VolatilityTracker:
+    """Exponentially weighted variance of log returns per second."""
+
+    __slots__ = ("halflife_seconds", "variance_per_second", "_last_ts", "_last_price")
+
+    def __init__(self, halflife_seconds: float = 3600.0) -> None:
+        self.halflife_seconds = halflife_seconds
+        self.variance_per_second: float | None = None
+        self._last_ts: int | None = None
+        self._last_price: float | None = None
+
+    def update(self, ts: int, price: Decimal) -> None:
+        value = float(price)
+        if value <= 0:
+            return
+        if self._last_ts is not None and ts > self._last_ts:
+            elapsed = ts - self._last_ts
+            sample = math.log(value / self._last_price) ** 2 / elapsed
+            if self.variance_per_second is None:
+                self.variance_per_second = sample
+            else:
+                alpha = 1 - 0.5 ** (elapsed / self.halflife_seconds)
+                self.variance_per_second += alpha * (sample - self.variance_per_second)
+        if self._last_ts is None or ts >= self._last_ts:
+            self._last_ts = ts
+            self._last_price = value
+
+
+def recommend_delay(
+    *,
+    now_ts: int,
+    price: Decimal | None,
+    rsi: Decimal | None,
+    buy_rsi: Decimal,
+    levels: TriggerLevels | None,
+    cooldown_ready_ts: int | None,
+    exit_retry_ready_ts: int | None,
+    variance_per_second: float | None,
+    default_seconds: int,
+    min_seconds: int,
+    max_seconds: int,
+) -> int:
+    def clamp(seconds: float) -> int:
+        return int(max(min_seconds, min(max_seconds, seconds)))
+
+    def time_to_move(gap: float) -> float:
+        if gap <= 0:
+            return 0.0
+        if variance_per_second is None:
+            return default_seconds
+        if variance_per_second == 0:
+            return math.inf
+        return SAFETY_FACTOR * gap * gap / variance_per_second
+
+    if price is None or price <= 0:
+        return clamp(default_seconds)
+
+    if levels is not None:
+        if exit_retry_ready_ts is not None and now_ts < exit_retry_ready_ts and levels.crossed(price, now_ts):
+            return clamp(exit_retry_ready_ts - now_ts)
+        value = float(price)
+        gaps = [float(levels.take_profit_price) - value]
+        if levels.stop_loss_price is not None:
+            gaps.append(value - float(levels.stop_loss_price))
+        candidates = [time_to_move(min(gaps) / value)]
+        if levels.deadline_ts is not None:
+            if now_ts < levels.deadline_ts:
+                candidates.append(levels.deadline_ts - now_ts)
+            else:
+                candidates.append(time_to_move((float(levels.entry_price) - value) / value))
+        return clamp(min(candidates))
+
+    if cooldown_ready_ts is not None and now_ts < cooldown_ready_ts:
+        return clamp(cooldown_ready_ts - now_ts)
+    if rsi is None:
+        return clamp(default_seconds)
+    gap = float(rsi - buy_rsi)
+    if gap <= 0:
+        return min_seconds
+    return clamp(min_seconds + (max_seconds - min_seconds) * min(1.0, gap / RSI_GAP_FOR_MAX_DELAY))
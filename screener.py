@@ -0,0 +1,222 @@
+"""
+Screener mode: watch a universe of base tokens and enter whichever is most oversold.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+
+from almanak.framework.intents import Intent
+
+from .indicators import BatchWilderRSI
+from .portfolio import _SLOT_IDS, TokenSlot
+from .scheduler import VolatilityTracker
+from .strategy import MyStrategyStrategy
+
+
+class _ScreenedRSI:
+    """One row of a BatchWilderRSI behind the WilderRSI interface decide() uses."""
+
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch: BatchWilderRSI, index: int) -> None:
+        self.batch = batch
+        self.index = index
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.batch.warmup_changes[self.index] >= self.batch.period)
+
+    @property
+    def value(self) -> float | None:
+        value = float(self.batch.values()[self.index])
+        return None if np.isnan(value) else value
+
+    def update_tick(self, ts: int, price: float) -> bool:
+        # The screener feeds the whole universe before decide() runs.
+        return False
+
+    def to_state(self) -> None:
+        return None
+
+
+class ScreenerStrategy(MyStrategyStrategy):
+    """Runs MyStrategyStrategy on one base token at a time, chosen from ``screener_tokens``.
+
+    Every tick reads a price for each token and updates RSI for the whole
+    universe in one vectorized step.  While flat, the strategy switches to the
+    token with the lowest RSI below ``buy_rsi``; an open position stays on its
+    token until it is closed.
+    """
+
+    def __init__(
+        self,
+        config: dict[str, Any] | None = None,
+        chain: str = "base",
+        wallet_address: str = "",
+        **kwargs: Any,
+    ) -> None:
+        cfg = config or {}
+        super().__init__(config=cfg, chain=chain, wallet_address=wallet_address, **kwargs)
+        self._universe = [TokenSlot(entry) for entry in cfg.get("screener_tokens") or ()]
+        symbols = [slot.base_token_symbol for slot in self._universe]
+        if len(set(symbols)) != len(symbols):
+            raise ValueError(f"Duplicate screener tokens: {symbols}")
+        # The configured base token is always screened, with its own ids, so a position on it is never stranded.
+        home = TokenSlot(self.base_token_symbol)
+        for name in _SLOT_IDS:
+            setattr(home, name, getattr(self, name))
+        if self.base_token_symbol in symbols:
+            self._universe[symbols.index(self.base_token_symbol)] = home
+        else:
+            self._universe.insert(0, home)
+        self._batch_rsi = BatchWilderRSI(len(self._universe), self.rsi_period, self.rsi_timeframe)
+        # The batch is seeded for the whole universe on the first tick; _ScreenedRSI has nothing to seed.
+        self._local_rsi_seeded = True
+        self._batch_rsi_seeded = False
+        self._screened_price: Decimal | None = None
+        self._screened_ticks = 0
+        self._active = 0
+        self._select(self._index_of(self.base_token_symbol))
+
+    def _index_of(self, symbol: str) -> int:
+        return [slot.base_token_symbol for slot in self._universe].index(symbol)
+
+    def _register_tokens(self) -> None:
+        # Only the ids are swapped, so the active token's candles and volatility are left alone.
+        for slot in self._universe:
+            for name in _SLOT_IDS:
+                setattr(self, name, getattr(slot, name))
+            self._register_base_token()
+        for name in _SLOT_IDS:
+            setattr(self, name, getattr(self._universe[self._active], name))
+
+    def _select(self, index: int) -> None:
+        slot = self._universe[index]
+        for name in _SLOT_IDS:
+            setattr(self, name, getattr(slot, name))
+        if index != self._active:
+            # Volatility, candles and tick history belong to the previous token.
+            self._volatility = VolatilityTracker()
+            self._candles = self._new_candle_store()
+            self._candles_seeded = False
+            self._last_tick_price = None
+            self._last_tick_rsi = None
+        self._active = index
+        self._local_rsi = _ScreenedRSI(self._batch_rsi, index)
+
+    def _seed_batch_rsi(self, market: Any) -> None:
+        self._batch_rsi_seeded = True
+        if not hasattr(market, "ohlcv"):
+            return
+        fetchers = {
+            slot.base_token_symbol: (
+                lambda s=slot: self._ohlcv_closes(
+                    market,
+                    (s.base_token_rsi_id, s.base_token_symbol),
+                    self.rsi_timeframe,
+                    self.rsi_history_limit,
+                    min_closes=self.rsi_period + 1,
+                )
+            )
+            for slot in self._universe
+        }
+        if self._prefetcher is not None:
+            history, _ = self._prefetcher.fetch(fetchers)
+        else:
+            history = {name: fetch() for name, fetch in fetchers.items()}
+        missing = []
+        for index, slot in enumerate(self._universe):
+            closes = history.get(slot.base_token_symbol)
+            if closes:
+                self._batch_rsi.seed_row(index, closes)
+            else:
+                missing.append(slot.base_token_symbol)
+        if missing:
+            self._print_action(
+                "WARN", f"No candle history for screener RSI on {', '.join(missing)}; warming up from ticks"
+            )
+
+    def _fetch_universe_prices(self, market: Any) -> dict[str, Decimal]:
+        fetchers = {
+            slot.base_token_symbol: (
+                lambda s=slot: self._price_with_fallback(
+                    market, s.base_token_price_id, s.base_token_symbol, s.base_token_address
+                )
+            )
+            for slot in self._universe
+        }
+        fetchers = self._instrument_fetchers(fetchers)
+        if self._prefetcher is not None:
+            values, _ = self._prefetcher.fetch(fetchers)
+        else:
+            values = {name: fetch() for name, fetch in fetchers.items()}
+        return values
+
+    def _fetch_price(self, market: Any) -> Decimal:
+        # The screen already read the active token's price this tick.
+        price, self._screened_price = self._screened_price, None
+        return price if price is not None else super()._fetch_price(market)
+
+    def rank(self) -> list[tuple[str, float]]:
+        """Tokens below ``buy_rsi`` as (symbol, rsi), most oversold first."""
+        rsi = self._batch_rsi.values()
+        below = np.flatnonzero(rsi < float(self.buy_rsi))
+        order = below[np.argsort(rsi[below], kind="stable")]
+        return [(self._universe[index].base_token_symbol, float(rsi[index])) for index in order]
+
+    def _best_candidate(self) -> int | None:
+        rsi = self._batch_rsi.values()
+        rsi = np.where(rsi < float(self.buy_rsi), rsi, np.inf)
+        best = int(np.argmin(rsi))
+        return None if np.isinf(rsi[best]) else best
+
+    def decide(self, market: Any) -> Any:
+        try:
+            if not self._tokens_registered:
+                self._ensure_tokens_registered()
+            if not self._batch_rsi_seeded:
+                self._seed_batch_rsi(market)
+            values = self._fetch_universe_prices(market)
+            prices = np.array([float(values.get(slot.base_token_symbol, 0)) for slot in self._universe])
+            self._batch_rsi.update_tick(int(self._clock()), prices)
+            # The first tick runs on the configured token so an existing position is adopted, not stranded.
+            if self._entry_price is None and self._screened_ticks > 0:
+                best = self._best_candidate()
+                if best is not None and best != self._active:
+                    self._select(best)
+            self._screened_ticks += 1
+            self._screened_price = values.get(self._universe[self._active].base_token_symbol)
+        except Exception as exc:
+            self._print_action("ERROR", str(exc))
+            return Intent.hold(reason=f"Error: {exc}")
+        return super().decide(market)
+
+    def _journal_state(self) -> dict[str, Any]:
+        state = super()._journal_state()
+        state["screener"] = {
+            "active": self._universe[self._active].base_token_symbol,
+            "rsi": self._batch_rsi.to_state(),
+        }
+        return state
+
+    def load_persistent_state(self, state: dict[str, Any]) -> None:
+        super().load_persistent_state(state)
+        saved = state.get("screener") or {}
+        if saved.get("rsi"):
+            self._batch_rsi.load_state(saved["rsi"])
+        if saved.get("active") in [slot.base_token_symbol for slot in self._universe]:
+            self._select(self._index_of(saved["active"]))
+            self._screened_ticks = max(self._screened_ticks, 1)
+        self._refresh_triggers()
+
+    def get_status(self) -> dict[str, Any]:
+        status = super().get_status()
+        status["screener"] = {
+            "tokens": len(self._universe),
+            "active": self._universe[self._active].base_token_symbol,
+            "ranked": self.rank()[:10],
+        }
+        return status
+
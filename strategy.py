@@ -1,10 +1,46 @@
 import time
+from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
-from typing import Any
+from types import SimpleNamespace
+from typing import Any, Callable, Mapping
 
 from almanak.framework.intents import Intent
 from almanak.framework.strategies.intent_strategy import IntentStrategy
 
+from .candles import CandleStore
+from .config_reload import RELOADABLE_KEYS, ConfigError, ConfigWatcher, reload_problems
+from .events import EventSink
+from .id_cache import IdResolutionCache
+from .indicators import WilderRSI, timeframe_seconds
+from .instrumentation import StageInstrumentation
+from .journal import StateJournal
+from .ledger import TradeLedger
+from .market_cache import CachedMarket, shared_market_cache
+from .metrics import StrategyMetrics, metrics_server, release_metrics_server
+from .prefetch import MarketPrefetcher, TickInputs
+from .profiler import TickProfiler, install_signal
+from .scheduler import VolatilityTracker, recommend_delay
+from .swap_impact import PoolSnapshot, cap_amount
+from .tape import TapeRecorder
+from .triggers import TriggerLevels
+
+_ZERO = Decimal("0")
+_HUNDRED = Decimal("100")
+_CANDLE_TIME_FIELDS = ("timestamp", "open_time", "time", "date", "datetime")
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledThresholds:
+    """Per-tick constants derived from config once, so decide() never recomputes them."""
+
+    entry_required_profit_usd: Decimal
+    exit_required_profit_usd: Decimal
+    stop_loss_floor_pct: Decimal
+    cooldown_seconds: int
+    exit_retry_cooldown_seconds: int
+    exit_escalation_seconds: int
+    max_hold_seconds: int
+
 
 class MyStrategyStrategy(IntentStrategy):
     def __init__(
@@ -15,7 +51,21 @@ class MyStrategyStrategy(IntentStrategy):
         **kwargs: Any,
     ) -> None:
         cfg = config or {}
+        started = time.perf_counter()
         super().__init__(config=cfg, chain=chain, wallet_address=wallet_address, **kwargs)
+        self._startup_timings: dict[str, float] = {"framework_init": time.perf_counter() - started}
+        stage_started = time.perf_counter()
+        self.event_log_path = str(cfg.get("event_log_path", "") or "").strip() or None
+        self._events = EventSink(
+            path=self.event_log_path,
+            level=str(cfg.get("event_log_level", "status")).strip().lower(),
+            echo=bool(cfg.get("event_log_echo", self.event_log_path is None)),
+            hold_repeat_seconds=float(cfg.get("event_log_hold_repeat_seconds", 0)),
+            queue_size=int(cfg.get("event_log_queue_size", 10000)),
+            recent_size=int(cfg.get("event_log_recent_size", 100)),
+        )
+        self._startup_timings["event_log"] = time.perf_counter() - stage_started
+        stage_started = time.perf_counter()
 
         self.author = cfg.get("author", "0x94t3z")
         self.base_token_symbol = str(cfg.get("base_token", "DEGEN")).strip().lstrip("$").upper()
@@ -36,82 +86,496 @@ class MyStrategyStrategy(IntentStrategy):
         self.swap_protocol = str(cfg.get("swap_protocol", "aerodrome")).strip().lower() or "aerodrome"
         self.base_token_decimals = int(cfg.get("base_token_decimals", 18))
         self.base_token_coingecko_id = str(cfg.get("base_token_coingecko_id", "degen-base")).strip() or None
-        self._register_base_token()
         self.rsi_period = int(cfg.get("rsi_period", 14))
         self.rsi_timeframe = str(cfg.get("rsi_timeframe", "1h"))
-        self.buy_rsi = self._to_decimal(cfg.get("buy_rsi", 38), Decimal("38"))
-        self.trade_amount_usd = self._to_decimal(cfg.get("trade_amount_usd", 250), Decimal("250"))
-        self.max_trade_amount_usd = self._to_decimal(cfg.get("max_trade_amount_usd", "0"), Decimal("0"))
-        self.min_trade_amount_usd = self._to_decimal(cfg.get("min_trade_amount_usd", "1"), Decimal("1"))
-        self.min_quote_reserve_usd = self._to_decimal(cfg.get("min_quote_reserve_usd", "0"), Decimal("0"))
-        self.starting_capital_usd = self._to_decimal(
-            cfg.get("starting_capital_usd", self.trade_amount_usd),
-            self.trade_amount_usd,
-        )
-        self.take_profit_pct = self._to_decimal(cfg.get("take_profit_pct", "0.03"), Decimal("0.03"))
-        self.stop_loss_pct = self._to_decimal(cfg.get("stop_loss_pct", "0.02"), Decimal("0.02"))
-        self.max_hold_minutes = int(cfg.get("max_hold_minutes", 1440))
-        self.cooldown_minutes = int(cfg.get("cooldown_minutes", 30))
-        self.sell_fraction = self._to_decimal(cfg.get("sell_fraction", "1.0"), Decimal("1.0"))
-        self.min_base_position = self._to_decimal(cfg.get("min_base_position", "0.000001"), Decimal("0.000001"))
-        self.max_slippage = self._to_decimal(cfg.get("max_slippage", "0.005"), Decimal("0.005"))
-        self.buy_max_slippage = self._to_decimal(cfg.get("buy_max_slippage", self.max_slippage), self.max_slippage)
-        default_sell_slippage = self.max_slippage if self.max_slippage >= Decimal("0.03") else Decimal("0.03")
-        self.sell_max_slippage = self._to_decimal(cfg.get("sell_max_slippage", default_sell_slippage), default_sell_slippage)
-        self.failed_exit_max_slippage = self._to_decimal(
-            cfg.get("failed_exit_max_slippage", self.sell_max_slippage),
-            self.sell_max_slippage,
-        )
-        if self.failed_exit_max_slippage < self.sell_max_slippage:
-            self.failed_exit_max_slippage = self.sell_max_slippage
-        self.exit_retry_cooldown_minutes = int(cfg.get("exit_retry_cooldown_minutes", 5))
-        self.exit_escalation_window_minutes = int(cfg.get("exit_escalation_window_minutes", 20))
-        self.compound_profits = bool(cfg.get("compound_profits", True))
-        self.compound_factor = self._to_decimal(cfg.get("compound_factor", "1.0"), Decimal("1.0"))
-        self.enable_gas_guard = bool(cfg.get("enable_gas_guard", True))
-        self.estimated_buy_gas_usd = self._to_decimal(cfg.get("estimated_buy_gas_usd", "0.03"), Decimal("0.03"))
-        self.estimated_sell_gas_usd = self._to_decimal(cfg.get("estimated_sell_gas_usd", "0.03"), Decimal("0.03"))
-        self.gas_safety_multiplier = self._to_decimal(cfg.get("gas_safety_multiplier", "2.0"), Decimal("2.0"))
-        self.min_net_profit_usd = self._to_decimal(cfg.get("min_net_profit_usd", "0.03"), Decimal("0.03"))
-        self.enforce_profit_only_exit = bool(cfg.get("enforce_profit_only_exit", False))
+        self.use_local_rsi = bool(cfg.get("use_local_rsi", False))
+        self.rsi_history_limit = int(cfg.get("rsi_history_limit", 250))
+        self.confirm_timeframe = str(cfg.get("confirm_timeframe", "") or "").strip().lower() or None
+        self.candle_timeframes = [str(tf).strip().lower() for tf in cfg.get("candle_timeframes") or ()]
+        if self.confirm_timeframe and self.confirm_timeframe not in self.candle_timeframes:
+            self.candle_timeframes.append(self.confirm_timeframe)
+        self.candle_capacity = int(cfg.get("candle_capacity", 250))
+        self.id_cache_ttl_seconds = float(cfg.get("id_cache_ttl_seconds", 900))
+        self.concurrent_fetch = bool(cfg.get("concurrent_fetch", False))
+        self.fetch_timeout_seconds = float(cfg.get("fetch_timeout_seconds", 10))
+        self.state_journal_path = str(cfg.get("state_journal_path", "") or "").strip() or None
+        self.state_journal_fsync_every = int(cfg.get("state_journal_fsync_every", 10))
+        self.state_journal_compact_every = int(cfg.get("state_journal_compact_every", 1000))
+        self.shared_market_cache = bool(cfg.get("shared_market_cache", False))
+        self.shared_market_cache_ttl_seconds = float(cfg.get("shared_market_cache_ttl_seconds", 5))
+        self.shared_market_cache_max_entries = int(cfg.get("shared_market_cache_max_entries", 1024))
+        self.config_reload_path = str(cfg.get("config_reload_path", "") or "").strip() or None
+        self.config_reload_poll_seconds = float(cfg.get("config_reload_poll_seconds", 2))
+        self.market_tape_path = str(cfg.get("market_tape_path", "") or "").strip() or None
+        self.enable_instrumentation = bool(cfg.get("enable_instrumentation", False))
+        self.metrics_enabled = bool(cfg.get("metrics", False))
+        self.metrics_host = str(cfg.get("metrics_host", "127.0.0.1") or "127.0.0.1").strip()
+        self.metrics_port = int(cfg.get("metrics_port", 9464))
+        self.metrics_instance = str(cfg.get("metrics_instance", "") or "").strip() or None
+        self.metrics_publish_seconds = float(cfg.get("metrics_publish_seconds", 1))
+        self.profile_output_dir = str(cfg.get("profile_output_dir", "profiles") or "profiles").strip()
+        self.profile_interval_ms = float(cfg.get("profile_interval_ms", 1))
+        self.profile_signal = str(cfg.get("profile_signal", "") or "").strip().upper() or None
+        self.profile_control_path = str(cfg.get("profile_control_path", "") or "").strip() or None
+        self.swap_impact = bool(cfg.get("swap_impact", False))
+        self.swap_impact_snapshot = str(cfg.get("swap_impact_snapshot", "") or "").strip() or "liquidity_snapshot.json"
+        self.swap_impact_max_share = self._to_decimal(cfg.get("swap_impact_max_share", "0.5"), Decimal("0.5"))
+        self.swap_impact_candidates = max(1, int(cfg.get("swap_impact_candidates", 32)))
+        for name, value in self._parse_tunables(cfg).items():
+            setattr(self, name, value)
+        self._startup_timings["config"] = time.perf_counter() - stage_started
+        stage_started = time.perf_counter()
+        # Registration and its framework imports run on the first tick; see _ensure_tokens_registered.
+        self._tokens_registered = False
 
         self._entry_price: Decimal | None = None
         self._entry_ts: int | None = None
+        self._triggers: TriggerLevels | None = None
         self._last_buy_ts: int | None = None
         self._last_exit_attempt_ts: int | None = None
         self._last_exit_reason: str | None = None
+        self._ledger = TradeLedger()
+        self._ledger_row: int | None = None
+        self._last_tick_price: Decimal | None = None
+        self._last_tick_rsi: Decimal | None = None
+        self._volatility = VolatilityTracker()
         self._last_portfolio_value_usd = Decimal("0")
         self._last_total_profit_usd = Decimal("0")
         self._last_total_profit_pct = Decimal("0")
+        self._thresholds = self._compile_thresholds()
+        self._clock: Callable[[], float] = time.time
+        self._local_rsi = WilderRSI(self.rsi_period, self.rsi_timeframe) if self.use_local_rsi else None
+        self._local_rsi_seeded = False
+        self._candles = self._new_candle_store()
+        self._candles_seeded = False
+        self._id_cache = IdResolutionCache(ttl_seconds=self.id_cache_ttl_seconds)
+        self._instrumentation = StageInstrumentation() if self.enable_instrumentation else None
+        self._prefetcher = (
+            MarketPrefetcher(timeout_seconds=self.fetch_timeout_seconds) if self.concurrent_fetch else None
+        )
+        self._market_cache = (
+            shared_market_cache(self.shared_market_cache_ttl_seconds, self.shared_market_cache_max_entries)
+            if self.shared_market_cache
+            else None
+        )
+        self._tape = TapeRecorder(self.market_tape_path) if self.market_tape_path else None
+        self._tick_branch = "hold"
+        self._pool_snapshot = PoolSnapshot(self.swap_impact_snapshot) if self.swap_impact else None
+        self._last_swap_impact: dict[str, Any] | None = None
+        self._swap_impact_warned: tuple[str, float | None] | None = None
+        self._profiler: TickProfiler | None = None
+        if self.profile_ticks > 0:
+            self._ensure_profiler().request(self.profile_ticks)
+        if self.profile_control_path:
+            self._ensure_profiler()
+        if self.profile_signal:
+            try:
+                install_signal(self._ensure_profiler(), self.profile_signal)
+            except (AttributeError, ValueError) as exc:
+                # Unknown signal name, or not running on the main thread.
+                self._print_action("WARN", f"Cannot install profiler signal {self.profile_signal}: {exc}")
+        self._metrics: StrategyMetrics | None = None
+        self._metrics_server = None
+        if self.metrics_enabled:
+            self._metrics_server = metrics_server(self.metrics_host, self.metrics_port)
+            instance = self.metrics_instance or f"{self.base_token_symbol}-{len(self._metrics_server.registries)}"
+            self._metrics = StrategyMetrics(publish_interval=self.metrics_publish_seconds, instance=instance)
+            self._metrics_server.register(self._metrics)
+        self._journal = (
+            StateJournal(
+                self.state_journal_path,
+                fsync_every=self.state_journal_fsync_every,
+                compact_every=self.state_journal_compact_every,
+            )
+            if self.state_journal_path
+            else None
+        )
+        self._journal_restored = False
+        # Raw values behind the current tunables, so apply_config can merge onto them.
+        self._reload_config = dict(cfg)
+        self._config_watcher = (
+            ConfigWatcher(self.config_reload_path, self._parse_tunables, self.config_reload_poll_seconds, baseline=cfg)
+            if self.config_reload_path
+            else None
+        )
+        self._startup_timings["components"] = time.perf_counter() - stage_started
+        self._startup_timings["total"] = time.perf_counter() - started
+
+    @classmethod
+    def _parse_tunables(cls, cfg: Mapping[str, Any]) -> dict[str, Any]:
+        """Trading parameters that can be changed on a running instance (see apply_config)."""
+        t = SimpleNamespace()
+        t.buy_rsi = cls._to_decimal(cfg.get("buy_rsi", 38), Decimal("38"))
+        t.trade_amount_usd = cls._to_decimal(cfg.get("trade_amount_usd", 250), Decimal("250"))
+        t.max_trade_amount_usd = cls._to_decimal(cfg.get("max_trade_amount_usd", "0"), Decimal("0"))
+        t.min_trade_amount_usd = cls._to_decimal(cfg.get("min_trade_amount_usd", "1"), Decimal("1"))
+        t.min_quote_reserve_usd = cls._to_decimal(cfg.get("min_quote_reserve_usd", "0"), Decimal("0"))
+        t.starting_capital_usd = cls._to_decimal(
+            cfg.get("starting_capital_usd", t.trade_amount_usd),
+            t.trade_amount_usd,
+        )
+        t.take_profit_pct = cls._to_decimal(cfg.get("take_profit_pct", "0.03"), Decimal("0.03"))
+        t.stop_loss_pct = cls._to_decimal(cfg.get("stop_loss_pct", "0.02"), Decimal("0.02"))
+        t.max_hold_minutes = int(cfg.get("max_hold_minutes", 1440))
+        t.cooldown_minutes = int(cfg.get("cooldown_minutes", 30))
+        t.sell_fraction = cls._to_decimal(cfg.get("sell_fraction", "1.0"), Decimal("1.0"))
+        t.min_base_position = cls._to_decimal(cfg.get("min_base_position", "0.000001"), Decimal("0.000001"))
+        t.max_slippage = cls._to_decimal(cfg.get("max_slippage", "0.005"), Decimal("0.005"))
+        t.buy_max_slippage = cls._to_decimal(cfg.get("buy_max_slippage", t.max_slippage), t.max_slippage)
+        default_sell_slippage = t.max_slippage if t.max_slippage >= Decimal("0.03") else Decimal("0.03")
+        t.sell_max_slippage = cls._to_decimal(cfg.get("sell_max_slippage", default_sell_slippage), default_sell_slippage)
+        t.failed_exit_max_slippage = cls._to_decimal(
+            cfg.get("failed_exit_max_slippage", t.sell_max_slippage),
+            t.sell_max_slippage,
+        )
+        if t.failed_exit_max_slippage < t.sell_max_slippage:
+            t.failed_exit_max_slippage = t.sell_max_slippage
+        t.exit_retry_cooldown_minutes = int(cfg.get("exit_retry_cooldown_minutes", 5))
+        t.exit_escalation_window_minutes = int(cfg.get("exit_escalation_window_minutes", 20))
+        t.compound_profits = bool(cfg.get("compound_profits", True))
+        t.compound_factor = cls._to_decimal(cfg.get("compound_factor", "1.0"), Decimal("1.0"))
+        t.enable_gas_guard = bool(cfg.get("enable_gas_guard", True))
+        t.estimated_buy_gas_usd = cls._to_decimal(cfg.get("estimated_buy_gas_usd", "0.03"), Decimal("0.03"))
+        t.estimated_sell_gas_usd = cls._to_decimal(cfg.get("estimated_sell_gas_usd", "0.03"), Decimal("0.03"))
+        t.gas_safety_multiplier = cls._to_decimal(cfg.get("gas_safety_multiplier", "2.0"), Decimal("2.0"))
+        t.min_net_profit_usd = cls._to_decimal(cfg.get("min_net_profit_usd", "0.03"), Decimal("0.03"))
+        t.enforce_profit_only_exit = bool(cfg.get("enforce_profit_only_exit", False))
+        t.confirm_min_rsi = cls._to_decimal(cfg.get("confirm_min_rsi", 30), Decimal("30"))
+        t.interval_seconds = int(cfg.get("interval", 60))
+        t.min_interval_seconds = int(cfg.get("min_interval_seconds", t.interval_seconds))
+        t.max_interval_seconds = int(cfg.get("max_interval_seconds", t.interval_seconds))
+        t.profile_ticks = int(cfg.get("profile_ticks", 0))
+        if t.max_interval_seconds < t.min_interval_seconds:
+            t.max_interval_seconds = t.min_interval_seconds
+        return vars(t)
+
+    def apply_config(self, cfg: Mapping[str, Any]) -> None:
+        """Merge ``cfg`` onto the current trading parameters, keeping position and cooldown state.
+
+        Raises ConfigError for invalid values and for keys outside RELOADABLE_KEYS that change.
+        """
+        problems = reload_problems(cfg, self._reload_config, partial=True)
+        if problems:
+            raise ConfigError("; ".join(problems))
+        merged = {**self._reload_config, **cfg}
+        self._apply_tunables(self._parse_tunables(merged))
+        self._reload_config = merged
+
+    def _apply_tunables(self, tunables: Mapping[str, Any]) -> None:
+        profile_ticks = self.profile_ticks
+        for name, value in tunables.items():
+            setattr(self, name, value)
+        self._thresholds = self._compile_thresholds()
+        self._refresh_triggers()
+        if self.profile_ticks > 0 and self.profile_ticks != profile_ticks:
+            self._ensure_profiler().request(self.profile_ticks)
+
+    def _ensure_profiler(self) -> TickProfiler:
+        if self._profiler is None:
+            self._profiler = TickProfiler(
+                self.profile_output_dir,
+                interval_seconds=self.profile_interval_ms / 1000,
+                default_ticks=self.profile_ticks or 10,
+                control_path=self.profile_control_path,
+            )
+        return self._profiler
+
+    def _apply_pending_config(self) -> None:
+        watcher = self._config_watcher
+        if watcher.pending is None and watcher.error is None:
+            return
+        tunables, error = watcher.take()
+        if error is not None:
+            self._print_action("WARN", f"Config reload rejected, keeping current config: {error}")
+        if tunables is not None:
+            self._apply_tunables(tunables)
+            # The file is a full config: reloadable keys it leaves out are back at their defaults.
+            fixed = {key: value for key, value in self._reload_config.items() if key not in RELOADABLE_KEYS}
+            reloaded = {key: value for key, value in (watcher.config or {}).items() if key in RELOADABLE_KEYS}
+            self._reload_config = {**fixed, **reloaded}
+            self._print_action("STATUS", f"Config reloaded from {watcher.path}")
 
     @staticmethod
     def _to_decimal(value: Any, default: Decimal) -> Decimal:
+        value_type = type(value)
+        if value_type is Decimal:
+            return value
+        if value_type is int:
+            return Decimal(value)
         try:
             return Decimal(str(value))
         except (InvalidOperation, TypeError, ValueError):
             return default
 
+    def _compile_thresholds(self) -> CompiledThresholds:
+        return CompiledThresholds(
+            entry_required_profit_usd=self._round_trip_gas_buffer_usd() + self.min_net_profit_usd,
+            exit_required_profit_usd=self._sell_gas_buffer_usd() + self.min_net_profit_usd,
+            stop_loss_floor_pct=-self.stop_loss_pct,
+            cooldown_seconds=self.cooldown_minutes * 60,
+            exit_retry_cooldown_seconds=self.exit_retry_cooldown_minutes * 60,
+            exit_escalation_seconds=self.exit_escalation_window_minutes * 60,
+            max_hold_seconds=self.max_hold_minutes * 60,
+        )
+
+    def _refresh_triggers(self) -> None:
+        if self._entry_price is None or self._entry_price <= 0:
+            self._triggers = None
+            return
+        self._triggers = TriggerLevels.for_entry(
+            entry_price=self._entry_price,
+            entry_ts=self._entry_ts,
+            take_profit_pct=self.take_profit_pct,
+            stop_loss_floor_pct=None if self.enforce_profit_only_exit else self._thresholds.stop_loss_floor_pct,
+            max_hold_seconds=self._thresholds.max_hold_seconds,
+        )
+
+    def get_trigger_levels(self) -> TriggerLevels | None:
+        return self._triggers
+
     def _extract_balance(self, balance_obj: Any) -> Decimal:
         if hasattr(balance_obj, "balance"):
-            return self._to_decimal(balance_obj.balance, Decimal("0"))
-        return self._to_decimal(balance_obj, Decimal("0"))
+            return self._to_decimal(balance_obj.balance, _ZERO)
+        return self._to_decimal(balance_obj, _ZERO)
+
+    def _price_with_fallback(self, market: Any, *token_ids: str) -> Decimal:
+        def fetch(token_id: str) -> Decimal | None:
+            price = self._to_decimal(market.price(token_id), _ZERO)
+            return price if price > 0 else None
+
+        price = self._id_cache.resolve("price", token_ids, fetch)
+        return price if price is not None else _ZERO
 
     def _balance_with_fallback(self, market: Any, *token_ids: str) -> Decimal:
+        balance = self._id_cache.resolve(
+            "balance",
+            token_ids,
+            lambda token_id: self._extract_balance(market.balance(token_id)),
+        )
+        return balance if balance is not None else _ZERO
+
+    def _rsi_with_fallback(self, market: Any, *token_ids: str) -> Decimal | None:
+        return self._id_cache.resolve(
+            "rsi",
+            token_ids,
+            lambda token_id: self._extract_rsi(
+                market.rsi(
+                    token_id,
+                    period=self.rsi_period,
+                    timeframe=self.rsi_timeframe,
+                )
+            ),
+        )
+
+    def _extract_rsi(self, rsi_obj: Any) -> Decimal | None:
+        if rsi_obj is None:
+            return None
+        if hasattr(rsi_obj, "value"):
+            return self._to_decimal(rsi_obj.value, _ZERO)
+        return self._to_decimal(rsi_obj, _ZERO)
+
+    @staticmethod
+    def _extract_closes(candles: Any) -> list[float]:
+        if candles is None:
+            return []
+        if hasattr(candles, "columns") and "close" in candles.columns:
+            return [float(close) for close in candles["close"]]
+        closes = []
+        for candle in candles:
+            close = candle.get("close") if isinstance(candle, dict) else getattr(candle, "close", candle)
+            closes.append(float(close))
+        return closes
+
+    @staticmethod
+    def _candle_open_ts(candles: Any) -> int | None:
+        """Open time in epoch seconds of the last candle, when the OHLCV rows carry one."""
+        try:
+            if hasattr(candles, "columns"):
+                column = next((name for name in _CANDLE_TIME_FIELDS if name in candles.columns), None)
+                value = candles[column].iloc[-1] if column is not None else candles.index[-1]
+            else:
+                candle = candles[-1]
+                if isinstance(candle, dict):
+                    value = next((candle[name] for name in _CANDLE_TIME_FIELDS if name in candle), None)
+                else:
+                    value = next((getattr(candle, name) for name in _CANDLE_TIME_FIELDS if hasattr(candle, name)), None)
+        except (IndexError, KeyError, TypeError):
+            return None
+        if hasattr(value, "timestamp"):
+            return int(value.timestamp())
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            # Millisecond timestamps are common in OHLCV feeds.
+            return int(value // 1000 if value > 1e11 else value)
+        return None
+
+    def _fetch_price(self, market: Any) -> Decimal:
+        return self._price_with_fallback(
+            market,
+            self.base_token_price_id,
+            self.base_token_symbol,
+            self.base_token_address,
+        )
+
+    def _fetch_inputs(self, market: Any) -> TickInputs:
+        fetchers = {
+            "price": lambda: self._fetch_price(market),
+            "quote_balance": lambda: self._balance_with_fallback(
+                market,
+                self.quote_token_symbol,
+                self.quote_token,
+                self.quote_token_address,
+            ),
+            "base_balance": lambda: self._balance_with_fallback(
+                market,
+                self.base_token_symbol,
+                self.base_token_balance_id,
+                self.base_token_address,
+            ),
+        }
+        if self._local_rsi is not None and not self._local_rsi_seeded:
+            self._seed_local_rsi(market)
+        if self._candles is not None and not self._candles_seeded:
+            self._seed_candles(market)
+        if not self._has_local_rsi():
+            fetchers["rsi"] = lambda: self._rsi_with_fallback(market, self.base_token_rsi_id, self.base_token_symbol)
+        fetchers = self._instrument_fetchers(fetchers)
+
+        if self._prefetcher is None:
+            price = fetchers.pop("price")()
+            if price <= 0:
+                return TickInputs(price=price)
+            values = {name: fetch() for name, fetch in fetchers.items()}
+            values["price"] = price
+            timed_out: tuple[str, ...] = ()
+        else:
+            values, timed_out = self._prefetcher.fetch(fetchers)
+        return TickInputs(
+            price=values.get("price", _ZERO),
+            quote_balance=values.get("quote_balance", _ZERO),
+            base_balance=values.get("base_balance", _ZERO),
+            rsi=values.get("rsi"),
+            timed_out=timed_out,
+        )
+
+    def _instrument_fetchers(self, fetchers: dict[str, Callable[[], Any]]) -> dict[str, Callable[[], Any]]:
+        if self._instrumentation is None:
+            return fetchers
+        return {
+            name: self._instrumentation.timed(name.rsplit(":", 1)[-1], fetch)
+            for name, fetch in fetchers.items()
+        }
+
+    def _ohlcv_closes(
+        self, market: Any, token_ids: tuple[str, ...], timeframe: str, limit: int, min_closes: int = 1
+    ) -> list[float]:
+        """Closed-bar closes from the first id whose OHLCV history has at least ``min_closes`` of them, else [].
+
+        A last bar that opened in the current bucket is still forming; it is dropped so the live
+        ticks that keep updating it are not counted on top of a seeded copy.
+        """
+        bucket_seconds = timeframe_seconds(timeframe)
+        now_ts = int(self._clock())
         for token_id in token_ids:
-            if not token_id:
-                continue
             try:
-                return self._extract_balance(market.balance(token_id))
+                candles = market.ohlcv(token_id, timeframe=timeframe, limit=limit)
+                closes = self._extract_closes(candles)
             except Exception:
                 continue
-        return Decimal("0")
+            if closes:
+                opened = self._candle_open_ts(candles)
+                if opened is not None and opened >= now_ts - now_ts % bucket_seconds:
+                    closes = closes[:-1]
+            if len(closes) >= min_closes:
+                return closes
+        return []
 
-    def _extract_rsi(self, rsi_obj: Any) -> Decimal | None:
-        if rsi_obj is None:
+    def _seed_local_rsi(self, market: Any) -> None:
+        self._local_rsi_seeded = True
+        if not hasattr(market, "ohlcv"):
+            return
+        closes = self._ohlcv_closes(
+            market,
+            (self.base_token_rsi_id, self.base_token_symbol),
+            self.rsi_timeframe,
+            self.rsi_history_limit,
+            min_closes=self.rsi_period + 1,
+        )
+        if closes:
+            self._local_rsi.seed(closes)
+            return
+        self._print_action("WARN", f"No candle history for local RSI on {self.base_token_symbol}; warming up from ticks")
+
+    def _new_candle_store(self) -> CandleStore | None:
+        if not self.candle_timeframes:
             return None
-        if hasattr(rsi_obj, "value"):
-            return self._to_decimal(rsi_obj.value, Decimal("0"))
-        return self._to_decimal(rsi_obj, Decimal("0"))
+        return CandleStore(self.candle_timeframes, self.candle_capacity)
+
+    def _seed_candles(self, market: Any) -> None:
+        self._candles_seeded = True
+        if not hasattr(market, "ohlcv"):
+            return
+        missing = []
+        for timeframe in self._candles.timeframes:
+            closes = self._ohlcv_closes(
+                market, (self.base_token_rsi_id, self.base_token_symbol), timeframe, self.candle_capacity
+            )
+            if closes:
+                self._candles.series(timeframe).seed(closes)
+            else:
+                missing.append(timeframe)
+        if missing:
+            self._print_action(
+                "WARN",
+                f"No {', '.join(missing)} candle history for {self.base_token_symbol}; building bars from ticks",
+            )
+
+    def _candle_rsi(self) -> Decimal | None:
+        if self._candles is None or self.rsi_timeframe not in self._candles:
+            return None
+        value = self._candles.rsi(self.rsi_timeframe, self.rsi_period)
+        return self._to_decimal(value, _ZERO) if value is not None else None
+
+    def _entry_confirmed(self) -> tuple[bool, str]:
+        if self.confirm_timeframe is None or self._candles is None:
+            return True, ""
+        value = self._candles.rsi(self.confirm_timeframe, self.rsi_period)
+        if value is None:
+            return False, f"Waiting for {self.confirm_timeframe} candles to confirm entry on {self.base_token_symbol}"
+        value = self._to_decimal(value, _ZERO)
+        if value >= self.confirm_min_rsi:
+            return True, ""
+        return (
+            False,
+            (
+                f"{self.confirm_timeframe} RSI {value:.2f} < {self.confirm_min_rsi} "
+                f"blocks entry on {self.base_token_symbol}"
+            ),
+        )
+
+    def _has_local_rsi(self) -> bool:
+        """True when the local engine or the candle store can supply RSI, so the market read is skipped."""
+        return (self._local_rsi is not None and self._local_rsi.ready) or self._candle_rsi() is not None
+
+    def _update_local_rsi(self, now_ts: int, price: Decimal) -> None:
+        self._local_rsi.update_tick(now_ts, float(price))
+
+    def _local_rsi_value(self) -> Decimal | None:
+        if self._local_rsi is None:
+            return None
+        value = self._local_rsi.value
+        if value is None:
+            return None
+        return self._to_decimal(value, _ZERO)
+
+    def _ensure_tokens_registered(self) -> None:
+        """Register with the token resolver before the first market read, timed as a startup stage."""
+        self._tokens_registered = True
+        started = time.perf_counter()
+        self._register_tokens()
+        self._startup_timings["token_registration"] = time.perf_counter() - started
+
+    def _register_tokens(self) -> None:
+        self._register_base_token()
 
     def _register_base_token(self) -> bool:
         if not self.base_token_address.startswith("0x"):
@@ -146,6 +610,10 @@ class MyStrategyStrategy(IntentStrategy):
             self._print_action("WARN", f"Token register failed for {self.base_token_symbol}: {exc}")
             return False
 
+    def get_startup_report(self) -> dict[str, float]:
+        """Milliseconds spent per construction stage."""
+        return {stage: seconds * 1000 for stage, seconds in self._startup_timings.items()}
+
     def _print_status(
         self,
         price: Decimal,
@@ -153,24 +621,45 @@ class MyStrategyStrategy(IntentStrategy):
         base_balance: Decimal,
         rsi: Decimal,
     ) -> None:
-        print(
-            f"[STATUS] {self.base_token_symbol}@{price:.8f} | RSI={rsi} | "
-            f"{self.quote_token_symbol}={quote_balance:.4f} | {self.base_token_symbol}={base_balance:.6f} | "
-            f"Portfolio=${self._last_portfolio_value_usd:.2f} | "
-            f"Profit=${self._last_total_profit_usd:.2f} ({self._last_total_profit_pct * Decimal('100'):.2f}%)"
+        if not self._events.enabled("status"):
+            return
+        message = ""
+        if self._events.echo:
+            message = (
+                f"{self.base_token_symbol}@{price:.8f} | RSI={rsi} | "
+                f"{self.quote_token_symbol}={quote_balance:.4f} | {self.base_token_symbol}={base_balance:.6f} | "
+                f"Portfolio=${self._last_portfolio_value_usd:.2f} | "
+                f"Profit=${self._last_total_profit_usd:.2f} ({self._last_total_profit_pct * _HUNDRED:.2f}%)"
+            )
+        self._events.emit(
+            "status",
+            message,
+            token=self.base_token_symbol,
+            price=price,
+            rsi=rsi,
+            quote_balance=quote_balance,
+            base_balance=base_balance,
+            portfolio_value_usd=self._last_portfolio_value_usd,
+            total_profit_usd=self._last_total_profit_usd,
+            total_profit_pct=self._last_total_profit_pct,
         )
 
-    @staticmethod
-    def _print_action(action: str, reason: str) -> None:
-        print(f"[ACTION] {action}: {reason}")
+    def _print_action(self, action: str, reason: str) -> None:
+        self._events.emit(action.lower(), reason, token=self.base_token_symbol)
 
     def get_persistent_state(self) -> dict[str, Any]:
+        return {**self._journal_state(), "ledger": self._ledger.to_state()}
+
+    def _journal_state(self) -> dict[str, Any]:
+        # Everything but the ledger, which the journal records row by row.
         return {
             "entry_price": str(self._entry_price) if self._entry_price is not None else None,
             "entry_ts": self._entry_ts,
             "last_buy_ts": self._last_buy_ts,
             "last_exit_attempt_ts": self._last_exit_attempt_ts,
             "last_exit_reason": self._last_exit_reason,
+            "local_rsi": self._local_rsi.to_state() if self._local_rsi is not None else None,
+            "ledger_row": self._ledger_row,
         }
 
     def load_persistent_state(self, state: dict[str, Any]) -> None:
@@ -179,15 +668,34 @@ class MyStrategyStrategy(IntentStrategy):
         self._last_buy_ts = state.get("last_buy_ts")
         self._last_exit_attempt_ts = state.get("last_exit_attempt_ts")
         self._last_exit_reason = state.get("last_exit_reason")
+        self._refresh_triggers()
+        if state.get("ledger"):
+            self._ledger.load_state(state["ledger"])
+        if state.get("ledger_rows"):
+            self._ledger.load_rows(state["ledger_rows"])
+        self._ledger_row = state.get("ledger_row")
+        if self._local_rsi is not None and state.get("local_rsi") and self._local_rsi.load_state(state["local_rsi"]):
+            self._local_rsi_seeded = True
+
+    def _restore_from_journal(self) -> None:
+        # Runs on the first tick so subclasses are fully built and the journal wins
+        # over any older snapshot the framework loaded after __init__.
+        self._journal_restored = True
+        state = self._journal.load()
+        if state:
+            self.load_persistent_state(state)
+
+    def _record_journal(self) -> None:
+        self._journal.record(self._journal_state(), merge={"ledger_rows": self._ledger.take_dirty_rows()})
 
     def _compute_buy_amount_usd(self, quote_balance: Decimal) -> Decimal:
         spendable = quote_balance - self.min_quote_reserve_usd
         if spendable <= 0:
-            return Decimal("0")
+            return _ZERO
         if not self.compound_profits:
             target = self.trade_amount_usd
         else:
-            profit_component = max(Decimal("0"), self._last_total_profit_usd) * self.compound_factor
+            profit_component = max(_ZERO, self._last_total_profit_usd) * self.compound_factor
             target = self.trade_amount_usd + profit_component
         if self.max_trade_amount_usd > 0:
             target = min(target, self.max_trade_amount_usd)
@@ -203,7 +711,7 @@ class MyStrategyStrategy(IntentStrategy):
         if not self.enable_gas_guard:
             return True, ""
         expected_gross_profit = buy_amount_usd * self.take_profit_pct
-        required_profit = self._round_trip_gas_buffer_usd() + self.min_net_profit_usd
+        required_profit = self._thresholds.entry_required_profit_usd
         if expected_gross_profit >= required_profit:
             return True, ""
         return (
@@ -214,10 +722,40 @@ class MyStrategyStrategy(IntentStrategy):
             ),
         )
 
+    def _cap_for_swap_impact(self, buy_amount_usd: Decimal) -> tuple[Decimal, str]:
+        """Shrink the buy until the snapshot pool's impact fits in ``swap_impact_max_share`` of buy_max_slippage."""
+        pool = self._pool_snapshot.get(self.swap_protocol, self.base_token_symbol)
+        if pool is None:
+            detail = self._pool_snapshot.error or f"no {self.swap_protocol} pool for {self.base_token_symbol}"
+            self._last_swap_impact = None
+            # Warn once per problem and file version rather than on every buy.
+            warned = (detail, self._pool_snapshot.mtime)
+            if warned != self._swap_impact_warned:
+                self._swap_impact_warned = warned
+                self._print_action("WARN", f"Swap impact check skipped: {detail} in {self.swap_impact_snapshot}")
+            return buy_amount_usd, ""
+        self._swap_impact_warned = None
+        max_impact = self.buy_max_slippage * self.swap_impact_max_share
+        size, impact = cap_amount(pool, float(buy_amount_usd), float(max_impact), self.swap_impact_candidates)
+        capped = min(buy_amount_usd, self._to_decimal(round(size, 6), _ZERO))
+        self._last_swap_impact = {
+            "requested_usd": str(buy_amount_usd),
+            "capped_usd": str(capped),
+            "impact": impact,
+            "max_impact": str(max_impact),
+        }
+        return (
+            capped,
+            (
+                f"Swap impact blocked buy: ${capped:.4f} fits {self.swap_protocol} pool at "
+                f"impact={impact:.4%}, max={max_impact:.4%}, min_trade=${self.min_trade_amount_usd:.4f}"
+            ),
+        )
+
     def _exit_passes_gas_guard(self, pnl_usd: Decimal) -> tuple[bool, str]:
         if not self.enable_gas_guard:
             return True, ""
-        required_profit = self._sell_gas_buffer_usd() + self.min_net_profit_usd
+        required_profit = self._thresholds.exit_required_profit_usd
         if pnl_usd >= required_profit:
             return True, ""
         return (
@@ -231,37 +769,47 @@ class MyStrategyStrategy(IntentStrategy):
     def _can_retry_exit(self, now_ts: int) -> bool:
         if self._last_exit_attempt_ts is None:
             return True
-        cooldown_seconds = self.exit_retry_cooldown_minutes * 60
-        return (now_ts - self._last_exit_attempt_ts) >= cooldown_seconds
+        return (now_ts - self._last_exit_attempt_ts) >= self._thresholds.exit_retry_cooldown_seconds
 
     def _exit_slippage_for_attempt(self, now_ts: int) -> Decimal:
         if self._last_exit_attempt_ts is None:
             return self.sell_max_slippage
-        escalation_seconds = self.exit_escalation_window_minutes * 60
-        if (now_ts - self._last_exit_attempt_ts) <= escalation_seconds:
+        if (now_ts - self._last_exit_attempt_ts) <= self._thresholds.exit_escalation_seconds:
             return self.failed_exit_max_slippage
         return self.sell_max_slippage
 
     def _build_exit_intent(
         self,
         now_ts: int,
+        price: Decimal,
         base_balance: Decimal,
         trigger_label: str,
-        trigger_detail: str,
+        trigger_detail: Callable[[], str],
     ) -> Any:
         if not self._can_retry_exit(now_ts):
-            wait_seconds = (self.exit_retry_cooldown_minutes * 60) - (now_ts - (self._last_exit_attempt_ts or now_ts))
+            wait_seconds = self._thresholds.exit_retry_cooldown_seconds - (now_ts - (self._last_exit_attempt_ts or now_ts))
             reason = (
                 f"Exit cooldown active after recent {self._last_exit_reason or 'exit'} attempt; "
                 f"retry in {max(wait_seconds, 0)}s"
             )
+            self._tick_branch = "exit_cooldown"
             self._print_action("HOLD", reason)
             return Intent.hold(reason=reason)
 
         exit_slippage = self._exit_slippage_for_attempt(now_ts)
+        self._tick_branch = "sell"
+        if self._metrics is not None:
+            self._metrics.inc("sells_total", trigger=trigger_label)
+            if self._last_exit_attempt_ts is not None:
+                self._metrics.inc("exit_retries_total")
         self._last_exit_attempt_ts = now_ts
         self._last_exit_reason = trigger_label
-        self._print_action("SELL", f"{trigger_detail}; slippage={exit_slippage * Decimal('100'):.2f}%")
+        if self._ledger_row is not None:
+            self._ledger.mark_exit(
+                self._ledger_row, now_ts, price, trigger_label, exit_slippage, self.estimated_sell_gas_usd
+            )
+        if self._events.enabled("sell"):
+            self._print_action("SELL", f"{trigger_detail()}; slippage={exit_slippage * _HUNDRED:.2f}%")
         return Intent.swap(
             from_token=self.base_token_trade_id,
             to_token=self.quote_token,
@@ -272,186 +820,333 @@ class MyStrategyStrategy(IntentStrategy):
         )
 
     def decide(self, market: Any) -> Any:
+        instrumentation = self._instrumentation
+        tick_started = time.perf_counter() if instrumentation is not None else 0.0
+        profiling = self._profiler is not None and self._profiler.begin_tick()
+        if profiling:
+            market = self._profiler.wrap_market(market)
         try:
-            price = Decimal("0")
-            for price_token in (
-                self.base_token_price_id,
-                self.base_token_symbol,
-                self.base_token_address,
-            ):
-                if not price_token:
-                    continue
-                try:
-                    price = self._to_decimal(market.price(price_token), Decimal("0"))
-                except Exception:
-                    price = Decimal("0")
-                if price > 0:
-                    break
+            if self._journal is not None and not self._journal_restored:
+                self._restore_from_journal()
+            if not self._tokens_registered:
+                self._ensure_tokens_registered()
+            if self._config_watcher is not None:
+                self._apply_pending_config()
+            now_ts = int(self._clock())
+            self._tick_branch = "hold"
+            if self._market_cache is not None:
+                market = CachedMarket(
+                    market, self._market_cache, self.chain, self.wallet_address, self.fetch_timeout_seconds
+                )
+            if self._tape is not None:
+                market = self._tape.wrap(market, now_ts)
+            if instrumentation is not None:
+                instrumentation.current = "fetch"
+            inputs = self._fetch_inputs(market)
+            price = inputs.price
             if price <= 0:
                 reason = f"No price for {self.base_token_symbol} (id={self.base_token_price_id})"
+                self._tick_branch = "no_price"
                 self._print_action("HOLD", reason)
                 return Intent.hold(reason=reason)
 
-            quote_balance = self._balance_with_fallback(
-                market,
-                self.quote_token_symbol,
-                self.quote_token,
-                self.quote_token_address,
-            )
-            base_balance = self._balance_with_fallback(
-                market,
-                self.base_token_symbol,
-                self.base_token_balance_id,
-                self.base_token_address,
-            )
-            rsi = None
-            for rsi_token in (self.base_token_rsi_id, self.base_token_symbol):
-                try:
-                    rsi = self._extract_rsi(
-                        market.rsi(
-                            rsi_token,
-                            period=self.rsi_period,
-                            timeframe=self.rsi_timeframe,
-                        )
-                    )
-                except Exception:
-                    rsi = None
-                if rsi is not None:
-                    break
+            if "quote_balance" in inputs.timed_out or "base_balance" in inputs.timed_out:
+                # A missing balance would look like a closed position, so never act on it.
+                reason = f"Balance fetch timed out for {self.base_token_symbol}: {', '.join(inputs.timed_out)}"
+                self._tick_branch = "balance_timeout"
+                self._print_action("HOLD", reason)
+                return Intent.hold(reason=reason)
+
+            if self._local_rsi is not None:
+                self._update_local_rsi(now_ts, price)
+            if self._candles is not None:
+                self._candles.update(now_ts, float(price))
+
+            quote_balance = inputs.quote_balance
+            base_balance = inputs.base_balance
+            rsi = self._local_rsi_value()
+            if rsi is None:
+                rsi = self._candle_rsi()
+            if rsi is None:
+                rsi = inputs.rsi
 
             if rsi is None:
                 reason = f"No RSI for {self.base_token_symbol}"
+                self._tick_branch = "no_rsi"
                 self._print_action("HOLD", reason)
                 return Intent.hold(reason=reason)
 
-            self._last_portfolio_value_usd = quote_balance + (base_balance * price)
-            self._last_total_profit_usd = self._last_portfolio_value_usd - self.starting_capital_usd
-            if self.starting_capital_usd > 0:
-                self._last_total_profit_pct = self._last_total_profit_usd / self.starting_capital_usd
-            else:
-                self._last_total_profit_pct = Decimal("0")
+            if instrumentation is None:
+                self._update_portfolio_value(quote_balance + (base_balance * price))
+                self._print_status(price, quote_balance, base_balance, rsi)
+                return self._decide_position(now_ts, price, quote_balance, base_balance, rsi)
 
+            instrumentation.current = "status"
+            stage_started = time.perf_counter()
+            self._update_portfolio_value(quote_balance + (base_balance * price))
             self._print_status(price, quote_balance, base_balance, rsi)
+            instrumentation.record("status", time.perf_counter() - stage_started)
+            instrumentation.current = "decision"
+            stage_started = time.perf_counter()
+            intent = self._decide_position(now_ts, price, quote_balance, base_balance, rsi)
+            instrumentation.record("decision", time.perf_counter() - stage_started)
+            return intent
+        except Exception as exc:
+            if instrumentation is not None:
+                instrumentation.record_exception(instrumentation.current or "tick")
+            self._tick_branch = "error"
+            self._print_action("ERROR", str(exc))
+            return Intent.hold(reason=f"Error: {exc}")
+        finally:
+            if self._tape is not None:
+                self._tape.end_tick()
+            if self._journal is not None:
+                self._record_journal()
+            if self._metrics is not None:
+                self._record_metrics()
+            if instrumentation is not None:
+                instrumentation.record("tick", time.perf_counter() - tick_started)
+                instrumentation.current = None
+            if profiling:
+                self._profiler.end_tick(self._tick_branch)
 
-            now_ts = int(time.time())
-            position_open = base_balance >= self.min_base_position
-
-            if not position_open and self._entry_price is not None:
-                # Position has likely closed, reset entry tracking.
-                self._entry_price = None
-                self._entry_ts = None
-                self._last_exit_attempt_ts = None
-                self._last_exit_reason = None
-
-            if position_open and self._entry_price is None:
-                # Fallback when strategy restarts with an existing position.
-                self._entry_price = price
-                self._entry_ts = now_ts
-
-            if position_open and self._entry_price is not None:
-                entry_price = self._entry_price
-                pnl_pct = (price - entry_price) / entry_price if entry_price > 0 else Decimal("0")
-                pnl_usd = base_balance * (price - entry_price)
-                held_minutes = (
-                    (now_ts - self._entry_ts) / 60
-                    if self._entry_ts is not None
-                    else 0
-                )
+    def _record_metrics(self) -> None:
+        metrics = self._metrics
+        branch = self._tick_branch
+        metrics.inc("ticks_total", branch=branch)
+        if branch == "buy":
+            metrics.inc("buys_total")
+        elif branch.startswith("gas_guard_"):
+            metrics.inc("gas_guard_blocks_total", side=branch.removeprefix("gas_guard_"))
+        elif branch == "error":
+            metrics.inc("errors_total")
+        metrics.set("portfolio_value_usd", float(self._last_portfolio_value_usd))
+        metrics.set("total_profit_usd", float(self._last_total_profit_usd))
+        self._record_position_metrics()
+        metrics.publish()
 
-                if pnl_pct >= self.take_profit_pct:
-                    ok, reason = self._exit_passes_gas_guard(pnl_usd)
-                    if not ok:
-                        self._print_action("HOLD", reason)
-                        return Intent.hold(reason=reason)
-                    return self._build_exit_intent(
-                        now_ts=now_ts,
-                        base_balance=base_balance,
-                        trigger_label="take_profit",
-                        trigger_detail=f"Take profit hit at {pnl_pct * Decimal('100'):.2f}%",
-                    )
-
-                if not self.enforce_profit_only_exit and pnl_pct <= -self.stop_loss_pct:
-                    return self._build_exit_intent(
-                        now_ts=now_ts,
-                        base_balance=base_balance,
-                        trigger_label="stop_loss",
-                        trigger_detail=f"Stop loss hit at {pnl_pct * Decimal('100'):.2f}%",
-                    )
-
-                if held_minutes >= self.max_hold_minutes and pnl_pct > 0:
-                    ok, reason = self._exit_passes_gas_guard(pnl_usd)
-                    if not ok:
-                        self._print_action("HOLD", reason)
-                        return Intent.hold(reason=reason)
-                    return self._build_exit_intent(
-                        now_ts=now_ts,
-                        base_balance=base_balance,
-                        trigger_label="time_exit",
-                        trigger_detail=(
-                            f"Time exit after {held_minutes:.1f}m with profit {pnl_pct * Decimal('100'):.2f}%"
-                        ),
-                    )
-
-                reason = (
-                    f"Holding {self.base_token_symbol}: pos_pnl={pnl_pct:.4f}, "
-                    f"total_profit=${self._last_total_profit_usd:.2f}, rsi={rsi}"
-                )
-                self._print_action("HOLD", reason)
-                return Intent.hold(reason=reason)
+    def _record_position_metrics(self) -> None:
+        metrics = self._metrics
+        token = self.base_token_symbol
+        metrics.set("position_open", 1.0 if self._entry_price is not None else 0.0, token=token)
+        metrics.set("entry_price", float(self._entry_price or 0), token=token)
+        if self._last_tick_price is not None:
+            metrics.set("price", float(self._last_tick_price), token=token)
+        if self._last_tick_rsi is not None:
+            metrics.set("rsi", float(self._last_tick_rsi), token=token)
+
+    def _update_portfolio_value(self, portfolio_value_usd: Decimal) -> None:
+        self._last_portfolio_value_usd = portfolio_value_usd
+        self._last_total_profit_usd = self._last_portfolio_value_usd - self.starting_capital_usd
+        if self.starting_capital_usd > 0:
+            self._last_total_profit_pct = self._last_total_profit_usd / self.starting_capital_usd
+        else:
+            self._last_total_profit_pct = Decimal("0")
 
-            cooldown_ok = (
-                self._last_buy_ts is None
-                or (now_ts - self._last_buy_ts) >= self.cooldown_minutes * 60
+    def _decide_position(
+        self,
+        now_ts: int,
+        price: Decimal,
+        quote_balance: Decimal,
+        base_balance: Decimal,
+        rsi: Decimal,
+    ) -> Any:
+        self._last_tick_price = price
+        self._last_tick_rsi = rsi
+        self._volatility.update(now_ts, price)
+        position_open = base_balance >= self.min_base_position
+
+        if not position_open and self._entry_price is not None:
+            # Position has likely closed, reset entry tracking.
+            self._entry_price = None
+            self._entry_ts = None
+            self._triggers = None
+            self._last_exit_attempt_ts = None
+            self._last_exit_reason = None
+            if self._ledger_row is not None:
+                self._ledger.close(self._ledger_row, now_ts, price)
+                self._ledger_row = None
+
+        if position_open and self._entry_price is None:
+            # Fallback when strategy restarts with an existing position.
+            self._entry_price = price
+            self._entry_ts = now_ts
+            self._refresh_triggers()
+            self._ledger_row = self._ledger.open(
+                now_ts, price, base_balance, base_balance * price, _ZERO, _ZERO
             )
-            if not cooldown_ok:
-                reason = (
-                    f"Cooldown active for {self.base_token_symbol}; "
-                    f"total_profit=${self._last_total_profit_usd:.2f}"
+
+        if position_open and self._entry_price is not None:
+            entry_price = self._entry_price
+            thresholds = self._thresholds
+            pnl_pct = (price - entry_price) / entry_price if entry_price > 0 else _ZERO
+            pnl_usd = base_balance * (price - entry_price)
+            held_seconds = now_ts - self._entry_ts if self._entry_ts is not None else 0
+
+            if pnl_pct >= self.take_profit_pct:
+                ok, reason = self._exit_passes_gas_guard(pnl_usd)
+                if not ok:
+                    self._tick_branch = "gas_guard_sell"
+                    self._print_action("HOLD", reason)
+                    return Intent.hold(reason=reason)
+                return self._build_exit_intent(
+                    now_ts=now_ts,
+                    price=price,
+                    base_balance=base_balance,
+                    trigger_label="take_profit",
+                    trigger_detail=lambda: f"Take profit hit at {pnl_pct * _HUNDRED:.2f}%",
                 )
-                self._print_action("HOLD", reason)
-                return Intent.hold(reason=reason)
 
-            buy_amount_usd = self._compute_buy_amount_usd(quote_balance)
-            if buy_amount_usd < self.min_trade_amount_usd:
-                reason = (
-                    f"Insufficient {self.quote_token} for min trade: "
-                    f"spendable=${buy_amount_usd:.4f}, min=${self.min_trade_amount_usd:.4f}"
+            if not self.enforce_profit_only_exit and pnl_pct <= thresholds.stop_loss_floor_pct:
+                return self._build_exit_intent(
+                    now_ts=now_ts,
+                    price=price,
+                    base_balance=base_balance,
+                    trigger_label="stop_loss",
+                    trigger_detail=lambda: f"Stop loss hit at {pnl_pct * _HUNDRED:.2f}%",
                 )
-                self._print_action("HOLD", reason)
-                return Intent.hold(reason=reason)
 
-            if rsi < self.buy_rsi and buy_amount_usd >= self.min_trade_amount_usd:
-                ok, reason = self._entry_passes_gas_guard(buy_amount_usd)
+            if held_seconds >= thresholds.max_hold_seconds and pnl_pct > 0:
+                ok, reason = self._exit_passes_gas_guard(pnl_usd)
                 if not ok:
+                    self._tick_branch = "gas_guard_sell"
                     self._print_action("HOLD", reason)
                     return Intent.hold(reason=reason)
-                self._entry_price = price
-                self._entry_ts = now_ts
-                self._last_buy_ts = now_ts
-                self._last_exit_attempt_ts = None
-                self._last_exit_reason = None
-                self._print_action(
-                    "BUY",
-                    f"RSI {rsi} below {self.buy_rsi}; deploying ${buy_amount_usd:.4f}",
-                )
-                return Intent.swap(
-                    from_token=self.quote_token,
-                    to_token=self.base_token_trade_id,
-                    amount_usd=buy_amount_usd,
-                    max_slippage=self.buy_max_slippage,
-                    protocol=self.swap_protocol,
-                    chain=self.chain,
+                return self._build_exit_intent(
+                    now_ts=now_ts,
+                    price=price,
+                    base_balance=base_balance,
+                    trigger_label="time_exit",
+                    trigger_detail=lambda: (
+                        f"Time exit after {held_seconds / 60:.1f}m with profit {pnl_pct * _HUNDRED:.2f}%"
+                    ),
                 )
 
             reason = (
-                f"No entry for {self.base_token_symbol} (rsi={rsi}); "
+                f"Holding {self.base_token_symbol}: pos_pnl={pnl_pct:.4f}, "
+                f"total_profit=${self._last_total_profit_usd:.2f}, rsi={rsi}"
+            )
+            self._tick_branch = "holding"
+            self._print_action("HOLD", reason)
+            return Intent.hold(reason=reason)
+
+        cooldown_ok = (
+            self._last_buy_ts is None
+            or (now_ts - self._last_buy_ts) >= self._thresholds.cooldown_seconds
+        )
+        if not cooldown_ok:
+            reason = (
+                f"Cooldown active for {self.base_token_symbol}; "
                 f"total_profit=${self._last_total_profit_usd:.2f}"
             )
+            self._tick_branch = "cooldown"
             self._print_action("HOLD", reason)
             return Intent.hold(reason=reason)
-        except Exception as exc:
-            self._print_action("ERROR", str(exc))
-            return Intent.hold(reason=f"Error: {exc}")
+
+        buy_amount_usd = requested_usd = self._compute_buy_amount_usd(quote_balance)
+        if buy_amount_usd < self.min_trade_amount_usd:
+            reason = (
+                f"Insufficient {self.quote_token} for min trade: "
+                f"spendable=${buy_amount_usd:.4f}, min=${self.min_trade_amount_usd:.4f}"
+            )
+            self._tick_branch = "insufficient_funds"
+            self._print_action("HOLD", reason)
+            return Intent.hold(reason=reason)
+
+        if rsi < self.buy_rsi and buy_amount_usd >= self.min_trade_amount_usd:
+            ok, reason = self._entry_confirmed()
+            self._tick_branch = "unconfirmed"
+            if ok and self._pool_snapshot is not None:
+                buy_amount_usd, reason = self._cap_for_swap_impact(buy_amount_usd)
+                ok = buy_amount_usd > 0 and buy_amount_usd >= self.min_trade_amount_usd
+                self._tick_branch = "swap_impact"
+            if ok:
+                ok, reason = self._entry_passes_gas_guard(buy_amount_usd)
+                self._tick_branch = "gas_guard_buy"
+            if not ok:
+                self._print_action("HOLD", reason)
+                return Intent.hold(reason=reason)
+            self._entry_price = price
+            self._entry_ts = now_ts
+            self._refresh_triggers()
+            self._ledger_row = self._ledger.open(
+                now_ts,
+                price,
+                buy_amount_usd / price,
+                buy_amount_usd,
+                self.buy_max_slippage,
+                self.estimated_buy_gas_usd,
+            )
+            self._last_buy_ts = now_ts
+            self._last_exit_attempt_ts = None
+            self._last_exit_reason = None
+            self._tick_branch = "buy"
+            if self._events.enabled("buy"):
+                capped = f" (capped from ${requested_usd:.4f} by swap impact)" if buy_amount_usd < requested_usd else ""
+                self._print_action(
+                    "BUY",
+                    f"RSI {rsi} below {self.buy_rsi}; deploying ${buy_amount_usd:.4f}{capped}",
+                )
+            return Intent.swap(
+                from_token=self.quote_token,
+                to_token=self.base_token_trade_id,
+                amount_usd=buy_amount_usd,
+                max_slippage=self.buy_max_slippage,
+                protocol=self.swap_protocol,
+                chain=self.chain,
+            )
+
+        reason = (
+            f"No entry for {self.base_token_symbol} (rsi={rsi}); "
+            f"total_profit=${self._last_total_profit_usd:.2f}"
+        )
+        self._tick_branch = "idle"
+        self._print_action("HOLD", reason)
+        return Intent.hold(reason=reason)
+
+    def get_next_tick_seconds(self, now_ts: int | None = None) -> int:
+        """Recommended delay before the next decide(), within min/max_interval_seconds."""
+        if now_ts is None:
+            now_ts = int(self._clock())
+        thresholds = self._thresholds
+        return recommend_delay(
+            now_ts=now_ts,
+            price=self._last_tick_price,
+            rsi=self._last_tick_rsi,
+            buy_rsi=self.buy_rsi,
+            levels=self._triggers,
+            cooldown_ready_ts=(
+                self._last_buy_ts + thresholds.cooldown_seconds if self._last_buy_ts is not None else None
+            ),
+            exit_retry_ready_ts=(
+                self._last_exit_attempt_ts + thresholds.exit_retry_cooldown_seconds
+                if self._last_exit_attempt_ts is not None
+                else None
+            ),
+            variance_per_second=self._volatility.variance_per_second,
+            default_seconds=self.interval_seconds,
+            min_seconds=self.min_interval_seconds,
+            max_seconds=self.max_interval_seconds,
+        )
+
+    def close(self) -> None:
+        """Release background resources; call once when the strategy is being torn down."""
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+        if self._journal is not None:
+            # Joins the fsync thread and syncs the tail it has not reached yet.
+            self._journal.close()
+        if self._tape is not None:
+            self._tape.close()
+            self._tape = None
+        if self._config_watcher is not None:
+            self._config_watcher.close()
+        if self._metrics is not None:
+            release_metrics_server(self._metrics_server, self._metrics)
+            self._metrics = None
+            self._metrics_server = None
+        self._events.close()
 
     def get_status(self) -> dict[str, Any]:
         return {
@@ -485,7 +1180,31 @@ class MyStrategyStrategy(IntentStrategy):
             "buy_rsi": str(self.buy_rsi),
             "take_profit_pct": str(self.take_profit_pct),
             "stop_loss_pct": str(self.stop_loss_pct),
+            "use_local_rsi": self.use_local_rsi,
+            "local_rsi_ready": self._local_rsi.ready if self._local_rsi is not None else False,
+            "candles": self._candles.stats(self.rsi_period) if self._candles is not None else None,
+            "confirm_timeframe": self.confirm_timeframe,
+            "confirm_min_rsi": str(self.confirm_min_rsi),
+            "id_cache": self._id_cache.stats(),
+            "fetches_in_flight": self._prefetcher.in_flight if self._prefetcher is not None else None,
+            "event_log": self._events.stats(),
+            "recent_events": self._events.recent(),
+            "ledger": self._ledger.analytics(),
+            "startup_ms": self.get_startup_report(),
+            "config_reload": self._config_watcher.stats() if self._config_watcher is not None else None,
+            "shared_market_cache": self._market_cache.stats() if self._market_cache is not None else None,
+            "state_journal": self._journal.stats() if self._journal is not None else None,
+            "metrics": self._metrics_server.stats() if self._metrics_server is not None else None,
+            "profiler": self._profiler.stats() if self._profiler is not None else None,
+            "swap_impact": self._last_swap_impact,
+            "instrumentation": (
+                {**self._instrumentation.snapshot(), "fallback_failures": dict(self._id_cache.failures)}
+                if self._instrumentation is not None
+                else None
+            ),
             "entry_price": str(self._entry_price) if self._entry_price is not None else None,
+            "trigger_levels": self._triggers.to_dict() if self._triggers is not None else None,
+            "next_tick_seconds": self.get_next_tick_seconds(),
             "last_exit_attempt_ts": self._last_exit_attempt_ts,
             "last_exit_reason": self._last_exit_reason,
             "starting_capital_usd": str(self.starting_capital_usd),
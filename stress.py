@@ -0,0 +1,312 @@
+"""
+Monte Carlo stress test of the exit path under fast drawdowns.
+
+Synthetic price paths (GBM, or GBM with jumps and gaps) are generated as NumPy
+arrays, and the strategy's exit rules are stepped across every path at once:
+take profit, stop loss, time exit, the sell gas guard, the exit-retry cooldown
+and slippage escalation after a failed exit.  Each path starts with a freshly
+opened ``trade_amount_usd`` position at ``entry_price``.
+"""
+
+import argparse
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .backtest import _make_strategy
+from .strategy import MyStrategyStrategy
+
+TRIGGERS = ("none", "take_profit", "stop_loss", "time_exit")
+_SECONDS_PER_YEAR = 365 * 86400
+_TAKE_PROFIT, _STOP_LOSS, _TIME_EXIT = 1, 2, 3
+
+
+@dataclass(frozen=True, slots=True)
+class GBMModel:
+    """Geometric Brownian motion; ``volatility`` and ``drift`` are annualized."""
+
+    volatility: float = 1.5
+    drift: float = 0.0
+
+    def log_returns(self, rng: np.random.Generator, n_paths: int, n_steps: int, step_seconds: int) -> np.ndarray:
+        dt = step_seconds / _SECONDS_PER_YEAR
+        mean = (self.drift - 0.5 * self.volatility**2) * dt
+        return rng.normal(mean, self.volatility * math.sqrt(dt), size=(n_paths, n_steps))
+
+
+@dataclass(frozen=True, slots=True)
+class JumpModel(GBMModel):
+    """GBM plus Poisson jumps with normal log sizes; a negative ``jump_mean`` models gap-downs."""
+
+    jumps_per_day: float = 2.0
+    jump_mean: float = -0.05
+    jump_std: float = 0.05
+
+    def log_returns(self, rng: np.random.Generator, n_paths: int, n_steps: int, step_seconds: int) -> np.ndarray:
+        returns = GBMModel.log_returns(self, rng, n_paths, n_steps, step_seconds)
+        counts = rng.poisson(self.jumps_per_day * step_seconds / 86400, size=returns.shape)
+        jumped = counts > 0
+        sizes = rng.standard_normal(int(jumped.sum()))
+        returns[jumped] += counts[jumped] * self.jump_mean + np.sqrt(counts[jumped]) * self.jump_std * sizes
+        return returns
+
+
+def sample_paths(
+    model: GBMModel,
+    n_paths: int,
+    n_steps: int,
+    step_seconds: int = 60,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Price paths relative to the entry: shape (n_paths, n_steps + 1), column 0 is 1.0."""
+    rng = rng if rng is not None else np.random.default_rng()
+    paths = np.empty((n_paths, n_steps + 1))
+    paths[:, 0] = 1.0
+    np.cumsum(model.log_returns(rng, n_paths, n_steps, step_seconds), axis=1, out=paths[:, 1:])
+    np.exp(paths[:, 1:], out=paths[:, 1:])
+    return paths
+
+
+@dataclass
+class StressResult:
+    """Per-path outcomes; ``exit_seconds`` is NaN for positions still open at the horizon."""
+
+    pnl_usd: np.ndarray
+    exit_seconds: np.ndarray
+    slippage_usd: np.ndarray
+    gas_usd: np.ndarray
+    attempts: np.ndarray
+    trigger: np.ndarray
+
+    @classmethod
+    def concat(cls, parts: list["StressResult"]) -> "StressResult":
+        return cls(
+            *(np.concatenate([getattr(part, name) for part in parts]) for name in cls.__dataclass_fields__)
+        )
+
+    def summary(self) -> dict[str, Any]:
+        pnl = np.sort(self.pnl_usd)
+        tail = pnl[: max(1, pnl.shape[0] // 20)]
+        exited = ~np.isnan(self.exit_seconds)
+        exit_minutes = self.exit_seconds[exited] / 60
+        summary = {
+            "paths": int(pnl.shape[0]),
+            "pnl_mean_usd": float(pnl.mean()),
+            "pnl_p1_usd": float(np.percentile(pnl, 1)),
+            "pnl_p5_usd": float(np.percentile(pnl, 5)),
+            "pnl_p50_usd": float(np.percentile(pnl, 50)),
+            "pnl_cvar5_usd": float(tail.mean()),
+            "loss_rate": float((pnl < 0).mean()),
+            "exit_rate": float(exited.mean()),
+            "exit_minutes_p50": float(np.percentile(exit_minutes, 50)) if exit_minutes.size else None,
+            "exit_minutes_p95": float(np.percentile(exit_minutes, 95)) if exit_minutes.size else None,
+            "slippage_mean_usd": float(self.slippage_usd.mean()),
+            "slippage_p95_usd": float(np.percentile(self.slippage_usd, 95)),
+            "gas_mean_usd": float(self.gas_usd.mean()),
+            "attempts_mean": float(self.attempts.mean()),
+            "attempts_max": int(self.attempts.max()),
+        }
+        for code, name in enumerate(TRIGGERS[1:], start=1):
+            summary[f"{name}_share"] = float((self.trigger[exited] == code).mean()) if exited.any() else 0.0
+        return summary
+
+
+def simulate_exits(
+    strategy: MyStrategyStrategy | dict[str, Any],
+    paths: np.ndarray,
+    step_seconds: int = 60,
+    *,
+    swap_fail_prob: float = 0.0,
+    swap_fails: np.ndarray | None = None,
+    slippage_used: float = 1.0,
+    entry_price: float = 1.0,
+    rng: np.random.Generator | None = None,
+) -> StressResult:
+    """Run the exit rules over ``paths`` (relative prices, one row per path).
+
+    A swap attempt fails with ``swap_fail_prob`` unless ``swap_fails`` gives the
+    outcome per path and step.  A filled sell pays ``slippage_used`` times the
+    slippage limit it was sent with.
+    """
+    strategy = _make_strategy(strategy)
+    thresholds = strategy._thresholds
+    rng = rng if rng is not None else np.random.default_rng()
+    paths = np.asarray(paths, dtype=np.float64)
+    n_paths, n_cols = paths.shape
+
+    position_usd = float(strategy.trade_amount_usd)
+    take_profit_pct = float(strategy.take_profit_pct)
+    stop_loss_floor_pct = float(thresholds.stop_loss_floor_pct)
+    required_profit = float(thresholds.exit_required_profit_usd) if strategy.enable_gas_guard else -math.inf
+    sell_slippage = float(strategy.sell_max_slippage) * slippage_used
+    failed_slippage = float(strategy.failed_exit_max_slippage) * slippage_used
+    sell_fraction = float(strategy.sell_fraction)
+    min_base = float(strategy.min_base_position)
+    sell_gas = float(strategy.estimated_sell_gas_usd)
+
+    remaining = np.full(n_paths, position_usd / entry_price)
+    last_attempt = np.full(n_paths, -math.inf)
+    attempted = np.zeros(n_paths, dtype=bool)
+    is_open = remaining >= min_base
+    exit_seconds = np.full(n_paths, np.nan)
+    trigger = np.zeros(n_paths, dtype=np.int8)
+    attempts = np.zeros(n_paths, dtype=np.int32)
+    proceeds = np.zeros(n_paths)
+    slippage_usd = np.zeros(n_paths)
+
+    for step in range(n_cols):
+        if not is_open.any():
+            break
+        now = step * step_seconds
+        price = paths[:, step] * entry_price
+        pnl_pct = price / entry_price - 1.0
+        guard_ok = remaining * (price - entry_price) >= required_profit
+        take_profit = pnl_pct >= take_profit_pct
+        stop_loss = ~take_profit & (pnl_pct <= stop_loss_floor_pct)
+        if strategy.enforce_profit_only_exit:
+            stop_loss[:] = False
+        time_exit = ~take_profit & ~stop_loss & (now >= thresholds.max_hold_seconds) & (pnl_pct > 0)
+        since = now - last_attempt
+        want = is_open & (((take_profit | time_exit) & guard_ok) | stop_loss)
+        want &= ~attempted | (since >= thresholds.exit_retry_cooldown_seconds)
+        if not want.any():
+            continue
+
+        slippage = np.where(attempted & (since <= thresholds.exit_escalation_seconds), failed_slippage, sell_slippage)
+        failed = swap_fails[:, step] if swap_fails is not None else rng.random(n_paths) < swap_fail_prob
+        filled = want & ~failed
+        attempts += want
+        attempted |= want
+        last_attempt[want] = now
+        trigger[want] = np.select([take_profit, stop_loss], [_TAKE_PROFIT, _STOP_LOSS], _TIME_EXIT)[want]
+
+        sold = np.where(filled, remaining * sell_fraction, 0.0)
+        proceeds += sold * price * (1.0 - slippage)
+        slippage_usd += sold * price * slippage
+        remaining -= sold
+        closed = filled & (remaining < min_base)
+        is_open &= ~closed
+        exit_seconds[closed] = now
+
+    held_value = remaining * paths[:, -1] * entry_price
+    gas_usd = attempts * sell_gas
+    return StressResult(
+        pnl_usd=proceeds + held_value - position_usd - gas_usd,
+        exit_seconds=exit_seconds,
+        slippage_usd=slippage_usd,
+        gas_usd=gas_usd,
+        attempts=attempts,
+        trigger=trigger,
+    )
+
+
+def stress_test(
+    strategy: MyStrategyStrategy | dict[str, Any],
+    model: GBMModel,
+    n_paths: int = 20_000,
+    *,
+    horizon_minutes: int | None = None,
+    step_seconds: int = 60,
+    swap_fail_prob: float = 0.1,
+    slippage_used: float = 1.0,
+    batch_size: int = 4096,
+    seed: int | None = None,
+) -> StressResult:
+    """Sample ``n_paths`` paths from ``model`` in batches and run the exit rules over them.
+
+    The horizon defaults to twice ``max_hold_minutes``, so time exits and the
+    retries after them are covered.
+    """
+    strategy = _make_strategy(strategy)
+    if horizon_minutes is None:
+        horizon_minutes = 2 * strategy.max_hold_minutes or 1440
+    n_steps = max(1, horizon_minutes * 60 // step_seconds)
+    rng = np.random.default_rng(seed)
+    parts = []
+    for start in range(0, n_paths, batch_size):
+        paths = sample_paths(model, min(batch_size, n_paths - start), n_steps, step_seconds, rng)
+        parts.append(
+            simulate_exits(
+                strategy,
+                paths,
+                step_seconds,
+                swap_fail_prob=swap_fail_prob,
+                slippage_used=slippage_used,
+                rng=rng,
+            )
+        )
+    return StressResult.concat(parts)
+
+
+def run_stress(
+    base_config: dict[str, Any],
+    points: list[dict[str, Any]],
+    model: GBMModel,
+    n_paths: int = 20_000,
+    **options: Any,
+) -> list[dict[str, Any]]:
+    """One summary row per config override in ``points``, all sampled from the same seed."""
+    rows = []
+    for point in points:
+        result = stress_test({**base_config, **point}, model, n_paths, **options)
+        rows.append({**point, **result.summary()})
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    from .sweep import grid_points, write_table
+
+    parser = argparse.ArgumentParser(description="Monte Carlo stress test of the exit path")
+    parser.add_argument("--config", default=str(Path(__file__).parent / "config.json"))
+    parser.add_argument("--grid", help='JSON file with {"grid": {...}} of config overrides to compare')
+    parser.add_argument("--model", choices=("gbm", "jump"), default="jump")
+    parser.add_argument("--paths", type=int, default=20_000)
+    parser.add_argument("--volatility", type=float, default=1.5, help="annualized")
+    parser.add_argument("--drift", type=float, default=0.0, help="annualized")
+    parser.add_argument("--jumps-per-day", type=float, default=2.0)
+    parser.add_argument("--jump-mean", type=float, default=-0.05)
+    parser.add_argument("--jump-std", type=float, default=0.05)
+    parser.add_argument("--horizon-minutes", type=int, default=None)
+    parser.add_argument("--step-seconds", type=int, default=60)
+    parser.add_argument("--fail-prob", type=float, default=0.1)
+    parser.add_argument("--slippage-used", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="stress_results.csv")
+    args = parser.parse_args(argv)
+
+    with open(args.config) as f:
+        base_config = json.load(f)
+    points = [{}]
+    if args.grid:
+        with open(args.grid) as f:
+            points = grid_points(json.load(f)["grid"])
+    if args.model == "gbm":
+        model = GBMModel(args.volatility, args.drift)
+    else:
+        model = JumpModel(args.volatility, args.drift, args.jumps_per_day, args.jump_mean, args.jump_std)
+    rows = run_stress(
+        base_config,
+        points,
+        model,
+        args.paths,
+        horizon_minutes=args.horizon_minutes,
+        step_seconds=args.step_seconds,
+        swap_fail_prob=args.fail_prob,
+        slippage_used=args.slippage_used,
+        seed=args.seed,
+    )
+    # Smallest tail loss first.
+    rows.sort(key=lambda row: row["pnl_cvar5_usd"], reverse=True)
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    write_table(rows, args.output)
+    print(f"[STRESS] {len(rows)} configs x {args.paths} paths -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
+
@@ -0,0 +1,186 @@
+"""
+Offline price-impact model for buy swaps, built from a cached liquidity snapshot.
+
+The snapshot is a JSON file written by whatever refreshes pool state (an RPC
+job, a subgraph export, a test):
+
+    {"pools": [
+        {"protocol": "aerodrome", "base": "DEGEN", "kind": "constant_product",
+         "fee": 0.003, "reserve_quote": 250000, "reserve_base": 25000000},
+        {"protocol": "uniswap_v3", "base": "DEGEN", "kind": "concentrated",
+         "fee": 0.003, "quote_decimals": 6, "quote_is_token0": true,
+         "tick": 184200, "liquidity": 4.1e17, "ticks": [[184260, -1.2e17], ...]}
+    ]}
+
+Concentrated pools use Uniswap v3 tick math: price is ``1.0001 ** tick`` in
+raw token1 per token0 units and ``ticks`` lists ``[tick, liquidity_net]`` for
+initialized ticks.  Only ticks on the side a buy moves the price towards are
+needed.  Impact is the average fill price, fee included, over spot, minus one,
+and every model evaluates a whole array of candidate sizes in one call.
+"""
+
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+# sqrt(1.0001 ** 887272), the top of the Uniswap v3 tick range.
+_MAX_SQRT_PRICE = math.sqrt(1.0001) ** 887272
+
+
+@dataclass(frozen=True, slots=True)
+class ConstantProductPool:
+    """x * y = k pool; reserves in human units of the quote and base token."""
+
+    reserve_quote: float
+    reserve_base: float
+    fee: float = 0.003
+
+    @property
+    def spot_price(self) -> float:
+        return self.reserve_quote / self.reserve_base
+
+    def impact(self, amounts_quote: np.ndarray) -> np.ndarray:
+        amounts = np.asarray(amounts_quote, dtype=float)
+        # amount / out over spot collapses to (x + dx * (1 - fee)) / ((1 - fee) * x).
+        return (self.reserve_quote + amounts * (1 - self.fee)) / ((1 - self.fee) * self.reserve_quote) - 1
+
+
+@dataclass(frozen=True, slots=True)
+class ConcentratedPool:
+    """Concentrated-liquidity pool normalised so price is raw quote per raw base and a buy moves it up.
+
+    ``bounds`` are the sqrt prices where liquidity changes above ``sqrt_price`` (ending at the top of
+    the tick range) and ``liquidity[i]`` is the active liquidity below ``bounds[i]``.
+    """
+
+    sqrt_price: float
+    bounds: np.ndarray
+    liquidity: np.ndarray
+    fee: float = 0.003
+    quote_scale: float = 1.0
+
+    @property
+    def spot_price(self) -> float:
+        return self.sqrt_price**2
+
+    def impact(self, amounts_quote: np.ndarray) -> np.ndarray:
+        amounts = np.asarray(amounts_quote, dtype=float) * self.quote_scale
+        lower = np.concatenate(([self.sqrt_price], self.bounds[:-1]))
+        # Quote needed to push through each range and base paid out on the way, cumulative from spot.
+        quote_in = np.concatenate(([0.0], np.cumsum(self.liquidity * (self.bounds - lower))))
+        base_out = np.concatenate(([0.0], np.cumsum(self.liquidity * (self.bounds - lower) / (lower * self.bounds))))
+        net = amounts * (1 - self.fee)
+        # side="right" never lands in an empty range, so the division below has liquidity.
+        ranges = np.searchsorted(quote_in[1:], net, side="right")
+        fillable = ranges < self.bounds.shape[0]
+        ranges = np.minimum(ranges, self.bounds.shape[0] - 1)
+        start = lower[ranges]
+        active = self.liquidity[ranges]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # L * (1 / start - 1 / end) with end - start = rest / L, kept in a form that does not cancel.
+            rest = net - quote_in[ranges]
+            received = base_out[ranges] + rest / (start * (start + rest / active))
+            impact = amounts / (received * self.spot_price) - 1
+        impact = np.where(amounts > 0, impact, 0.0)
+        return np.where(fillable, impact, np.inf)
+
+
+Pool = ConstantProductPool | ConcentratedPool
+
+
+def concentrated_pool(spec: dict[str, Any]) -> ConcentratedPool:
+    """Build a ConcentratedPool from a snapshot entry in raw Uniswap v3 terms."""
+    tick = int(spec["tick"])
+    sqrt_price = float(spec["sqrt_price_x96"]) / 2**96 if "sqrt_price_x96" in spec else math.sqrt(1.0001) ** tick
+    ticks = sorted((int(index), float(net)) for index, net in spec.get("ticks") or ())
+    mirrored = bool(spec.get("quote_is_token0"))
+    if mirrored:
+        # Mirror the pool so price reads token0 per token1: a buy (token0 in) then moves it up too.
+        tick, sqrt_price = -tick, 1 / sqrt_price
+        ticks = sorted((-index, -net) for index, net in ticks)
+    liquidity = [float(spec["liquidity"])]
+    bounds = []
+    for index, net in ticks:
+        # A tick at the current one is already crossed on the way up, but a real price moving down
+        # (the mirrored case) still has to cross it.
+        if index < tick or (index == tick and not mirrored):
+            continue
+        bounds.append(math.sqrt(1.0001) ** index)
+        liquidity.append(max(0.0, liquidity[-1] + net))
+    bounds.append(_MAX_SQRT_PRICE)
+    return ConcentratedPool(
+        sqrt_price=sqrt_price,
+        bounds=np.array(bounds),
+        liquidity=np.array(liquidity),
+        fee=float(spec.get("fee", 0.003)),
+        quote_scale=10.0 ** int(spec.get("quote_decimals", 0)),
+    )
+
+
+def load_pool(spec: dict[str, Any]) -> Pool:
+    kind = str(spec.get("kind", "constant_product")).lower()
+    if kind == "constant_product":
+        return ConstantProductPool(
+            reserve_quote=float(spec["reserve_quote"]),
+            reserve_base=float(spec["reserve_base"]),
+            fee=float(spec.get("fee", 0.003)),
+        )
+    if kind == "concentrated":
+        return concentrated_pool(spec)
+    raise ValueError(f"Unknown pool kind {kind!r}")
+
+
+def cap_amount(pool: Pool, amount: float, max_impact: float, candidates: int = 32) -> tuple[float, float]:
+    """Largest of ``candidates`` evenly spaced sizes up to ``amount`` within ``max_impact``, and its impact.
+
+    Returns ``(0.0, impact of the smallest candidate)`` when none fits.
+    """
+    sizes = amount * np.arange(1, candidates + 1) / candidates
+    impacts = pool.impact(sizes)
+    fits = np.flatnonzero(impacts <= max_impact)
+    if fits.size == 0:
+        return 0.0, float(impacts[0])
+    return float(sizes[fits[-1]]), float(impacts[fits[-1]])
+
+
+class PoolSnapshot:
+    """Pools from a snapshot file keyed by (protocol, base symbol); re-read when the file changes."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.error: str | None = None
+        self._mtime: float | None = None
+        self._pools: dict[tuple[str, str], Pool] = {}
+
+    def _refresh(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError as exc:
+            self._mtime, self._pools, self.error = None, {}, str(exc)
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f).get("pools") or ()
+            self._pools = {
+                (str(spec["protocol"]).lower(), str(spec["base"]).lstrip("$").upper()): load_pool(spec)
+                for spec in entries
+            }
+            self.error = None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            self._pools, self.error = {}, f"{type(exc).__name__}: {exc}"
+
+    @property
+    def mtime(self) -> float | None:
+        """Modification time of the loaded file, None while it is missing."""
+        return self._mtime
+
+    def get(self, protocol: str, base: str) -> Pool | None:
+        self._refresh()
+        return self._pools.get((protocol.lower(), base.upper()))
@@ -0,0 +1,212 @@
+"""
+Parallel parameter sweep over config.json knobs.
+
+Price history is placed in shared memory once and every worker process maps
+it read-only, so each point only ships its config overrides.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .backtest import run_backtest
+from .indicators import closed_candle_rsi
+
+_SHARED: dict[str, np.ndarray] = {}
+_SHARED_BLOCKS: list[shared_memory.SharedMemory] = []
+_RSI_CACHE: dict[tuple[int, str], np.ndarray] = {}
+_WORKER_CONFIG: dict[str, Any] = {}
+_WORKER_OPTIONS: dict[str, Any] = {}
+
+
+def grid_points(grid: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def random_points(space: dict[str, Any], samples: int, seed: int | None = None) -> list[dict[str, Any]]:
+    """Sample ``samples`` points; lists are choices, ``{"min": lo, "max": hi}`` dicts are uniform ranges."""
+    rng = random.Random(seed)
+    points = []
+    for _ in range(samples):
+        point = {}
+        for key, values in space.items():
+            if isinstance(values, dict):
+                lo, hi = values["min"], values["max"]
+                if isinstance(lo, int) and isinstance(hi, int):
+                    point[key] = rng.randint(lo, hi)
+                else:
+                    point[key] = round(rng.uniform(float(lo), float(hi)), 6)
+            else:
+                point[key] = rng.choice(list(values))
+        points.append(point)
+    return points
+
+
+def _share(arrays: dict[str, np.ndarray]) -> tuple[list[shared_memory.SharedMemory], dict[str, tuple]]:
+    blocks = []
+    layout = {}
+    for name, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        blocks.append(block)
+        layout[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, layout
+
+
+def _attach(layout: dict[str, tuple], base_config: dict[str, Any], options: dict[str, Any]) -> None:
+    for name, (block_name, shape, dtype) in layout.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _SHARED_BLOCKS.append(block)
+        view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        view.flags.writeable = False
+        _SHARED[name] = view
+    _WORKER_CONFIG.clear()
+    _WORKER_CONFIG.update(base_config)
+    _WORKER_OPTIONS.clear()
+    _WORKER_OPTIONS.update(options)
+
+
+def _rsi_for(config: dict[str, Any]) -> np.ndarray:
+    if "rsi" in _SHARED:
+        return _SHARED["rsi"]
+    key = (int(config.get("rsi_period", 14)), str(config.get("rsi_timeframe", "1h")))
+    if key not in _RSI_CACHE:
+        _RSI_CACHE[key] = closed_candle_rsi(_SHARED["timestamps"], _SHARED["prices"], key[0], key[1])
+    return _RSI_CACHE[key]
+
+
+def _run_point(point: dict[str, Any]) -> dict[str, Any]:
+    config = {**_WORKER_CONFIG, **point}
+    row: dict[str, Any] = dict(point)
+    try:
+        result = run_backtest(
+            config,
+            _SHARED["timestamps"],
+            _SHARED["prices"],
+            _rsi_for(config),
+            fee_pct=Decimal(str(_WORKER_OPTIONS.get("fee_pct", "0"))),
+        )
+    except Exception as exc:
+        row["error"] = str(exc)
+        return row
+    sells = [trade for trade in result.filled_trades if trade.side == "sell"]
+    starting = result.starting_capital_usd
+    row.update(
+        {
+            "total_profit_usd": float(result.total_profit_usd),
+            "total_profit_pct": float(result.total_profit_usd / starting) if starting > 0 else 0.0,
+            "final_value_usd": float(result.final_value_usd),
+            "buys": sum(1 for trade in result.filled_trades if trade.side == "buy"),
+            "sells": len(sells),
+            "take_profit_exits": sum(1 for trade in sells if trade.trigger == "take_profit"),
+            "stop_loss_exits": sum(1 for trade in sells if trade.trigger == "stop_loss"),
+            "time_exits": sum(1 for trade in sells if trade.trigger == "time_exit"),
+            "error": "",
+        }
+    )
+    return row
+
+
+def run_sweep(
+    base_config: dict[str, Any],
+    points: list[dict[str, Any]],
+    timestamps: Any,
+    prices: Any,
+    rsi: Any | None = None,
+    *,
+    workers: int | None = None,
+    rank_by: str = "total_profit_usd",
+    fee_pct: Decimal = Decimal("0"),
+    output_path: str | Path | None = None,
+) -> list[dict[str, Any]]:
+    unknown = sorted({key for point in points for key in point} - set(base_config))
+    if unknown:
+        raise ValueError(f"Unknown config keys in sweep: {', '.join(unknown)}")
+
+    arrays = {
+        "timestamps": np.ascontiguousarray(timestamps, dtype=np.int64),
+        "prices": np.ascontiguousarray(prices, dtype=np.float64),
+    }
+    if rsi is not None:
+        arrays["rsi"] = np.ascontiguousarray(rsi, dtype=np.float64)
+
+    blocks, layout = _share(arrays)
+    try:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(points) // (workers * 8))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach,
+            initargs=(layout, base_config, {"fee_pct": str(fee_pct)}),
+        ) as pool:
+            rows = list(pool.map(_run_point, points, chunksize=chunksize))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    rows.sort(key=lambda row: (not row.get("error"), row.get(rank_by, float("-inf"))), reverse=True)
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    if output_path is not None:
+        write_table(rows, output_path)
+    return rows
+
+
+def write_table(rows: list[dict[str, Any]], path: str | Path) -> None:
+    fields: list[str] = ["rank"]
+    for row in rows:
+        fields.extend(key for key in row if key not in fields)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Parameter sweep over config.json knobs")
+    parser.add_argument("spec", help='JSON file with {"grid": {...}} or {"random": {...}, "samples": N}')
+    parser.add_argument("candles", help="CSV with timestamp,close columns")
+    parser.add_argument("--config", default=str(Path(__file__).parent / "config.json"))
+    parser.add_argument("--output", default="sweep_results.csv")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rank-by", default="total_profit_usd")
+    parser.add_argument("--fee-pct", default="0")
+    args = parser.parse_args(argv)
+
+    with open(args.config) as f:
+        base_config = json.load(f)
+    with open(args.spec) as f:
+        spec = json.load(f)
+    if "grid" in spec:
+        points = grid_points(spec["grid"])
+    else:
+        points = random_points(spec["random"], int(spec.get("samples", 100)), spec.get("seed"))
+
+    candles = np.loadtxt(args.candles, delimiter=",", skiprows=1, usecols=(0, 1), ndmin=2)
+    rows = run_sweep(
+        base_config,
+        points,
+        candles[:, 0].astype(np.int64),
+        candles[:, 1],
+        workers=args.workers,
+        rank_by=args.rank_by,
+        fee_pct=Decimal(args.fee_pct),
+        output_path=args.output,
+    )
+    print(f"[SWEEP] {len(rows)} points -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
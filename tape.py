@@ -0,0 +1,208 @@
+"""
+Market tape: records every market read made during decide() into fixed-width
+binary records, and replays a tape through the real decide() from a memory map.
+
+Each tick starts with a clock record holding the tick timestamp, followed by one
+record per ``price`` / ``balance`` / ``rsi`` call.  Values are stored as decimal
+strings, so a replay feeds decide() exactly the numbers it saw live.  Recording
+never fails a live read: a value too long for its field is flagged as
+overflowed, and a read whose token id does not fit is dropped.
+"""
+
+import os
+import threading
+from decimal import Decimal
+from typing import Any, Iterator
+
+import numpy as np
+
+MAGIC = b"MSTAPE01"
+HEADER_SIZE = 64
+
+OP_CLOCK = 0
+OP_PRICE = 1
+OP_BALANCE = 2
+OP_RSI = 3
+_OPS = {"price": OP_PRICE, "balance": OP_BALANCE, "rsi": OP_RSI}
+
+STATUS_OK = 0
+STATUS_FAILED = 1
+STATUS_NONE = 2
+STATUS_OVERFLOW = 3
+
+RECORD = np.dtype(
+    [
+        ("ts", "<i8"),
+        ("op", "u1"),
+        ("status", "u1"),
+        ("token", "S62"),
+        ("value", "S56"),
+    ]
+)
+
+
+class TapeError(LookupError):
+    """Raised by TapeMarket for reads that failed live or were never recorded."""
+
+
+_TOKEN_WIDTH = RECORD["token"].itemsize
+_VALUE_WIDTH = RECORD["value"].itemsize
+
+
+class TapeRecorder:
+    """Appends tape records to ``path``; writes are flushed once per tick."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.records = 0
+        self.overflowed = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "ab")
+        if is_new:
+            self._file.write(MAGIC.ljust(HEADER_SIZE, b"\0"))
+        self._ts = 0
+
+    def wrap(self, market: Any, now_ts: int) -> "RecordingMarket":
+        self._ts = now_ts
+        self._write(OP_CLOCK, STATUS_OK, "", now_ts)
+        return RecordingMarket(market, self)
+
+    def record(self, op: str, token: str, status: int, value: Any = "") -> None:
+        self._write(_OPS[op], status, token, value)
+
+    def _write(self, op: int, status: int, token: str, value: Any) -> None:
+        token_bytes = token.encode()
+        value_bytes = str(value).encode()
+        if len(token_bytes) > _TOKEN_WIDTH:
+            with self._lock:
+                self.dropped += 1
+            return
+        if len(value_bytes) > _VALUE_WIDTH:
+            status, value_bytes = STATUS_OVERFLOW, b""
+            with self._lock:
+                self.overflowed += 1
+        row = np.zeros(1, dtype=RECORD)
+        row["ts"] = self._ts
+        row["op"] = op
+        row["status"] = status
+        row["token"] = token_bytes
+        row["value"] = value_bytes
+        with self._lock:
+            self._file.write(row.tobytes())
+            self.records += 1
+
+    def end_tick(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class RecordingMarket:
+    """Pass-through market that records each price, balance and RSI read."""
+
+    def __init__(self, market: Any, recorder: TapeRecorder) -> None:
+        self._market = market
+        self._recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._market, name)
+
+    def _call(self, op: str, token: str, extract: Any, *args: Any, **kwargs: Any) -> Any:
+        try:
+            result = getattr(self._market, op)(token, *args, **kwargs)
+        except Exception as exc:
+            self._recorder.record(op, token, STATUS_FAILED, type(exc).__name__)
+            raise
+        value = extract(result)
+        if value is None:
+            self._recorder.record(op, token, STATUS_NONE)
+        else:
+            self._recorder.record(op, token, STATUS_OK, value)
+        return result
+
+    def price(self, token: str, *args: Any, **kwargs: Any) -> Any:
+        return self._call("price", token, lambda result: result, *args, **kwargs)
+
+    def balance(self, token: str, *args: Any, **kwargs: Any) -> Any:
+        return self._call("balance", token, lambda result: getattr(result, "balance", result), *args, **kwargs)
+
+    def rsi(self, token: str, *args: Any, **kwargs: Any) -> Any:
+        return self._call("rsi", token, lambda result: getattr(result, "value", result), *args, **kwargs)
+
+
+def open_tape(path: str) -> np.ndarray:
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if not header.startswith(MAGIC):
+        raise ValueError(f"{path} is not a market tape")
+    count = (os.path.getsize(path) - HEADER_SIZE) // RECORD.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RECORD)
+    return np.memmap(path, dtype=RECORD, mode="r", offset=HEADER_SIZE, shape=(count,))
+
+
+class TapeMarket:
+    """Market stand-in serving recorded reads one tick at a time from a memory-mapped tape."""
+
+    def __init__(self, path: str, chain: str = "", wallet_address: str = "") -> None:
+        self.chain = chain
+        self.wallet_address = wallet_address
+        self.records = open_tape(path)
+        starts = np.flatnonzero(self.records["op"] == OP_CLOCK)
+        self._starts = starts
+        self._stops = np.append(starts[1:], len(self.records))
+        self.ticks = int(starts.shape[0])
+        self._now = 0
+        self._reads: dict[tuple[int, bytes], tuple[int, bytes]] = {}
+
+    def select(self, tick: int) -> None:
+        start = int(self._starts[tick])
+        rows = self.records[start : int(self._stops[tick])].tolist()
+        self._now = rows[0][0]
+        reads: dict[tuple[int, bytes], tuple[int, bytes]] = {}
+        for _, op, status, token, value in rows[1:]:
+            reads.setdefault((op, token), (status, value))
+        self._reads = reads
+
+    def now(self) -> float:
+        return float(self._now)
+
+    def _read(self, op: int, token: str) -> Decimal | None:
+        found = self._reads.get((op, token.encode()))
+        if found is None:
+            raise TapeError(f"No recorded read for {token} at {self._now}")
+        status, value = found
+        if status == STATUS_FAILED:
+            raise TapeError(f"Recorded {value.decode()} for {token} at {self._now}")
+        if status == STATUS_NONE:
+            return None
+        if status == STATUS_OVERFLOW:
+            raise TapeError(f"Value for {token} at {self._now} was too long to record")
+        return Decimal(value.decode())
+
+    def price(self, token: str, *args: Any, **kwargs: Any) -> Decimal | None:
+        return self._read(OP_PRICE, token)
+
+    def balance(self, token: str, *args: Any, **kwargs: Any) -> Decimal | None:
+        return self._read(OP_BALANCE, token)
+
+    def rsi(self, token: str, *args: Any, **kwargs: Any) -> Decimal | None:
+        return self._read(OP_RSI, token)
+
+
+def replay_tape(strategy: Any, path: str) -> Iterator[Any]:
+    """Run ``strategy.decide()`` once per recorded tick, yielding each intent.
+
+    The strategy clock and its identifier cache follow the tape timestamps.
+    """
+    market = TapeMarket(path, chain=strategy.chain, wallet_address=strategy.wallet_address)
+    strategy._clock = market.now
+    strategy._id_cache._clock = market.now
+    for tick in range(market.ticks):
+        market.select(tick)
+        yield strategy.decide(market)
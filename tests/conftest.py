@@ -0,0 +1,40 @@
+"""
+Shared fixtures and helpers for the my_strategy tests.
+"""
+
+import json
+from collections.abc import Callable
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+USDC_ADDRESS = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+
+
+@pytest.fixture
+def config() -> dict:
+    """Load test configuration from config.json."""
+    config_path = Path(__file__).parent.parent / "config.json"
+    with open(config_path) as f:
+        return json.load(f)
+
+
+class FakeClock:
+    """Callable clock that only moves when a test sets ``now``."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def usdc_balance(amount: str = "100") -> Callable[[str], Decimal]:
+    """A ``market.balance`` side effect holding ``amount`` USDC and no base token."""
+    usdc = Decimal(amount)
+
+    def balance(token: str) -> Decimal:
+        return usdc if token in ("USDC", USDC_ADDRESS) else Decimal("0")
+
+    return balance
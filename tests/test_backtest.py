@@ -0,0 +1,77 @@
+"""
+Tests for the vectorized backtest engine.
+"""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from ..backtest import replay_backtest, run_backtest
+
+
+@pytest.fixture
+def candles() -> tuple[np.ndarray, np.ndarray]:
+    """Two weeks of deterministic 1-minute closes."""
+    rng = np.random.default_rng(7)
+    timestamps = 1_700_000_000 + 60 * np.arange(20_160, dtype=np.int64)
+    prices = 0.01 * np.exp(np.cumsum(rng.normal(0.0, 0.002, timestamps.shape[0])))
+    return timestamps, np.round(prices, 8)
+
+
+def _trade_keys(result) -> list[tuple]:
+    return [
+        (t.side, t.index, t.price, t.base_amount, t.quote_amount, t.max_slippage, t.trigger, t.filled)
+        for t in result.trades
+    ]
+
+
+class TestBacktest:
+    """Tests for run_backtest against the tick-by-tick reference."""
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {},
+            {"compound_factor": 1.0, "cooldown_minutes": 0, "max_hold_minutes": 30},
+            {"enforce_profit_only_exit": True, "sell_fraction": 0.5},
+            {"enable_gas_guard": False, "trade_amount_usd": 50, "starting_capital_usd": 60},
+            {"confirm_timeframe": "1h", "confirm_min_rsi": 45},
+            {
+                "use_local_rsi": True,
+                "rsi_timeframe": "1h",
+                "buy_rsi": 50,
+                "enable_gas_guard": False,
+                "trade_amount_usd": 50,
+                "starting_capital_usd": 60,
+            },
+        ],
+    )
+    def test_matches_tick_by_tick_decide(self, config: dict, candles, overrides: dict) -> None:
+        """The vectorized engine emits the same trades as calling decide() on every bar."""
+        timestamps, prices = candles
+        cfg = {**config, "rsi_timeframe": "15m", "buy_rsi": 45, **overrides}
+        fails = np.zeros(timestamps.shape[0], dtype=bool)
+        fails[::7] = True
+
+        fast = run_backtest(dict(cfg), timestamps, prices, swap_fails=fails, fee_pct=Decimal("0.003"))
+        slow = replay_backtest(dict(cfg), timestamps, prices, swap_fails=fails, fee_pct=Decimal("0.003"))
+
+        assert _trade_keys(fast) == _trade_keys(slow)
+        assert fast.final_value_usd == slow.final_value_usd
+        assert fast.decide_calls < slow.decide_calls
+
+    def test_exit_slippage_escalates_after_failed_exit(self, config: dict, candles) -> None:
+        """A failed exit is retried with failed_exit_max_slippage."""
+        timestamps, prices = candles
+        cfg = {**config, "rsi_timeframe": "15m", "buy_rsi": 45}
+        fails = np.zeros(timestamps.shape[0], dtype=bool)
+        first_sell = next(t for t in run_backtest(dict(cfg), timestamps, prices).trades if t.side == "sell")
+        fails[first_sell.index] = True
+
+        result = run_backtest(dict(cfg), timestamps, prices, swap_fails=fails)
+        sells = [t for t in result.trades if t.side == "sell"]
+
+        assert not sells[0].filled
+        assert sells[0].max_slippage == Decimal(str(cfg["sell_max_slippage"]))
+        assert sells[1].max_slippage == Decimal(str(cfg["failed_exit_max_slippage"]))
@@ -0,0 +1,51 @@
+"""
+Tests that keep the benchmark scenarios honest.
+"""
+
+import json
+
+import pytest
+
+from ..benchmarks.bench_strategy import DEFAULT_BASELINE, compare, make_strategy, outcome, scenarios
+
+
+class TestBenchmarkScenarios:
+    """Every benchmark scenario must exercise the branch it is named after."""
+
+    @pytest.mark.parametrize("scenario", scenarios(), ids=lambda s: s.name)
+    def test_scenario_hits_branch(self, scenario) -> None:
+        """decide() lands in the expected branch, repeatably."""
+        strategy = make_strategy()
+        for _ in range(3):
+            scenario.prepare(strategy)
+            assert scenario.expect in outcome(strategy, strategy.decide(scenario.market))
+
+    def test_compare_flags_slowdowns_only(self) -> None:
+        """Only results slower than the tolerance are reported."""
+        baseline = {"results": {"a": {"ops_per_sec": 100.0}, "b": {"ops_per_sec": 100.0}}}
+        current = {"results": {"a": {"ops_per_sec": 85.0}, "b": {"ops_per_sec": 70.0}, "c": {"ops_per_sec": 1.0}}}
+        regressions = compare(current, baseline, tolerance=0.2)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("b:")
+
+    def test_compare_flags_allocation_growth(self) -> None:
+        """Per-op allocation growth beyond the tolerance and the noise slack is a regression."""
+        baseline = {"results": {name: {"ops_per_sec": 1.0, "peak_bytes_per_op": 4000} for name in "abc"}}
+        current = {
+            "results": {
+                "a": {"ops_per_sec": 1.0, "peak_bytes_per_op": 4600},
+                "b": {"ops_per_sec": 1.0, "peak_bytes_per_op": 6000},
+                "c": {"ops_per_sec": 1.0},
+            }
+        }
+        regressions = compare(current, baseline, tolerance=0.2, alloc_tolerance=0.2)
+        assert regressions == ["b: 6000 B/op > 4800 (baseline 4000, tolerance 20%)"]
+
+    def test_baseline_covers_every_scenario(self) -> None:
+        """The committed baseline has timing and allocation figures for every decide() branch."""
+        with open(DEFAULT_BASELINE) as f:
+            results = json.load(f)["results"]
+        for scenario in scenarios():
+            stats = results[f"decide.{scenario.name}"]
+            assert stats["ops_per_sec"] > 0
+            assert stats["peak_bytes_per_op"] > 0
@@ -0,0 +1,111 @@
+"""
+Tests for the multi-timeframe candle store and entry confirmation.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from ..candles import CandleSeries, CandleStore
+from ..indicators import resample_closes, wilder_rsi
+from ..strategy import MyStrategyStrategy
+from .conftest import usdc_balance
+
+
+@pytest.fixture
+def ticks() -> tuple[np.ndarray, np.ndarray]:
+    """Two days of 1-minute prices."""
+    rng = np.random.default_rng(3)
+    timestamps = 1_700_000_000 + 60 * np.arange(2880, dtype=np.int64)
+    prices = 0.01 * np.exp(np.cumsum(rng.normal(0.0, 0.003, timestamps.shape[0])))
+    return timestamps, prices
+
+
+class TestCandleSeries:
+    """Tests for CandleSeries."""
+
+    def test_batch_matches_tick_by_tick(self, ticks) -> None:
+        timestamps, prices = ticks
+        one = CandleSeries("15m", 64)
+        for ts, price in zip(timestamps.tolist(), prices.tolist()):
+            one.update(ts, price)
+        many = CandleSeries("15m", 64)
+        many.update_many(timestamps[:1000], prices[:1000])
+        many.update_many(timestamps[1000:], prices[1000:])
+        for key, values in one.ohlc().items():
+            assert np.array_equal(values, many.ohlc()[key]), key
+        assert one.current == many.current
+
+    def test_closes_match_resampling(self, ticks) -> None:
+        timestamps, prices = ticks
+        series = CandleSeries("1h", 1000)
+        series.update_many(timestamps, prices)
+        _, closes = resample_closes(timestamps, prices, 3600)
+        # The last bucket is still forming.
+        assert np.array_equal(series.closes(), closes[:-1])
+        assert series.rsi(14) == pytest.approx(float(wilder_rsi(closes[:-1], 14)[-1]))
+
+    def test_memory_is_bounded(self, ticks) -> None:
+        timestamps, prices = ticks
+        store = CandleStore(["5m", "15m", "1h", "4h"], capacity=100)
+        size = store.nbytes
+        store.update_many(timestamps, prices)
+        assert store.nbytes == size
+        assert store.series("5m").count == 100
+        assert store.series("5m").closes()[-1] == store.series("5m").bars[3, store.series("5m").head - 1]
+
+
+class TestEntryConfirmation:
+    """Tests for multi-timeframe entry confirmation in decide()."""
+
+    def _strategy(self, config: dict, closes_4h: list[float]) -> tuple[MyStrategyStrategy, MagicMock]:
+        strategy = MyStrategyStrategy(
+            config={**config, "confirm_timeframe": "4h", "confirm_min_rsi": 30, "rsi_timeframe": "1h"},
+            chain="base",
+        )
+        market = MagicMock()
+        market.price.return_value = Decimal("0.01")
+        market.balance.side_effect = usdc_balance()
+        market.rsi.return_value = Decimal("20")
+        market.ohlcv.return_value = [{"close": close} for close in closes_4h]
+        return strategy, market
+
+    def test_collapsing_higher_timeframe_blocks_entry(self, config: dict) -> None:
+        strategy, market = self._strategy(config, [1.0 - 0.01 * i for i in range(30)])
+        intent = strategy.decide(market)
+        assert getattr(intent, "from_token", None) is None
+        assert "4h RSI" in intent.reason
+
+    def test_healthy_higher_timeframe_allows_entry(self, config: dict) -> None:
+        strategy, market = self._strategy(config, [1.0 + 0.01 * ((-1) ** i) * (i % 3) for i in range(30)])
+        intent = strategy.decide(market)
+        assert getattr(intent, "amount_usd", None) is not None
+        assert strategy.get_status()["candles"]["timeframes"]["4h"]["bars"] == 30
+
+    def test_forming_bar_is_not_seeded(self, config: dict) -> None:
+        """The last OHLCV bar opened in the current bucket is left to the live ticks."""
+        strategy, market = self._strategy(config, [])
+        now = 1_700_000_000
+        strategy._clock = lambda: now
+        start = now - now % 14_400 - 29 * 14_400
+        market.ohlcv.return_value = [{"timestamp": start + i * 14_400, "close": 1.0 + 0.01 * i} for i in range(30)]
+        strategy.decide(market)
+        series = strategy._candles.series("4h")
+        assert series.count == 29
+        assert series.closes()[-1] == pytest.approx(1.28)
+
+    @pytest.mark.parametrize(
+        "candles",
+        [
+            [{"close": 1.0, "open_time": 1_700_000_000_000}],
+            [{"close": 1.0, "datetime": datetime.fromtimestamp(1_700_000_000, tz=timezone.utc)}],
+            [SimpleNamespace(close=1.0, time=1_700_000_000)],
+        ],
+    )
+    def test_candle_open_ts_formats(self, candles: list) -> None:
+        assert MyStrategyStrategy._candle_open_ts(candles) == 1_700_000_000
+        assert MyStrategyStrategy._candle_open_ts([{"close": 1.0}]) is None
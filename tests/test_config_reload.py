@@ -0,0 +1,134 @@
+"""
+Tests for hot config reload.
+"""
+
+import json
+import os
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from ..config_reload import ConfigError, ConfigWatcher, validate_config
+from ..strategy import MyStrategyStrategy
+
+
+@pytest.fixture
+def live_config(config: dict, tmp_path: Path) -> tuple[Path, dict]:
+    """A config file the strategy watches, with polling left to the test."""
+    path = tmp_path / "config.json"
+    cfg = {**config, "config_reload_path": str(path), "config_reload_poll_seconds": 3600}
+    path.write_text(json.dumps(cfg))
+    return path, cfg
+
+
+def _rewrite(path: Path, cfg: dict) -> None:
+    path.write_text(json.dumps(cfg))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def _market() -> MagicMock:
+    market = MagicMock()
+    market.price.return_value = Decimal("0.01")
+    market.balance.return_value = Decimal("5")
+    market.rsi.return_value = Decimal("60")
+    return market
+
+
+class TestValidateConfig:
+    """Tests for validate_config."""
+
+    def test_shipped_config_is_valid(self, config: dict) -> None:
+        assert validate_config(config) == []
+
+    def test_reports_every_problem(self) -> None:
+        problems = validate_config({"buy_rsi": 120, "cooldown_minutes": 1.5, "enable_gas_guard": "yes"})
+        assert len(problems) == 3
+        assert any("buy_rsi must be between 0 and 100" in problem for problem in problems)
+
+
+class TestHotReload:
+    """Tests for swapping config into a running strategy."""
+
+    def test_reload_keeps_position_state(self, live_config) -> None:
+        path, cfg = live_config
+        strategy = MyStrategyStrategy(config=cfg, chain="base")
+        strategy.decide(_market())
+        entry_price = strategy._entry_price
+        tp_before = strategy.get_trigger_levels().take_profit_price
+
+        _rewrite(path, {**cfg, "buy_rsi": 25, "take_profit_pct": 0.05})
+        assert strategy._config_watcher.check()
+        strategy.decide(_market())
+        assert strategy.buy_rsi == Decimal("25")
+        assert strategy._entry_price == entry_price
+        assert strategy.get_trigger_levels().take_profit_price > tp_before
+        assert strategy.get_status()["config_reload"]["reloads"] == 1
+
+    def test_invalid_config_is_rejected(self, live_config) -> None:
+        path, cfg = live_config
+        strategy = MyStrategyStrategy(config=cfg, chain="base")
+        _rewrite(path, {**cfg, "stop_loss_pct": -1})
+        assert not strategy._config_watcher.check()
+        strategy.decide(_market())
+        assert strategy.stop_loss_pct == Decimal(str(cfg["stop_loss_pct"]))
+        assert any("stop_loss_pct must be between 0 and 1" in event["message"] for event in strategy._events.recent())
+
+    def test_restart_keys_are_rejected(self, live_config) -> None:
+        path, cfg = live_config
+        strategy = MyStrategyStrategy(config=cfg, chain="base")
+        _rewrite(path, {**cfg, "base_token": "BRETT", "buy_rsi": 20})
+        assert not strategy._config_watcher.check()
+        assert "base_token requires a restart" in strategy._config_watcher.error
+
+    def test_apply_config_raises(self, config: dict) -> None:
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        with pytest.raises(ConfigError):
+            strategy.apply_config({"sell_fraction": 0})
+
+    def test_apply_config_merges_onto_current(self, config: dict) -> None:
+        """Keys left out keep their current values instead of falling back to defaults."""
+        strategy = MyStrategyStrategy(config={**config, "buy_rsi": 25, "cooldown_minutes": 7}, chain="base")
+        strategy.apply_config({"take_profit_pct": 0.08})
+        strategy.apply_config({"cooldown_minutes": 9})
+        assert strategy.buy_rsi == Decimal("25")
+        assert strategy.take_profit_pct == Decimal("0.08")
+        assert strategy.cooldown_minutes == 9
+
+    def test_apply_config_rejects_restart_keys(self, config: dict) -> None:
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        with pytest.raises(ConfigError, match="changing base_token requires a restart"):
+            strategy.apply_config({"base_token": "BRETT", "buy_rsi": 20})
+        assert strategy.buy_rsi == Decimal(str(config["buy_rsi"]))
+        strategy.apply_config({"base_token": config["base_token"], "buy_rsi": 20})
+        assert strategy.buy_rsi == Decimal("20")
+
+    def test_missing_file_is_watched_until_it_appears(self, config: dict, tmp_path: Path) -> None:
+        path = tmp_path / "config.json"
+        watcher = ConfigWatcher(str(path), MyStrategyStrategy._parse_tunables, start=False, baseline=config)
+        assert "No such file" in watcher.error
+        assert not watcher.check()
+        path.write_text(json.dumps({**config, "buy_rsi": 22}))
+        assert watcher.check()
+        assert watcher.pending["buy_rsi"] == Decimal("22")
+
+    def test_close_stops_the_watcher(self, live_config) -> None:
+        _, cfg = live_config
+        strategy = MyStrategyStrategy(config=cfg, chain="base")
+        thread = strategy._config_watcher._thread
+        assert thread.is_alive()
+        strategy.close()
+        assert not thread.is_alive()
+
+    def test_file_reload_then_apply_config(self, live_config) -> None:
+        """apply_config merges onto the values the last file reload set."""
+        path, cfg = live_config
+        strategy = MyStrategyStrategy(config=cfg, chain="base")
+        _rewrite(path, {**cfg, "buy_rsi": 25})
+        assert strategy._config_watcher.check()
+        strategy.decide(_market())
+        strategy.apply_config({"take_profit_pct": 0.05})
+        assert strategy.buy_rsi == Decimal("25")
+        assert strategy.take_profit_pct == Decimal("0.05")
@@ -0,0 +1,101 @@
+"""
+Tests for the structured event log.
+"""
+
+import json
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from ..events import EventSink, _close_open_sinks
+from ..strategy import MyStrategyStrategy
+from .conftest import FakeClock
+
+
+class TestEventSink:
+    """Tests for EventSink."""
+
+    def test_writes_jsonl_in_background(self, tmp_path: Path) -> None:
+        """Events reach the file as one JSON object per line."""
+        path = tmp_path / "events.jsonl"
+        sink = EventSink(path=str(path), echo=False)
+        sink.emit("buy", "RSI low", amount_usd=Decimal("1.5"))
+        sink.emit("hold", "waiting")
+        sink.close()
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [r["kind"] for r in records] == ["buy", "hold"]
+        assert records[0]["amount_usd"] == "1.5"
+
+    def test_level_filters_events(self) -> None:
+        """Events below the configured level are neither kept nor printed."""
+        sink = EventSink(level="buy", echo=False)
+        assert not sink.emit("hold", "waiting")
+        assert sink.emit("sell", "take profit")
+        assert [e["kind"] for e in sink.recent()] == ["sell"]
+
+    def test_repeated_hold_is_rate_limited(self) -> None:
+        """An identical HOLD reason is suppressed within the window and counted."""
+        clock = FakeClock(1000.0)
+        sink = EventSink(echo=False, hold_repeat_seconds=60, clock=clock)
+        sink.emit("hold", "cooldown")
+        clock.now += 10
+        assert not sink.emit("hold", "cooldown")
+        clock.now += 60
+        assert sink.emit("hold", "cooldown")
+        assert sink.recent()[-1]["repeats_suppressed"] == 1
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path: Path) -> None:
+        """The caller never waits on the writer."""
+        path = tmp_path / "e.jsonl"
+        sink = EventSink(path=str(path), echo=False, queue_size=1)
+        for i in range(1000):
+            sink.emit("hold", f"reason {i}")
+        sink.close()
+        written = len(path.read_text().splitlines())
+        assert written + sink.stats()["dropped"] == 1000
+
+
+    def test_exit_hook_flushes_open_sinks(self, tmp_path: Path) -> None:
+        """Events still queued when the process exits are written by the atexit hook."""
+        path = tmp_path / "events.jsonl"
+        sink = EventSink(path=str(path), echo=False)
+        sink.emit("sell", "take profit")
+        _close_open_sinks()
+        assert len(path.read_text().splitlines()) == 1
+        sink.emit("hold", "after close")
+        sink.close()
+        assert len(path.read_text().splitlines()) == 1
+        assert sink.recent()[-1]["message"] == "after close"
+
+
+class TestStrategyEvents:
+    """Tests for the strategy's use of the event log."""
+
+    def test_status_exposes_recent_events(self, config: dict, tmp_path: Path, capsys) -> None:
+        """With a log path nothing is printed and get_status() returns recent events."""
+        path = tmp_path / "events.jsonl"
+        strategy = MyStrategyStrategy(config={**config, "event_log_path": str(path)}, chain="base")
+        market = MagicMock()
+        market.price.return_value = Decimal("0.01")
+        market.balance.return_value = Decimal("0")
+        market.rsi.return_value = Decimal("60")
+
+        strategy.decide(market)
+        strategy.close()
+
+        assert capsys.readouterr().out == ""
+        kinds = [event["kind"] for event in strategy.get_status()["recent_events"]]
+        assert kinds == ["status", "hold"]
+        assert len(path.read_text().splitlines()) == 2
+
+    def test_repeated_holds_logged_by_default(self, config: dict, capsys) -> None:
+        """The shipped config keeps every HOLD line; de-duplication is opt-in."""
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        market = MagicMock()
+        market.price.return_value = Decimal("0.01")
+        market.balance.return_value = Decimal("0")
+        market.rsi.return_value = Decimal("60")
+        strategy.decide(market)
+        strategy.decide(market)
+        assert capsys.readouterr().out.count("[ACTION] HOLD") == 2
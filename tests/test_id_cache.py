@@ -0,0 +1,88 @@
+"""
+Tests for memoized token-identifier resolution.
+"""
+
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from ..id_cache import IdResolutionCache
+from ..strategy import MyStrategyStrategy
+from .conftest import FakeClock
+
+
+def _fetch_only(good: str, calls: list[str]):
+    def fetch(token_id: str) -> str:
+        calls.append(token_id)
+        if token_id != good:
+            raise KeyError(token_id)
+        return f"value:{token_id}"
+
+    return fetch
+
+
+class TestIdResolutionCache:
+    """Tests for IdResolutionCache."""
+
+    def test_goes_straight_to_known_id(self) -> None:
+        """After one probe the working id is tried first and alone."""
+        cache = IdResolutionCache(ttl_seconds=60)
+        calls: list[str] = []
+        fetch = _fetch_only("c", calls)
+
+        assert cache.resolve("price", ("a", "b", "c"), fetch) == "value:c"
+        assert cache.resolve("price", ("a", "b", "c"), fetch) == "value:c"
+
+        assert calls == ["a", "b", "c", "c"]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["calls_avoided"] == 2
+
+    def test_reprobes_after_ttl(self) -> None:
+        """An expired entry re-runs the full chain."""
+        clock = FakeClock()
+        cache = IdResolutionCache(ttl_seconds=60, clock=clock)
+        calls: list[str] = []
+        fetch = _fetch_only("b", calls)
+        cache.resolve("balance", ("a", "b"), fetch)
+        clock.now = 61
+
+        cache.resolve("balance", ("a", "b"), fetch)
+
+        assert calls == ["a", "b", "a", "b"]
+        assert cache.stats()["misses"] == 2
+
+    def test_reprobes_after_miss(self) -> None:
+        """If the cached id stops working the rest of the chain is tried in the same call."""
+        cache = IdResolutionCache(ttl_seconds=60)
+        calls: list[str] = []
+        cache.resolve("rsi", ("a", "b"), _fetch_only("a", calls))
+
+        assert cache.resolve("rsi", ("a", "b"), _fetch_only("b", calls)) == "value:b"
+        assert calls == ["a", "a", "b"]
+
+    def test_zero_ttl_disables_memoization(self) -> None:
+        """With ttl 0 every call probes the chain like the original code."""
+        cache = IdResolutionCache(ttl_seconds=0)
+        calls: list[str] = []
+        fetch = _fetch_only("b", calls)
+        cache.resolve("price", ("a", "b"), fetch)
+        cache.resolve("price", ("a", "b"), fetch)
+        assert calls == ["a", "b", "a", "b"]
+
+
+class TestStrategyIdCache:
+    """Tests for the strategy's use of the resolution cache."""
+
+    def test_failing_price_id_is_skipped_on_later_ticks(self, config: dict) -> None:
+        """A bad base_token_price_id costs one failing call, not one per tick."""
+        strategy = MyStrategyStrategy(config={**config, "base_token_price_id": "degen-bad"}, chain="base")
+        market = MagicMock()
+        market.price.side_effect = lambda token: Decimal("0.01") if token == "DEGEN" else 1 / 0
+        market.balance.return_value = Decimal("0")
+        market.rsi.return_value = Decimal("60")
+
+        for _ in range(3):
+            strategy.decide(market)
+
+        price_calls = [call.args[0] for call in market.price.call_args_list]
+        assert price_calls == ["degen-bad", "DEGEN", "DEGEN", "DEGEN"]
+        assert strategy.get_status()["id_cache"]["hits"] > 0
@@ -0,0 +1,153 @@
+"""
+Tests for indicator helpers and the in-strategy RSI engine.
+"""
+
+import json
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from ..indicators import WilderRSI, closed_candle_rsi, wilder_rsi
+from ..strategy import MyStrategyStrategy
+
+
+@pytest.fixture
+def candles() -> tuple[np.ndarray, np.ndarray]:
+    """Two days of deterministic 1-minute closes."""
+    rng = np.random.default_rng(5)
+    timestamps = 1_700_000_000 + 60 * np.arange(2_880, dtype=np.int64)
+    prices = 0.01 * np.exp(np.cumsum(rng.normal(0.0, 0.002, timestamps.shape[0])))
+    return timestamps, prices
+
+
+class TestIndicators:
+    """Tests for the NumPy RSI helpers."""
+
+    def test_wilder_rsi_bounds(self) -> None:
+        """RSI is undefined during warm-up and bounded afterwards."""
+        closes = np.linspace(1.0, 2.0, 40)
+        rsi = wilder_rsi(closes, 14)
+        assert np.isnan(rsi[:14]).all()
+        assert rsi[14] == pytest.approx(100.0)
+
+    def test_closed_candle_rsi_uses_closed_candles_only(self, candles) -> None:
+        """No RSI is reported before enough hourly candles have closed."""
+        timestamps, prices = candles
+        rsi = closed_candle_rsi(timestamps, prices, 14, "1h")
+        assert np.isnan(rsi[: 14 * 60]).all()
+        assert not np.isnan(rsi[-1])
+
+    def test_incremental_matches_vectorized(self, candles) -> None:
+        """Feeding ticks one by one reproduces closed_candle_rsi."""
+        timestamps, prices = candles
+        expected = closed_candle_rsi(timestamps, prices, 14, "15m")
+        engine = WilderRSI(14, "15m")
+        for i, (ts, price) in enumerate(zip(timestamps.tolist(), prices.tolist())):
+            engine.update_tick(ts, price)
+            if np.isnan(expected[i]):
+                assert engine.value is None
+            else:
+                assert engine.value == pytest.approx(expected[i], rel=1e-9)
+
+    def test_update_many_matches_update_tick(self, candles) -> None:
+        """Batched ticks leave the engine in the same state as feeding them one by one."""
+        timestamps, prices = candles
+        prices = prices.copy()
+        prices[::97] = 0.0
+        one_by_one, batched = WilderRSI(14, "15m"), WilderRSI(14, "15m")
+        closed = 0
+        for ts, price in zip(timestamps.tolist(), prices.tolist()):
+            if price > 0:
+                closed += one_by_one.update_tick(ts, price)
+        for lo, hi in ((0, 7), (7, 1000), (1000, 1001), (1001, timestamps.shape[0])):
+            closed -= batched.update_many(timestamps[lo:hi], prices[lo:hi])
+        assert closed == 0
+        assert batched.to_state() == one_by_one.to_state()
+
+    def test_state_round_trip(self, candles) -> None:
+        """A restored engine continues exactly where the saved one stopped."""
+        timestamps, prices = candles
+        engine = WilderRSI(14, "15m")
+        for ts, price in zip(timestamps[:1000].tolist(), prices[:1000].tolist()):
+            engine.update_tick(ts, price)
+        restored = WilderRSI(14, "15m")
+        assert restored.load_state(json.loads(json.dumps(engine.to_state())))
+        for ts, price in zip(timestamps[1000:].tolist(), prices[1000:].tolist()):
+            engine.update_tick(ts, price)
+            restored.update_tick(ts, price)
+        assert restored.value == engine.value
+
+
+    def test_seed_drops_candle_in_progress(self) -> None:
+        """Seeding discards the candle being built, so its close is not appended to the seeded closes."""
+        engine = WilderRSI(3, "1h")
+        engine.update_tick(0, 5.0)
+        engine.seed([1.0, 2.0, 1.5, 2.5])
+        expected = WilderRSI(3, "1h")
+        expected.seed([1.0, 2.0, 1.5, 2.5])
+        engine.update_tick(7200, 3.0)
+        expected.update_tick(7200, 3.0)
+        assert (engine.avg_gain, engine.avg_loss) == (expected.avg_gain, expected.avg_loss)
+
+
+class TestLocalRsi:
+    """Tests for the strategy's use_local_rsi mode."""
+
+    def test_seeded_engine_replaces_market_rsi(self, config: dict) -> None:
+        """After one history fetch, decide() no longer calls market.rsi."""
+        strategy = MyStrategyStrategy(config={**config, "use_local_rsi": True}, chain="base")
+        strategy._clock = lambda: 1_700_000_000
+        market = MagicMock()
+        market.price.return_value = Decimal("0.01")
+        market.balance.return_value = Decimal("0")
+        market.ohlcv.return_value = [{"close": 0.01 + 0.0001 * (i % 7)} for i in range(100)]
+
+        strategy.decide(market)
+        strategy.decide(market)
+
+        market.ohlcv.assert_called_once()
+        market.rsi.assert_not_called()
+        assert strategy.get_status()["local_rsi_ready"] is True
+        assert strategy.get_persistent_state()["local_rsi"]["warmup_changes"] == 14
+
+    def test_seed_skips_forming_candle(self, config: dict) -> None:
+        """A last bar still open at seed time is not seeded, so live ticks do not count it twice."""
+        now = 1_700_000_000
+        strategy = MyStrategyStrategy(config={**config, "use_local_rsi": True}, chain="base")
+        strategy._clock = lambda: now
+        start = now - now % 3600 - 39 * 3600
+        bars = [{"timestamp": start + i * 3600, "close": 0.01 + 0.0001 * (i % 7)} for i in range(40)]
+        market = MagicMock()
+        market.price.return_value = Decimal("0.01")
+        market.balance.return_value = Decimal("0")
+        market.ohlcv.return_value = bars
+        strategy.decide(market)
+        expected = WilderRSI(14, "1h")
+        expected.seed([bar["close"] for bar in bars[:-1]])
+        assert strategy._local_rsi.avg_gain == pytest.approx(expected.avg_gain)
+        assert strategy._local_rsi.warmup_changes == 14
+
+    def test_restored_state_survives_first_tick(self, config: dict) -> None:
+        """Averages restored from persistent state are kept; the first tick does not re-seed them."""
+        market = MagicMock()
+        market.price.return_value = Decimal("0.01")
+        market.balance.return_value = Decimal("0")
+        market.ohlcv.return_value = [{"close": 0.01 + 0.0001 * (i % 7)} for i in range(100)]
+        before = MyStrategyStrategy(config={**config, "use_local_rsi": True}, chain="base")
+        before._clock = lambda: 1_700_000_000
+        before.decide(market)
+        state = json.loads(json.dumps(before.get_persistent_state()))
+
+        market.ohlcv.reset_mock()
+        market.ohlcv.return_value = [{"close": 0.02 + 0.0003 * (i % 5)} for i in range(100)]
+        after = MyStrategyStrategy(config={**config, "use_local_rsi": True}, chain="base")
+        after._clock = lambda: 1_700_000_060
+        after.load_persistent_state(state)
+        after.decide(market)
+
+        market.ohlcv.assert_not_called()
+        assert after._local_rsi.avg_gain == pytest.approx(before._local_rsi.avg_gain)
+        assert after._local_rsi.avg_loss == pytest.approx(before._local_rsi.avg_loss)
+        assert after._local_rsi.warmup_changes == before._local_rsi.warmup_changes
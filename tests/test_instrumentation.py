@@ -0,0 +1,67 @@
+"""
+Tests for decide() latency instrumentation.
+"""
+
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from ..instrumentation import LatencyHistogram
+from ..strategy import MyStrategyStrategy
+
+
+@pytest.fixture
+def mock_market() -> MagicMock:
+    """Market with working price, balances and RSI."""
+    market = MagicMock()
+    market.price.return_value = Decimal("0.01")
+    market.balance.return_value = Decimal("0")
+    market.rsi.return_value = Decimal("60")
+    return market
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_percentiles_follow_buckets(self) -> None:
+        """p50 lands in the bucket holding the median and p99 never exceeds the max."""
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(0.0003)
+        for _ in range(10):
+            histogram.record(0.02)
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100
+        assert snapshot["p50_ms"] == pytest.approx(0.5)
+        assert snapshot["p99_ms"] == pytest.approx(20.0)
+
+
+class TestStrategyInstrumentation:
+    """Tests for enable_instrumentation."""
+
+    def test_disabled_by_default(self, config: dict, mock_market: MagicMock) -> None:
+        """Without the flag nothing is recorded."""
+        strategy = MyStrategyStrategy(config={**config, "enable_instrumentation": False}, chain="base")
+        strategy.decide(mock_market)
+        assert strategy.get_status()["instrumentation"] is None
+
+    def test_records_stages_and_fallbacks(self, config: dict, mock_market: MagicMock) -> None:
+        """Each stage gets a histogram and failed fallback ids are counted."""
+        strategy = MyStrategyStrategy(config={**config, "enable_instrumentation": True}, chain="base")
+        mock_market.rsi.side_effect = lambda token, **kwargs: Decimal("60") if token == "DEGEN" else None
+        for _ in range(3):
+            strategy.decide(mock_market)
+
+        report = strategy.get_status()["instrumentation"]
+        assert set(report["stages"]) == {"price", "quote_balance", "base_balance", "rsi", "status", "decision", "tick"}
+        assert report["stages"]["tick"]["count"] == 3
+        assert report["fallback_failures"]["rsi"] == 1
+
+    def test_counts_exceptions_per_stage(self, config: dict, mock_market: MagicMock) -> None:
+        """An exception in the decision stage is attributed to it."""
+        strategy = MyStrategyStrategy(config={**config, "enable_instrumentation": True}, chain="base")
+        strategy._decide_position = MagicMock(side_effect=RuntimeError("boom"))
+        result = strategy.decide(mock_market)
+        assert "Error" in result.reason
+        assert strategy.get_status()["instrumentation"]["exceptions"] == {"decision": 1}
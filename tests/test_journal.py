@@ -0,0 +1,159 @@
+"""
+Tests for the write-ahead state journal.
+"""
+
+import json
+import os
+import threading
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from ..journal import StateJournal
+from ..strategy import MyStrategyStrategy
+
+
+class TestStateJournal:
+    """Tests for StateJournal."""
+
+    def test_records_only_changed_fields(self, tmp_path: Path) -> None:
+        journal = StateJournal(str(tmp_path / "state.journal"))
+        assert journal.record({"a": 1, "b": 2})
+        assert not journal.record({"a": 1, "b": 2})
+        assert journal.record({"a": 1, "b": 3})
+        journal.close()
+        lines = [json.loads(line) for line in (tmp_path / "state.journal").read_text().splitlines()]
+        assert lines[-1] == {"seq": 2, "set": {"b": 3}}
+
+    def test_load_replays_snapshot_and_tail(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "state.journal")
+        journal = StateJournal(path, compact_every=4)
+        for value in range(5):
+            journal.record({"entry_ts": value, "last_buy_ts": value // 2})
+        journal.record({"entry_ts": 9})
+        journal.close()
+        assert journal.compactions == 1
+        assert StateJournal(path).load() == {"entry_ts": 9}
+
+    def test_torn_tail_is_ignored(self, tmp_path: Path) -> None:
+        path = tmp_path / "state.journal"
+        journal = StateJournal(str(path))
+        journal.record({"entry_ts": 1})
+        journal.close()
+        with open(path, "a") as f:
+            f.write('{"seq": 2, "set": {"entry_')
+        assert StateJournal(str(path)).load() == {"entry_ts": 1}
+
+    def test_restart_after_torn_write_keeps_new_records(self, tmp_path: Path) -> None:
+        """The torn line is cut on load, so records written after the restart survive the next one."""
+        path = tmp_path / "state.journal"
+        journal = StateJournal(str(path))
+        journal.record({"entry_ts": 1})
+        journal.close()
+        with open(path, "a") as f:
+            f.write('{"seq": 2, "set": {"entry_')
+        restarted = StateJournal(str(path))
+        assert restarted.load() == {"entry_ts": 1}
+        assert restarted.stats()["truncated_bytes"] == len('{"seq": 2, "set": {"entry_')
+        restarted.record({"entry_ts": 2, "last_buy_ts": 5})
+        restarted.close()
+        assert StateJournal(str(path)).load() == {"entry_ts": 2, "last_buy_ts": 5}
+
+    def test_merge_fields_accumulate(self, tmp_path: Path) -> None:
+        """Merge entries add to a dict field across records and compaction instead of replacing it."""
+        path = str(tmp_path / "state.journal")
+        journal = StateJournal(path, compact_every=3)
+        journal.record({"a": 1}, merge={"rows": {"0": "x"}})
+        journal.record({"a": 1}, merge={"rows": {"1": "y"}})
+        assert not journal.record({"a": 1}, merge={"rows": {}})
+        journal.record({"a": 2}, merge={"rows": {"0": "z"}})
+        journal.record({"a": 2}, merge={"rows": {"2": "w"}})
+        journal.close()
+        assert journal.compactions == 1
+        assert StateJournal(path).load() == {"a": 2, "rows": {"0": "z", "1": "y", "2": "w"}}
+
+    def test_batched_fsync_runs_off_the_caller(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Periodic fsyncs happen on the journal's own thread; only close syncs on the caller."""
+        threads = []
+        real_fsync = os.fsync
+
+        def fsync(fd: int) -> None:
+            threads.append(threading.current_thread())
+            real_fsync(fd)
+
+        monkeypatch.setattr(os, "fsync", fsync)
+        journal = StateJournal(str(tmp_path / "state.journal"), fsync_every=4)
+        for value in range(10):
+            journal.record({"entry_ts": value})
+        journal.close()
+        assert threading.current_thread() not in threads[:-1]
+        assert threads[-1] is threading.current_thread()
+        assert 2 <= journal.fsyncs <= 3
+
+
+class TestStrategyJournal:
+    """Tests for journal-backed restarts."""
+
+    def test_restart_keeps_entry_price(self, config: dict, tmp_path: Path) -> None:
+        """A position opened before a crash resumes with its real entry, not the restart price."""
+        cfg = {**config, "state_journal_path": str(tmp_path / "state.journal")}
+        market = MagicMock()
+        market.price.return_value = Decimal("0.01")
+        market.balance.side_effect = lambda token: Decimal("100") if token != "DEGEN" else Decimal("0")
+        market.rsi.return_value = Decimal("20")
+        first = MyStrategyStrategy(config=cfg, chain="base")
+        first._clock = lambda: 1000.0
+        assert getattr(first.decide(market), "from_token", None) is not None
+        # Simulated crash: no close, no framework save.
+
+        market.price.return_value = Decimal("0.0102")
+        market.balance.side_effect = lambda token: Decimal("500")
+        second = MyStrategyStrategy(config=cfg, chain="base")
+        second._clock = lambda: 1060.0
+        second.decide(market)
+        assert second._entry_price == Decimal("0.01")
+        assert second._entry_ts == 1000
+        assert second.get_status()["state_journal"]["seq"] >= 1
+
+    def test_ledger_is_journaled_by_row(self, config: dict, tmp_path: Path) -> None:
+        """Ticks journal only the ledger rows they touched, and a restart rebuilds the ledger from them."""
+        path = tmp_path / "state.journal"
+        cfg = {**config, "state_journal_path": str(path), "cooldown_minutes": 0}
+        market = MagicMock()
+        market.price.return_value = Decimal("0.01")
+        market.balance.side_effect = lambda token: Decimal("100") if token != "DEGEN" else Decimal("0")
+        market.rsi.return_value = Decimal("60")
+        first = MyStrategyStrategy(config=cfg, chain="base")
+        first._clock = lambda: 1000.0
+        first.decide(market)
+        market.rsi.return_value = Decimal("20")
+        first.decide(market)
+        market.balance.side_effect = lambda token: Decimal("500")
+        first.decide(market)
+        first._journal.close()
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert all("ledger" not in record["set"] for record in records)
+        assert [list(record.get("merge", {}).get("ledger_rows", {})) for record in records] == [[], ["0"]]
+
+        second = MyStrategyStrategy(config=cfg, chain="base")
+        second._restore_from_journal()
+        assert second._ledger.count == 1
+        assert second._ledger.rows[0]["entry_price"] == pytest.approx(0.01)
+
+    def test_close_syncs_and_stops_the_journal(self, config: dict, tmp_path: Path) -> None:
+        """Closing the strategy joins the fsync thread and syncs the records it had not reached."""
+        cfg = {**config, "state_journal_path": str(tmp_path / "state.journal"), "state_journal_fsync_every": 1}
+        market = MagicMock()
+        market.price.return_value = Decimal("0.01")
+        market.balance.side_effect = lambda token: Decimal("100") if token != "DEGEN" else Decimal("0")
+        market.rsi.return_value = Decimal("20")
+        strategy = MyStrategyStrategy(config=cfg, chain="base")
+        strategy.decide(market)
+        journal = strategy._journal
+        assert journal.records >= 1
+        strategy.close()
+        assert journal._syncer is None
+        assert journal._file is None
+        assert journal.stats()["unsynced"] == 0
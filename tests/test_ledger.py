@@ -0,0 +1,105 @@
+"""
+Tests for the columnar trade ledger.
+"""
+
+import json
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from ..backtest import run_backtest
+from ..ledger import TradeLedger
+from ..strategy import MyStrategyStrategy
+
+
+def _round_trip(ledger: TradeLedger, entry_ts: int, entry: str, exit_: str, trigger: str) -> None:
+    row = ledger.open(entry_ts, Decimal(entry), Decimal("100"), Decimal(entry) * 100, Decimal("0.01"), Decimal("0"))
+    ledger.mark_exit(row, entry_ts + 600, Decimal(exit_), trigger, Decimal("0.01"), Decimal("0"))
+    ledger.close(row, entry_ts + 660, Decimal(exit_))
+
+
+class TestTradeLedger:
+    """Tests for TradeLedger."""
+
+    def test_analytics(self) -> None:
+        ledger = TradeLedger(capacity=1)
+        _round_trip(ledger, 0, "1.00", "1.10", "take_profit")
+        _round_trip(ledger, 1000, "1.00", "0.90", "stop_loss")
+        _round_trip(ledger, 2000, "1.00", "1.05", "take_profit")
+        ledger.open(3000, Decimal("1"), Decimal("1"), Decimal("1"), Decimal("0"), Decimal("0"))
+        stats = ledger.analytics()
+        assert stats["trades"] == 3
+        assert stats["open_trades"] == 1
+        assert stats["win_rate"] == pytest.approx(2 / 3)
+        assert stats["realized_pnl_usd"] == pytest.approx(5.0)
+        assert stats["max_drawdown_usd"] == pytest.approx(10.0)
+        assert stats["per_trigger"]["take_profit"] == {"trades": 2, "pnl_usd": pytest.approx(15.0), "win_rate": 1.0}
+        assert stats["per_trigger"]["stop_loss"]["pnl_usd"] == pytest.approx(-10.0)
+        assert stats["holding_seconds"]["p50"] == 600
+
+    def test_analytics_cached_until_change(self) -> None:
+        """Analytics are reused between ledger changes and recomputed after one."""
+        ledger = TradeLedger()
+        _round_trip(ledger, 0, "1.00", "1.10", "take_profit")
+        stats = ledger.analytics()
+        assert ledger.analytics() is stats
+        _round_trip(ledger, 1000, "1.00", "0.90", "stop_loss")
+        assert ledger.analytics() is not stats
+        assert ledger.analytics()["trades"] == 2
+
+    def test_external_close(self) -> None:
+        """A position closed without an exit attempt is valued at the first flat price."""
+        ledger = TradeLedger()
+        row = ledger.open(0, Decimal("1"), Decimal("10"), Decimal("10"), Decimal("0"), Decimal("0"))
+        ledger.close(row, 60, Decimal("1.2"))
+        assert ledger.analytics()["per_trigger"]["external"]["pnl_usd"] == pytest.approx(2.0)
+
+    def test_state_round_trip(self) -> None:
+        ledger = TradeLedger()
+        for index in range(300):
+            _round_trip(ledger, index * 1000, "1.00", "1.01", "take_profit")
+        restored = TradeLedger()
+        restored.load_state(json.loads(json.dumps(ledger.to_state())))
+        assert restored.count == 300
+        assert np.array_equal(restored.closed_trades(), ledger.closed_trades())
+
+    def test_analytics_scale(self) -> None:
+        """Analytics over hundreds of thousands of trades stay vectorized."""
+        ledger = TradeLedger()
+        n = 200_000
+        ledger.rows = np.zeros(n, dtype=ledger.rows.dtype)
+        ledger.rows["exit_ts"] = 600
+        ledger.rows["entry_price"] = 1.0
+        ledger.rows["exit_price"] = np.linspace(0.9, 1.1, n)
+        ledger.rows["base_amount"] = 1.0
+        ledger.rows["trigger"] = 1
+        ledger.rows["closed"] = True
+        ledger.count = n
+        assert ledger.analytics()["trades"] == n
+
+
+class TestStrategyLedger:
+    """Tests for the ledger inside MyStrategyStrategy."""
+
+    def test_backtest_round_trips_are_labelled(self, config: dict) -> None:
+        rng = np.random.default_rng(5)
+        timestamps = 1_700_000_000 + 60 * np.arange(20_000, dtype=np.int64)
+        prices = np.round(0.01 * np.exp(np.cumsum(rng.normal(0.0, 0.002, timestamps.shape[0]))), 8)
+        strategy = MyStrategyStrategy(config={**config, "rsi_timeframe": "15m", "buy_rsi": 45}, chain="base")
+        result = run_backtest(strategy, timestamps, prices)
+        stats = strategy.get_status()["ledger"]
+        sells = sum(1 for trade in result.filled_trades if trade.side == "sell")
+        assert stats["trades"] == sells
+        assert sum(item["trades"] for item in stats["per_trigger"].values()) == sells
+        assert "open" not in stats["per_trigger"]
+
+    def test_ledger_persists(self, config: dict) -> None:
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        strategy._ledger_row = strategy._ledger.open(
+            0, Decimal("1"), Decimal("1"), Decimal("1"), Decimal("0"), Decimal("0")
+        )
+        restored = MyStrategyStrategy(config=config, chain="base")
+        restored.load_persistent_state(json.loads(json.dumps(strategy.get_persistent_state())))
+        assert restored._ledger.count == 1
+        assert restored._ledger_row == 0
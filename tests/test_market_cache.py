@@ -0,0 +1,104 @@
+"""
+Tests for the shared market-data cache and the fleet runner.
+"""
+
+import threading
+import time
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from ..market_cache import SharedMarketCache, shared_market_cache
+from ..runner import FleetRunner
+from ..strategy import MyStrategyStrategy
+
+
+class TestSharedMarketCache:
+    """Tests for SharedMarketCache."""
+
+    def test_ttl_expiry(self) -> None:
+        now = [0.0]
+        cache = SharedMarketCache(ttl_seconds=5, clock=lambda: now[0])
+        fetch = MagicMock(return_value=1)
+        assert cache.get_or_fetch("k", fetch) == 1
+        assert cache.get_or_fetch("k", fetch) == 1
+        now[0] = 6.0
+        cache.get_or_fetch("k", fetch)
+        assert fetch.call_count == 2
+        assert cache.stats()["expirations"] == 1
+
+    def test_lru_eviction(self) -> None:
+        cache = SharedMarketCache(max_entries=2)
+        cache.get_or_fetch("a", lambda: 1)
+        cache.get_or_fetch("b", lambda: 2)
+        cache.get_or_fetch("a", lambda: 1)
+        cache.get_or_fetch("c", lambda: 3)
+        assert cache.get_or_fetch("a", lambda: -1) == 1
+        assert cache.get_or_fetch("b", lambda: -2) == -2
+        assert cache.stats()["evictions"] == 2
+
+    def test_concurrent_misses_coalesce(self) -> None:
+        cache = SharedMarketCache()
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return Decimal("0.01")
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_fetch("price", slow_fetch)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert results == [Decimal("0.01")] * 8
+        assert cache.stats()["coalesced"] == 7
+
+    def test_follower_wait_is_bounded(self) -> None:
+        """A caller waiting on a hung fetch gives up after wait_seconds instead of blocking with it."""
+        cache = SharedMarketCache()
+        release = threading.Event()
+        leader = threading.Thread(target=lambda: cache.get_or_fetch("price", lambda: release.wait(5) and 1))
+        leader.start()
+        while not cache._inflight:
+            time.sleep(0.001)
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            cache.get_or_fetch("price", lambda: 2, wait_seconds=0.05)
+        assert time.monotonic() - started < 1
+        assert cache.stats()["wait_timeouts"] == 1
+        release.set()
+        leader.join()
+        assert cache.get_or_fetch("price", lambda: 2) == 1
+
+    def test_errors_are_not_cached(self) -> None:
+        cache = SharedMarketCache()
+        with pytest.raises(RuntimeError):
+            cache.get_or_fetch("k", MagicMock(side_effect=RuntimeError("down")))
+        assert cache.get_or_fetch("k", lambda: 2) == 2
+
+
+class TestFleet:
+    """Tests for many strategy instances sharing one cache."""
+
+    def test_fleet_fetches_each_read_once(self, config: dict) -> None:
+        cfg = {**config, "shared_market_cache": True, "shared_market_cache_ttl_seconds": 30.5}
+        strategies = [MyStrategyStrategy(config={**cfg, "buy_rsi": 20 + i}, chain="base") for i in range(20)]
+        market = MagicMock()
+        market.price.side_effect = lambda token: (time.sleep(0.01), Decimal("0.01"))[1]
+        market.balance.return_value = Decimal("0")
+        market.rsi.return_value = Decimal("60")
+        runner = FleetRunner(strategies, max_workers=8)
+        intents = runner.tick(market)
+        runner.close()
+        assert len(intents) == 20
+        assert market.price.call_count == 1
+        assert market.rsi.call_count == 1
+        stats = shared_market_cache(30.5, 1024).stats()
+        assert stats["hits"] + stats["coalesced"] >= 19 * 4
@@ -0,0 +1,140 @@
+"""
+Tests for the Prometheus metrics exporter.
+"""
+
+import urllib.request
+from collections.abc import Iterator
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from ..metrics import MetricsServer, StrategyMetrics, metrics_server, render
+from ..portfolio import PortfolioStrategy
+from ..strategy import MyStrategyStrategy
+from .conftest import usdc_balance
+
+
+@pytest.fixture
+def server() -> Iterator[MetricsServer]:
+    """The process-wide server on a free port, which strategies with metrics_port 0 register with."""
+    server = metrics_server("127.0.0.1", 0)
+    registries = list(server.registries)
+    yield server
+    server.registries = registries
+
+
+def _market(rsi: str) -> MagicMock:
+    market = MagicMock()
+    market.price.return_value = Decimal("0.01")
+    market.balance.side_effect = usdc_balance()
+    market.rsi.return_value = Decimal(rsi)
+    return market
+
+
+def _samples(text: str) -> dict[str, float]:
+    return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line[:1] != "#"}
+
+
+class TestStrategyMetrics:
+    """Tests for StrategyMetrics and render."""
+
+    def test_publish_only_when_dirty(self) -> None:
+        metrics = StrategyMetrics(publish_interval=0, instance="a")
+        metrics.set("price", 1.5)
+        metrics.publish()
+        metrics.set("price", 1.5)
+        metrics.publish()
+        assert metrics.version == 1
+        metrics.inc("ticks_total", branch="idle")
+        assert b"ticks_total" not in render([metrics])
+        metrics.publish()
+        assert metrics.version == 2
+        assert b'my_strategy_ticks_total{branch="idle",instance="a"} 1\n' in render([metrics])
+
+    def test_tick_counter_publishes_on_cadence(self) -> None:
+        """ticks_total alone publishes once per interval; any other change publishes it at once."""
+        now = [0.0]
+        metrics = StrategyMetrics(publish_interval=5, clock=lambda: now[0], instance="a")
+        metrics.inc("ticks_total", branch="idle")
+        metrics.publish()
+        assert metrics.version == 1
+        for _ in range(3):
+            now[0] += 1
+            metrics.inc("ticks_total", branch="idle")
+            metrics.publish()
+        assert metrics.version == 1
+        metrics.set("price", 2.0)
+        metrics.publish()
+        assert metrics.version == 2
+        assert b'my_strategy_ticks_total{branch="idle",instance="a"} 4\n' in render([metrics])
+        now[0] += 1
+        metrics.inc("ticks_total", branch="idle")
+        metrics.publish()
+        assert metrics.version == 2
+        now[0] += 5
+        metrics.publish()
+        assert metrics.version == 3
+
+    def test_families_are_grouped_across_instances(self) -> None:
+        first, second = StrategyMetrics(instance="a"), StrategyMetrics(instance="b")
+        for metrics in (first, second):
+            metrics.inc("buys_total")
+            metrics.publish()
+        text = render([first, second]).decode()
+        assert text.count("# TYPE my_strategy_buys_total counter") == 1
+        assert _samples(text) == {
+            'my_strategy_buys_total{instance="a"}': 1.0,
+            'my_strategy_buys_total{instance="b"}': 1.0,
+        }
+
+
+class TestExporter:
+    """Tests for strategies feeding the HTTP endpoint."""
+
+    def test_scrape_counts_branches(self, config: dict, server: MetricsServer) -> None:
+        cfg = {**config, "metrics": True, "metrics_port": 0, "metrics_instance": "degen", "metrics_publish_seconds": 0}
+        strategy = MyStrategyStrategy(config=cfg, chain="base")
+        strategy.decide(_market("20"))
+        strategy.decide(_market("20"))
+        strategy.decide(_market("60"))
+        url = f"http://127.0.0.1:{server.port}/metrics"
+        body = urllib.request.urlopen(url).read().decode()
+        samples = _samples(body)
+        assert samples['my_strategy_ticks_total{branch="buy",instance="degen"}'] == 1.0
+        assert samples['my_strategy_ticks_total{branch="cooldown",instance="degen"}'] == 2.0
+        assert samples['my_strategy_buys_total{instance="degen"}'] == 1.0
+        assert samples['my_strategy_position_open{instance="degen",token="DEGEN"}'] == 0.0
+        assert samples['my_strategy_portfolio_value_usd{instance="degen"}'] == 100.0
+
+        urllib.request.urlopen(url).read()
+        renders = server.stats()["renders"]
+        urllib.request.urlopen(url).read()
+        assert server.stats()["renders"] == renders
+        strategy.decide(_market("60"))
+        urllib.request.urlopen(url).read()
+        assert server.stats()["renders"] == renders + 1
+
+    def test_close_unregisters_and_stops_idle_server(self, config: dict, server: MetricsServer) -> None:
+        """Closing an instance removes its samples; the last one to close shuts the endpoint down."""
+        server.registries = []
+        cfg = {**config, "metrics": True, "metrics_port": 0}
+        first = MyStrategyStrategy(config=cfg, chain="base")
+        second = MyStrategyStrategy(config=cfg, chain="base")
+        first.close()
+        assert server.registries == [second._metrics]
+        assert metrics_server("127.0.0.1", 0) is server
+        second.close()
+        assert server.registries == []
+        assert metrics_server("127.0.0.1", 0) is not server
+
+    def test_portfolio_reports_each_token(self, config: dict, server: MetricsServer) -> None:
+        cfg = {**config, "metrics": True, "metrics_port": 0, "portfolio_tokens": ["DEGEN", "BRETT"]}
+        index = len(server.registries)
+        strategy = PortfolioStrategy(config=cfg, chain="base")
+        strategy.decide(_market("60"))
+        samples = _samples(server.render().decode())
+        assert {key for key in samples if key.startswith("my_strategy_price")} == {
+            f'my_strategy_price{{instance="DEGEN-{index}",token="DEGEN"}}',
+            f'my_strategy_price{{instance="DEGEN-{index}",token="BRETT"}}',
+        }
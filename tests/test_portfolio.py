@@ -0,0 +1,146 @@
+"""
+Tests for the multi-asset portfolio mode.
+"""
+
+import json
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ..portfolio import PortfolioStrategy
+
+
+@pytest.fixture
+def config(config: dict) -> dict:
+    """Portfolio configuration built on config.json."""
+    return {
+        **config,
+        "portfolio_tokens": ["DEGEN", {"base_token": "BRETT", "base_token_address": "0x" + "b" * 40}, "TOSHI"],
+        "starting_capital_usd": 100,
+        "trade_amount_usd": 10,
+        "max_trade_amount_usd": 10,
+    }
+
+
+@pytest.fixture
+def market() -> MagicMock:
+    """Market with one shared USDC balance and per-token prices and RSI."""
+    prices = {"DEGEN": Decimal("0.01"), "BRETT": Decimal("0.1"), "TOSHI": Decimal("0.001")}
+    rsi = {"DEGEN": Decimal("45"), "0x" + "b" * 40: Decimal("30"), "TOSHI": Decimal("60")}
+    balances = {"USDC": Decimal("100")}
+    market = MagicMock()
+    market.price.side_effect = lambda token: prices[token]
+    market.rsi.side_effect = lambda token, period, timeframe: rsi[token]
+    market.balance.side_effect = lambda token: balances.get(token, Decimal("0"))
+    market.balances = balances
+    market.prices = prices
+    return market
+
+
+@pytest.fixture
+def strategy(config: dict) -> PortfolioStrategy:
+    """Create portfolio strategy instance for testing."""
+    return PortfolioStrategy(config=config, chain="base", wallet_address="0x" + "1" * 40)
+
+
+class TestPortfolioStrategy:
+    """Tests for PortfolioStrategy."""
+
+    def test_buys_most_oversold_token(self, strategy: PortfolioStrategy, market: MagicMock) -> None:
+        """Among tokens below buy_rsi the lowest RSI is entered first."""
+        intent = strategy.decide(market)
+        assert intent.to_token == "0x" + "b" * 40
+        assert intent.amount_usd == Decimal("10")
+
+    def test_quote_balance_fetched_once(self, strategy: PortfolioStrategy, market: MagicMock) -> None:
+        """The shared USDC balance is read once per tick, not once per token."""
+        strategy.decide(market)
+        quote_calls = [call for call in market.balance.call_args_list if call.args[0] == "USDC"]
+        assert len(quote_calls) == 1
+
+    def test_exit_takes_priority_and_state_is_per_token(self, strategy: PortfolioStrategy, market: MagicMock) -> None:
+        """An open position's take profit is emitted before any new entry."""
+        strategy.decide(market)
+        market.balances["TOSHI"] = Decimal("5000")
+        strategy.load_persistent_state(
+            {"portfolio": {"TOSHI": {"entry_price": "0.0009", "entry_ts": 1, "last_buy_ts": 1}}}
+        )
+
+        intent = strategy.decide(market)
+
+        assert intent.from_token == "TOSHI"
+        state = strategy.get_persistent_state()["portfolio"]
+        assert state["TOSHI"]["last_exit_reason"] == "take_profit"
+        assert state["BRETT"]["entry_price"] == "0.1"
+        assert state["DEGEN"]["entry_price"] is None
+
+    def test_missing_price_keeps_last_known_value(self, strategy: PortfolioStrategy, market: MagicMock) -> None:
+        """A token with no price this tick is valued at its last complete read, not at zero."""
+        market.balances["TOSHI"] = Decimal("1000")
+        strategy.decide(market)
+        assert strategy._last_portfolio_value_usd == Decimal("101")
+        market.prices["TOSHI"] = Decimal("0")
+        strategy.decide(market)
+        assert strategy._last_portfolio_value_usd == Decimal("101")
+
+    def test_unvalued_token_skips_portfolio_update(self, strategy: PortfolioStrategy, market: MagicMock) -> None:
+        """Until every token has been valued once, the totals are left alone."""
+        market.prices["TOSHI"] = Decimal("0")
+        strategy.decide(market)
+        assert strategy._last_portfolio_value_usd == Decimal("0")
+        assert strategy._last_total_profit_usd == Decimal("0")
+
+    def test_instrumentation_matches_single_token_stages(self, config: dict, market: MagicMock) -> None:
+        """The portfolio tick reports the same stages as the single-token decide()."""
+        strategy = PortfolioStrategy(config={**config, "enable_instrumentation": True}, chain="base")
+        strategy.decide(market)
+        strategy.decide(market)
+        report = strategy.get_status()["instrumentation"]
+        assert set(report["stages"]) == {"price", "quote_balance", "base_balance", "rsi", "status", "decision", "tick"}
+        assert report["stages"]["tick"]["count"] == 2
+        strategy._decide_rows = MagicMock(side_effect=RuntimeError("boom"))
+        assert "Error" in strategy.decide(market).reason
+        assert strategy.get_status()["instrumentation"]["exceptions"] == {"decision": 1}
+
+    def test_registers_only_configured_tokens(self, config: dict, market: MagicMock) -> None:
+        """The default base_token is not registered unless it is one of the portfolio tokens."""
+        registered = []
+
+        def register(strategy: PortfolioStrategy) -> bool:
+            registered.append(strategy.base_token_symbol)
+            return True
+
+        cfg = {**config, "portfolio_tokens": ["BRETT", "TOSHI"]}
+        with patch.object(PortfolioStrategy, "_register_base_token", register):
+            PortfolioStrategy(config=cfg, chain="base").decide(market)
+        assert sorted(registered) == ["BRETT", "TOSHI"]
+
+    def test_local_rsi_per_token(self, config: dict, market: MagicMock) -> None:
+        """Each token seeds its own local RSI, and the market RSI read stops once it is ready."""
+        closes = {"DEGEN": [0.01, 0.011] * 20, "0x" + "b" * 40: [0.1, 0.09] * 20, "TOSHI": [0.001] * 40}
+        market.ohlcv.side_effect = lambda token, timeframe, limit: [{"close": close} for close in closes[token]]
+        strategy = PortfolioStrategy(config={**config, "use_local_rsi": True}, chain="base")
+        strategy.decide(market)
+        rsi_reads = market.rsi.call_count
+        assert rsi_reads == 3
+        strategy.decide(market)
+        assert market.rsi.call_count == rsi_reads
+        state = strategy.get_persistent_state()["portfolio"]
+        assert state["DEGEN"]["local_rsi"] != state["BRETT"]["local_rsi"]
+
+    def test_restored_local_rsi_is_not_reseeded(self, config: dict, market: MagicMock) -> None:
+        """Per-token RSI restored from persistent state survives the first tick after a restart."""
+        closes = [{"close": 0.01 + 0.001 * (i % 3)} for i in range(40)]
+        market.ohlcv.side_effect = lambda token, timeframe, limit: closes
+        before = PortfolioStrategy(config={**config, "use_local_rsi": True}, chain="base")
+        before.decide(market)
+        state = json.loads(json.dumps(before.get_persistent_state(), default=str))
+        market.ohlcv.reset_mock()
+        after = PortfolioStrategy(config={**config, "use_local_rsi": True}, chain="base")
+        after.load_persistent_state(state)
+        after.decide(market)
+        market.ohlcv.assert_not_called()
+        restored = after.get_persistent_state()["portfolio"]["DEGEN"]["local_rsi"]
+        assert restored["avg_gain"] == state["portfolio"]["DEGEN"]["local_rsi"]["avg_gain"]
+        assert restored["avg_loss"] == state["portfolio"]["DEGEN"]["local_rsi"]["avg_loss"]
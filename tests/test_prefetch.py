@@ -0,0 +1,127 @@
+"""
+Tests for the concurrent market-data fetch stage.
+"""
+
+import time
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from ..prefetch import MarketPrefetcher
+from ..strategy import MyStrategyStrategy
+
+
+def _slow(value, delay: float):
+    def call(*args, **kwargs):
+        time.sleep(delay)
+        return value
+
+    return call
+
+
+def _raise():
+    raise RuntimeError("rsi backend down")
+
+
+@pytest.fixture
+def slow_market() -> MagicMock:
+    """Market whose reads each take 100ms."""
+    market = MagicMock()
+    market.price.side_effect = _slow(Decimal("0.01"), 0.1)
+    market.balance.side_effect = _slow(Decimal("0"), 0.1)
+    market.rsi.side_effect = _slow(Decimal("60"), 0.1)
+    return market
+
+
+class TestMarketPrefetcher:
+    """Tests for MarketPrefetcher."""
+
+    def test_reports_timed_out_calls(self) -> None:
+        """A call that misses the deadline is reported, not waited for."""
+        prefetcher = MarketPrefetcher(timeout_seconds=0.05)
+        started = time.perf_counter()
+        values, timed_out = prefetcher.fetch({"fast": lambda: 1, "slow": _slow(2, 0.5)})
+        assert time.perf_counter() - started < 0.3
+        assert values == {"fast": 1}
+        assert timed_out == ("slow",)
+        prefetcher.close()
+
+    def test_errors_are_raised_not_timed_out(self) -> None:
+        """A call that raises surfaces its exception instead of posing as a timeout."""
+        prefetcher = MarketPrefetcher(timeout_seconds=1.0)
+
+        def broken():
+            raise RuntimeError("rpc down")
+
+        with pytest.raises(RuntimeError, match="rpc down"):
+            prefetcher.fetch({"fast": lambda: 1, "broken": broken})
+        prefetcher.close()
+
+    def test_hung_call_is_not_resubmitted(self) -> None:
+        """A read still running from an earlier tick holds one worker, not one per tick."""
+        prefetcher = MarketPrefetcher(timeout_seconds=0.02, max_workers=2)
+        calls = []
+
+        def hung():
+            calls.append(1)
+            time.sleep(0.3)
+            return 2
+
+        for _ in range(5):
+            values, timed_out = prefetcher.fetch({"fast": lambda: 1, "slow": hung})
+            assert values == {"fast": 1}
+            assert timed_out == ("slow",)
+        assert len(calls) == 1
+        assert prefetcher.in_flight == ("slow",)
+        time.sleep(0.35)
+        assert prefetcher.in_flight == ()
+        prefetcher.timeout_seconds = 1.0
+        assert prefetcher.fetch({"slow": hung}) == ({"slow": 2}, ())
+        prefetcher.close()
+
+
+class TestConcurrentFetch:
+    """Tests for decide() with concurrent_fetch enabled."""
+
+    def test_tick_latency_is_slowest_call(self, config: dict, slow_market: MagicMock) -> None:
+        """Four 100ms reads complete in roughly one round trip."""
+        strategy = MyStrategyStrategy(config={**config, "concurrent_fetch": True}, chain="base")
+        started = time.perf_counter()
+        result = strategy.decide(slow_market)
+        elapsed = time.perf_counter() - started
+        assert elapsed < 0.3
+        assert "Insufficient" in result.reason
+
+    def test_slow_balance_degrades_to_hold(self, config: dict, slow_market: MagicMock) -> None:
+        """A balance read that times out holds instead of treating the position as closed."""
+        strategy = MyStrategyStrategy(
+            config={**config, "concurrent_fetch": True, "fetch_timeout_seconds": 0.2},
+            chain="base",
+        )
+        strategy._entry_price = Decimal("0.01")
+        slow_market.balance.side_effect = _slow(Decimal("5"), 1.0)
+        result = strategy.decide(slow_market)
+        assert "timed out" in result.reason
+        assert strategy._entry_price == Decimal("0.01")
+
+    def test_slow_price_degrades_to_no_price(self, config: dict, slow_market: MagicMock) -> None:
+        """A price read that times out falls into the existing No price hold."""
+        strategy = MyStrategyStrategy(
+            config={**config, "concurrent_fetch": True, "fetch_timeout_seconds": 0.2},
+            chain="base",
+        )
+        slow_market.price.side_effect = _slow(Decimal("0.01"), 1.0)
+        assert "No price" in strategy.decide(slow_market).reason
+
+    def test_fetch_error_is_attributed_to_fetch_stage(self, config: dict, slow_market: MagicMock) -> None:
+        """An error raised on a worker ends the tick in the error hold, counted against the fetch stage."""
+        strategy = MyStrategyStrategy(
+            config={**config, "concurrent_fetch": True, "enable_instrumentation": True},
+            chain="base",
+        )
+        strategy._instrument_fetchers = lambda fetchers: {**fetchers, "rsi": _raise}
+        result = strategy.decide(slow_market)
+        assert result.reason == "Error: rsi backend down"
+        assert strategy.get_status()["instrumentation"]["exceptions"] == {"fetch": 1}
+        strategy.close()
@@ -0,0 +1,121 @@
+"""
+Tests for the on-demand tick profiler.
+"""
+
+import json
+import os
+import signal
+import time
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from ..portfolio import PortfolioStrategy
+from ..profiler import TickProfiler
+from ..strategy import MyStrategyStrategy
+from .conftest import usdc_balance
+
+
+def _slow_price(token: str) -> Decimal:
+    time.sleep(0.01)
+    return Decimal("0.01")
+
+
+def _market() -> MagicMock:
+    market = MagicMock()
+    market.price.side_effect = _slow_price
+    market.balance.side_effect = usdc_balance()
+    market.rsi.return_value = Decimal("50")
+    return market
+
+
+def _read(base: str) -> tuple[list[str], list[dict]]:
+    with open(f"{base}.collapsed", encoding="utf-8") as f:
+        stacks = f.read().splitlines()
+    with open(f"{base}.jsonl", encoding="utf-8") as f:
+        summaries = [json.loads(line) for line in f]
+    return stacks, summaries
+
+
+class TestTickProfiler:
+    """Tests for profiling decide() ticks."""
+
+    def test_config_profiles_n_ticks(self, config: dict, tmp_path: Path) -> None:
+        cfg = {**config, "profile_ticks": 3, "profile_output_dir": str(tmp_path)}
+        strategy = MyStrategyStrategy(config=cfg, chain="base")
+        for _ in range(4):
+            strategy.decide(_market())
+        status = strategy.get_status()["profiler"]
+        assert status["active"] is False
+        assert status["sessions"] == 1
+        stacks, summaries = _read(status["last_output"])
+        assert [summary["tick"] for summary in summaries] == [0, 1, 2]
+        assert all(summary["branch"] == "idle" for summary in summaries)
+        assert summaries[0]["market_calls"]["price"]["count"] >= 1
+        assert summaries[0]["wall_ms"] >= 10
+        assert all(line.startswith("strategy:MyStrategyStrategy.decide;") for line in stacks)
+        assert any("test_profiler:_slow_price" in line for line in stacks)
+        assert len(os.listdir(tmp_path)) == 2
+
+    def test_idle_by_default(self, config: dict) -> None:
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        strategy.decide(_market())
+        assert strategy.get_status()["profiler"] is None
+
+    def test_control_file_arms(self, config: dict, tmp_path: Path) -> None:
+        control = tmp_path / "profile.ctl"
+        cfg = {**config, "profile_output_dir": str(tmp_path / "out"), "profile_control_path": str(control)}
+        strategy = MyStrategyStrategy(config=cfg, chain="base")
+        strategy.decide(_market())
+        assert strategy.get_status()["profiler"]["sessions"] == 0
+        control.write_text("2")
+        strategy._profiler._next_control_check = 0.0
+        strategy.decide(_market())
+        assert not control.exists()
+        assert strategy.get_status()["profiler"]["remaining_ticks"] == 1
+        strategy.decide(_market())
+        assert strategy.get_status()["profiler"]["sessions"] == 1
+
+    def test_signal_arms(self, config: dict, tmp_path: Path) -> None:
+        if not hasattr(signal, "SIGUSR2"):
+            pytest.skip("no SIGUSR2 on this platform")
+        previous = signal.getsignal(signal.SIGUSR2)
+        try:
+            cfg = {**config, "profile_output_dir": str(tmp_path), "profile_signal": "SIGUSR2"}
+            strategy = MyStrategyStrategy(config=cfg, chain="base")
+            strategy._profiler.default_ticks = 1
+            os.kill(os.getpid(), signal.SIGUSR2)
+            strategy.decide(_market())
+            assert strategy.get_status()["profiler"]["sessions"] == 1
+        finally:
+            signal.signal(signal.SIGUSR2, previous)
+
+    def test_reload_rearms(self, config: dict, tmp_path: Path) -> None:
+        strategy = MyStrategyStrategy(config={**config, "profile_output_dir": str(tmp_path)}, chain="base")
+        strategy.apply_config({"profile_ticks": 1})
+        strategy.decide(_market())
+        assert strategy.get_status()["profiler"]["sessions"] == 1
+
+    def test_portfolio_ticks(self, config: dict, tmp_path: Path) -> None:
+        cfg = {
+            **config,
+            "portfolio_tokens": ["DEGEN", "BRETT"],
+            "profile_ticks": 1,
+            "profile_output_dir": str(tmp_path),
+        }
+        strategy = PortfolioStrategy(config=cfg, chain="base")
+        strategy.decide(_market())
+        _, summaries = _read(strategy.get_status()["profiler"]["last_output"])
+        assert summaries[0]["market_calls"]["price"]["count"] >= 2
+
+    def test_request_while_active_queues(self, tmp_path: Path) -> None:
+        profiler = TickProfiler(str(tmp_path))
+        profiler.request(1)
+        assert profiler.begin_tick()
+        profiler.request(2)
+        profiler.end_tick()
+        assert profiler.stats()["sessions"] == 1
+        assert profiler.begin_tick()
+        assert profiler.remaining == 2
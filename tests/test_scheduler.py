@@ -0,0 +1,98 @@
+"""
+Tests for the adaptive tick scheduler.
+"""
+
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from ..scheduler import VolatilityTracker, recommend_delay
+from ..strategy import MyStrategyStrategy
+from ..triggers import TriggerLevels
+
+
+def _delay(**overrides) -> int:
+    kwargs = {
+        "now_ts": 1000,
+        "price": Decimal("1"),
+        "rsi": Decimal("60"),
+        "buy_rsi": Decimal("40"),
+        "levels": None,
+        "cooldown_ready_ts": None,
+        "exit_retry_ready_ts": None,
+        "variance_per_second": 1e-8,
+        "default_seconds": 60,
+        "min_seconds": 15,
+        "max_seconds": 600,
+    }
+    kwargs.update(overrides)
+    return recommend_delay(**kwargs)
+
+
+class TestVolatilityTracker:
+    """Tests for VolatilityTracker."""
+
+    def test_flat_prices_have_zero_variance(self) -> None:
+        tracker = VolatilityTracker()
+        for ts in range(0, 600, 60):
+            tracker.update(ts, Decimal("2"))
+        assert tracker.variance_per_second == 0
+
+    def test_moves_raise_variance(self) -> None:
+        tracker = VolatilityTracker()
+        tracker.update(0, Decimal("1"))
+        tracker.update(60, Decimal("1.01"))
+        assert tracker.variance_per_second > 0
+
+
+class TestRecommendDelay:
+    """Tests for recommend_delay."""
+
+    def test_no_price_uses_default(self) -> None:
+        assert _delay(price=None) == 60
+
+    def test_rsi_distance_scales_delay(self) -> None:
+        """Entries near buy_rsi poll fast, far ones back off to the maximum."""
+        assert _delay(rsi=Decimal("35")) == 15
+        assert 15 < _delay(rsi=Decimal("45")) < 600
+        assert _delay(rsi=Decimal("90")) == 600
+
+    def test_cooldown_sleeps_until_ready(self) -> None:
+        assert _delay(cooldown_ready_ts=1200) == 200
+
+    def test_position_near_level_polls_fast(self) -> None:
+        """Distance to the nearest level, scaled by volatility, sets the delay."""
+        levels = TriggerLevels.for_entry(Decimal("1"), 1000, Decimal("0.025"), Decimal("-0.02"), 10800)
+        near = _delay(price=Decimal("1.0249"), levels=levels, variance_per_second=1e-7)
+        far = _delay(price=Decimal("1.0"), levels=levels, variance_per_second=1e-7)
+        assert near == 15
+        assert far > near
+
+    def test_deadline_caps_delay(self) -> None:
+        levels = TriggerLevels.for_entry(Decimal("1"), 1000, Decimal("0.025"), Decimal("-0.02"), 100)
+        assert _delay(levels=levels, variance_per_second=0.0) == 100
+
+    def test_exit_retry_cooldown(self) -> None:
+        """A crossed level waiting on the exit retry cooldown sleeps until the retry."""
+        levels = TriggerLevels.for_entry(Decimal("1"), 1000, Decimal("0.025"), Decimal("-0.02"), 10800)
+        assert _delay(price=Decimal("1.03"), levels=levels, exit_retry_ready_ts=1300) == 300
+
+
+class TestStrategyNextTick:
+    """Tests for MyStrategyStrategy.get_next_tick_seconds."""
+
+    def test_bounds_from_config(self, config: dict) -> None:
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        assert strategy.min_interval_seconds == 15
+        assert strategy.max_interval_seconds == 600
+        assert strategy.get_next_tick_seconds() == strategy.interval_seconds
+
+    def test_idle_flat_strategy_backs_off(self, config: dict) -> None:
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        strategy._clock = lambda: 1000.0
+        market = MagicMock()
+        market.price.return_value = Decimal("0.01")
+        market.balance.side_effect = lambda token: Decimal("100") if token == "USDC" else Decimal("0")
+        market.rsi.return_value = Decimal("95")
+        strategy.decide(market)
+        assert strategy.get_next_tick_seconds() == 600
+        assert strategy.get_status()["next_tick_seconds"] == 600
@@ -0,0 +1,136 @@
+"""
+Tests for the multi-token RSI screener.
+"""
+
+import json
+import time
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from ..indicators import BatchWilderRSI, WilderRSI
+from ..screener import ScreenerStrategy
+from .conftest import usdc_balance
+
+
+class TestBatchWilderRSI:
+    """Tests for BatchWilderRSI."""
+
+    def test_matches_per_token_rsi(self) -> None:
+        rng = np.random.default_rng(7)
+        prices = 1.0 + np.cumsum(rng.normal(0, 0.01, size=(200, 5)), axis=0)
+        prices[40:60, 2] = np.nan
+        batch = BatchWilderRSI(5, 14, "1m")
+        singles = [WilderRSI(14, "1m") for _ in range(5)]
+        for step, row in enumerate(prices):
+            ts = step * 30
+            batch.update_tick(ts, row)
+            for single, price in zip(singles, row):
+                if not np.isnan(price):
+                    single.update_tick(ts, float(price))
+        expected = [single.value for single in singles]
+        assert np.allclose(batch.values(), expected)
+
+    def test_state_round_trip(self) -> None:
+        batch = BatchWilderRSI(3, 2, "1m")
+        for step in range(6):
+            batch.update_tick(step * 60, np.array([1.0 + step, 2.0 - step * 0.1, 0.0]))
+        restored = BatchWilderRSI(3, 2, "1m")
+        assert restored.load_state(json.loads(json.dumps(batch.to_state())))
+        assert np.array_equal(restored.values(), batch.values(), equal_nan=True)
+
+    def test_screening_500_tokens_is_fast(self) -> None:
+        rng = np.random.default_rng(1)
+        batch = BatchWilderRSI(500, 14, "1m")
+        ticks = 1000
+        prices = 1.0 + np.cumsum(rng.normal(0, 0.01, size=(ticks, 500)), axis=0)
+        started = time.perf_counter()
+        for step in range(ticks):
+            batch.update_tick(step * 60, prices[step])
+            batch.values()
+        assert (time.perf_counter() - started) / ticks < 0.005
+
+
+class TestScreenerStrategy:
+    """Tests for token selection in ScreenerStrategy."""
+
+    def test_enters_most_oversold_token(self, config: dict) -> None:
+        cfg = {
+            **config,
+            "rsi_period": 2,
+            "rsi_timeframe": "1m",
+            "cooldown_minutes": 0,
+            "screener_tokens": ["BRETT", "TOSHI"],
+        }
+        strategy = ScreenerStrategy(config=cfg, chain="base")
+        paths = {"BRETT": [1.0, 1.1, 1.2, 1.3], "TOSHI": [1.0, 0.9, 0.8, 0.7]}
+        now = [0]
+        strategy._clock = lambda: now[0]
+        market = MagicMock()
+        market.balance.side_effect = usdc_balance()
+        market.rsi.return_value = Decimal("60")
+        market.price.side_effect = lambda token: Decimal(str(paths.get(token, [0.01] * 4)[now[0] // 60]))
+        intent = None
+        for step in range(4):
+            now[0] = step * 60
+            intent = strategy.decide(market)
+        assert strategy.base_token_symbol == "TOSHI"
+        assert strategy.get_status()["screener"]["ranked"][0][0] == "TOSHI"
+        assert getattr(intent, "amount_usd", None) is not None
+        assert strategy._entry_price == Decimal("0.7")
+
+    def test_active_price_is_read_once_per_tick(self, config: dict) -> None:
+        """decide() reuses the price the screen read instead of fetching the active token again."""
+        strategy = ScreenerStrategy(config={**config, "screener_tokens": ["BRETT"]}, chain="base")
+        market = MagicMock(spec=["price", "balance", "rsi"])
+        market.balance.side_effect = usdc_balance()
+        market.rsi.return_value = Decimal("60")
+        market.price.return_value = Decimal("0.01")
+        strategy.decide(market)
+        strategy.decide(market)
+        reads = [call.args[0] for call in market.price.call_args_list]
+        assert reads.count("DEGEN") == 2
+        assert reads.count("BRETT") == 2
+        assert strategy._last_tick_price == Decimal("0.01")
+
+    def test_batch_rsi_is_seeded_from_ohlcv(self, config: dict) -> None:
+        """Candle history fills the screener RSI on the first tick, like _seed_local_rsi does for one token."""
+        cfg = {**config, "rsi_period": 3, "screener_tokens": ["BRETT"]}
+        strategy = ScreenerStrategy(config=cfg, chain="base")
+        history = {"BRETT": [1.0, 0.9, 0.8, 0.7, 0.6], "DEGEN": [0.01, 0.011, 0.012, 0.013, 0.014]}
+        market = MagicMock()
+        market.balance.side_effect = usdc_balance()
+        market.rsi.return_value = Decimal("60")
+        market.price.return_value = Decimal("0.01")
+        market.ohlcv.side_effect = lambda token, timeframe, limit: [{"close": c} for c in history.get(token, [])]
+        strategy.decide(market)
+        expected = WilderRSI(3, "1h")
+        expected.seed(history["BRETT"])
+        assert strategy.rank() == [("BRETT", pytest.approx(expected.value))]
+        assert not any("No candle history" in event["message"] for event in strategy._events.recent())
+
+    def test_configured_token_is_always_screened(self, config: dict) -> None:
+        strategy = ScreenerStrategy(config={**config, "screener_tokens": ["BRETT"]}, chain="base")
+        assert strategy.get_status()["screener"]["tokens"] == 2
+        assert strategy.base_token_address == config["base_token_address"]
+
+    def test_every_token_is_registered_on_first_tick(self, config: dict) -> None:
+        registered = []
+        market = MagicMock(spec=["price", "balance", "rsi"])
+        market.balance.side_effect = usdc_balance()
+        market.rsi.return_value = Decimal("60")
+        market.price.side_effect = lambda token: Decimal("0.01") if len(registered) == 3 else None
+
+        def register(strategy: ScreenerStrategy) -> bool:
+            registered.append(strategy.base_token_symbol)
+            return True
+
+        with patch.object(ScreenerStrategy, "_register_base_token", register):
+            strategy = ScreenerStrategy(config={**config, "screener_tokens": ["BRETT", "TOSHI"]}, chain="base")
+            assert registered == []
+            strategy.decide(market)
+        assert sorted(registered) == ["BRETT", "DEGEN", "TOSHI"]
+        assert strategy.base_token_symbol == "DEGEN"
+        assert strategy._last_tick_price == Decimal("0.01")
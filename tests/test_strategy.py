@@ -8,7 +8,7 @@ Template: blank
 import json
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from decimal import Decimal
 
 from ..strategy import MyStrategyStrategy
@@ -91,3 +91,34 @@ class TestMyStrategyStrategy:
 
         assert "strategy" in status
         assert "chain" in status
+
+    def test_base_token_registered_before_first_read(self, config: dict, mock_market: MagicMock) -> None:
+        """Construction skips the resolver; the first tick registers the base token before any market read."""
+        with patch.object(MyStrategyStrategy, "_register_base_token") as register:
+            strategy = MyStrategyStrategy(config=config, chain="base")
+            register.assert_not_called()
+            assert "token_registration" not in strategy.get_startup_report()
+            mock_market.price.side_effect = lambda token: register.assert_called_once() or Decimal("1.0")
+            strategy.decide(mock_market)
+            strategy.decide(mock_market)
+        register.assert_called_once()
+        assert "token_registration" in strategy.get_startup_report()
+
+    def test_compiled_thresholds(self, strategy: MyStrategyStrategy) -> None:
+        """Derived thresholds match the values decide() used to recompute every tick."""
+        thresholds = strategy._thresholds
+        assert thresholds.entry_required_profit_usd == (
+            strategy._round_trip_gas_buffer_usd() + strategy.min_net_profit_usd
+        )
+        assert thresholds.exit_required_profit_usd == strategy._sell_gas_buffer_usd() + strategy.min_net_profit_usd
+        assert thresholds.cooldown_seconds == strategy.cooldown_minutes * 60
+        assert thresholds.max_hold_seconds == strategy.max_hold_minutes * 60
+
+    @pytest.mark.parametrize("value", [Decimal("1.25"), 7, 0.1, "0.003", True, None, "abc"])
+    def test_to_decimal_fast_path_matches_str_conversion(self, value) -> None:
+        """Fast paths for Decimal and int give the same result as Decimal(str(value))."""
+        try:
+            expected = Decimal(str(value))
+        except Exception:
+            expected = Decimal("-1")
+        assert MyStrategyStrategy._to_decimal(value, Decimal("-1")) == expected
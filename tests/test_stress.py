@@ -0,0 +1,84 @@
+"""
+Tests for the Monte Carlo exit stress simulator.
+"""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from ..backtest import replay_backtest
+from ..stress import GBMModel, JumpModel, run_stress, sample_paths, simulate_exits, stress_test
+
+
+class TestPaths:
+    """Tests for the synthetic path models."""
+
+    def test_gbm_volatility(self) -> None:
+        paths = sample_paths(GBMModel(volatility=2.0), 4000, 1440, 60, np.random.default_rng(0))
+        assert paths.shape == (4000, 1441)
+        assert np.all(paths[:, 0] == 1.0)
+        daily = np.log(paths[:, -1]).std()
+        assert daily == pytest.approx(2.0 * np.sqrt(1 / 365), rel=0.05)
+
+    def test_jumps_gap_down(self) -> None:
+        rng = np.random.default_rng(0)
+        plain = sample_paths(GBMModel(), 2000, 1440, 60, rng)
+        jumpy = sample_paths(JumpModel(jumps_per_day=4, jump_mean=-0.05), 2000, 1440, 60, rng)
+        assert np.log(jumpy[:, -1]).mean() < np.log(plain[:, -1]).mean() - 0.15
+
+
+class TestSimulateExits:
+    """Tests for simulate_exits against decide()."""
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"exit_retry_cooldown_minutes": 2, "exit_escalation_window_minutes": 5, "max_hold_minutes": 60},
+            {"enforce_profit_only_exit": True, "sell_fraction": 0.5, "enable_gas_guard": False},
+        ],
+    )
+    def test_matches_decide(self, config: dict, overrides: dict) -> None:
+        cfg = {**config, "trade_amount_usd": 100, "take_profit_pct": 0.02, "stop_loss_pct": 0.015, **overrides}
+        rng = np.random.default_rng(5)
+        paths = np.round(sample_paths(JumpModel(volatility=3.0, jumps_per_day=20), 12, 240, 60, rng), 6)
+        fails = rng.random(paths.shape) < 0.4
+        result = simulate_exits(dict(cfg), paths, 60, swap_fails=fails)
+
+        timestamps = 1_700_000_000 + 60 * np.arange(paths.shape[1], dtype=np.int64)
+        for i, path in enumerate(paths):
+            replay = replay_backtest(
+                dict(cfg),
+                timestamps,
+                path,
+                np.full(path.shape[0], 100.0),
+                initial_quote_usd=Decimal("0"),
+                initial_base=Decimal("100"),
+                swap_fails=fails[i],
+            )
+            sells = [trade for trade in replay.trades if trade.side == "sell"]
+            assert len(sells) == result.attempts[i]
+            slippage = sum(float(t.base_amount * t.price * t.max_slippage) for t in sells if t.filled)
+            assert result.slippage_usd[i] == pytest.approx(slippage)
+            if replay.base_balance < Decimal(str(cfg["min_base_position"])):
+                assert result.exit_seconds[i] == sells[-1].index * 60
+            else:
+                assert np.isnan(result.exit_seconds[i])
+
+
+class TestStressTest:
+    """Tests for the batched stress run and its report."""
+
+    def test_swap_failures_cost_slippage(self, config: dict) -> None:
+        cfg = {**config, "trade_amount_usd": 100}
+        calm = stress_test(cfg, JumpModel(), 5000, swap_fail_prob=0.0, seed=3).summary()
+        failing = stress_test(cfg, JumpModel(), 5000, swap_fail_prob=0.5, seed=3).summary()
+        assert calm["attempts_mean"] == 1.0
+        assert failing["attempts_mean"] > 1.5
+        assert failing["slippage_mean_usd"] > calm["slippage_mean_usd"]
+        assert failing["pnl_cvar5_usd"] < calm["pnl_cvar5_usd"]
+
+    def test_run_stress_rows(self, config: dict) -> None:
+        rows = run_stress(config, [{"stop_loss_pct": 0.01}, {"stop_loss_pct": 0.05}], GBMModel(), 1000, seed=1)
+        assert [row["stop_loss_pct"] for row in rows] == [0.01, 0.05]
+        assert rows[0]["stop_loss_share"] > rows[1]["stop_loss_share"]
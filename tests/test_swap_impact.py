@@ -0,0 +1,194 @@
+"""
+Tests for the offline swap-impact model and buy capping.
+"""
+
+import json
+import math
+import os
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from ..strategy import MyStrategyStrategy
+from ..swap_impact import ConstantProductPool, PoolSnapshot, cap_amount, concentrated_pool
+from .conftest import usdc_balance
+
+_TICKS = [[-887220, 3e6], [100, -1e6], [400, -1.5e6], [900, -0.5e6], [887220, 0.0]]
+
+
+def _market() -> MagicMock:
+    market = MagicMock()
+    market.price.return_value = Decimal("1")
+    market.balance.side_effect = usdc_balance("1000")
+    market.rsi.return_value = Decimal("20")
+    return market
+
+
+def _walk(tick: int, liquidity: float, ticks: list[list[float]], amount: float, fee: float) -> float:
+    """Base received for ``amount`` quote in, crossing one initialized tick at a time."""
+    sqrt_price, remaining, received = math.sqrt(1.0001) ** tick, amount * (1 - fee), 0.0
+    for index, net in sorted(ticks):
+        if index <= tick:
+            continue
+        boundary = math.sqrt(1.0001) ** index
+        step = liquidity * (boundary - sqrt_price)
+        if remaining < step:
+            break
+        received += liquidity * (1 / sqrt_price - 1 / boundary)
+        remaining -= step
+        sqrt_price, liquidity = boundary, liquidity + net
+    else:
+        return math.nan
+    return received + liquidity * (1 / sqrt_price - 1 / (sqrt_price + remaining / liquidity))
+
+
+class TestPools:
+    """Tests for the pool models."""
+
+    def test_constant_product_matches_swap_output(self) -> None:
+        pool = ConstantProductPool(reserve_quote=10_000, reserve_base=1_000_000, fee=0.003)
+        amounts = np.array([0.0, 1.0, 50.0, 2_000.0])
+        net = amounts * 0.997
+        received = 1_000_000 * net / (10_000 + net)
+        with np.errstate(invalid="ignore"):
+            expected = np.where(amounts > 0, amounts / (received * pool.spot_price) - 1, 0.003 / 0.997)
+        assert pool.impact(amounts) == pytest.approx(expected)
+
+    def test_single_range_equals_constant_product(self) -> None:
+        liquidity, tick = 5e6, 0
+        pool = concentrated_pool({"tick": tick, "liquidity": liquidity, "fee": 0.0005, "ticks": []})
+        virtual = ConstantProductPool(reserve_quote=liquidity, reserve_base=liquidity, fee=0.0005)
+        amounts = np.geomspace(1, 1e6, 13)
+        assert pool.impact(amounts) == pytest.approx(virtual.impact(amounts))
+
+    def test_tick_crossing_matches_walk(self) -> None:
+        pool = concentrated_pool({"tick": 0, "liquidity": 3e6, "fee": 0.003, "ticks": _TICKS})
+        amounts = np.array([10.0, 1e4, 3e4, 5e4, 5.8e4])
+        impacts = pool.impact(amounts)
+        for amount, impact in zip(amounts, impacts):
+            received = _walk(0, 3e6, _TICKS, amount, 0.003)
+            assert impact == pytest.approx(amount / received - 1)
+        assert np.all(np.diff(impacts) > 0)
+        assert math.isnan(_walk(0, 3e6, _TICKS, 6e4, 0.003))
+        assert pool.impact(np.array([6e4]))[0] == math.inf
+
+    def test_quote_token0_is_mirrored(self) -> None:
+        mirrored = [[-index, -net] for index, net in _TICKS]
+        token1 = concentrated_pool({"tick": 50, "liquidity": 3e6, "ticks": _TICKS})
+        token0 = concentrated_pool({"tick": -50, "liquidity": 3e6, "ticks": mirrored, "quote_is_token0": True})
+        amounts = np.array([10.0, 3e4, 5.5e4])
+        assert token0.impact(amounts) == pytest.approx(token1.impact(amounts))
+
+    def test_mirrored_boundary_on_current_tick(self) -> None:
+        """With quote as token0, an initialized tick at the current tick is the first crossing."""
+        token0 = concentrated_pool(
+            {"tick": -50, "liquidity": 3e6, "ticks": [[-50, 2e6], [-400, 1e6]], "quote_is_token0": True}
+        )
+        token1 = concentrated_pool(
+            {
+                "tick": 49,
+                "sqrt_price_x96": math.sqrt(1.0001) ** 50 * 2**96,
+                "liquidity": 3e6,
+                "ticks": [[50, -2e6], [400, -1e6]],
+            }
+        )
+        amounts = np.array([10.0, 1e3, 1e4])
+        assert token0.bounds[0] == pytest.approx(token0.sqrt_price)
+        assert token0.impact(amounts) == pytest.approx(token1.impact(amounts))
+        unbounded = concentrated_pool({"tick": 0, "liquidity": 3e6, "ticks": []})
+        assert np.all(token0.impact(amounts) > unbounded.impact(amounts))
+
+    def test_sqrt_price_and_decimals(self) -> None:
+        spec = {"tick": 0, "liquidity": 5e12, "ticks": [], "quote_decimals": 6, "sqrt_price_x96": 2**96}
+        scaled = concentrated_pool(spec)
+        human = concentrated_pool({"tick": 0, "liquidity": 5e6, "ticks": []})
+        assert scaled.spot_price == 1.0
+        assert scaled.impact(np.array([100.0])) == pytest.approx(human.impact(np.array([100.0])))
+
+    def test_cap_amount(self) -> None:
+        pool = ConstantProductPool(reserve_quote=10_000, reserve_base=1_000_000, fee=0.003)
+        size, impact = cap_amount(pool, 100.0, 0.006, 32)
+        assert size == 100 * 9 / 32
+        assert impact <= 0.006 < pool.impact(np.array([100 * 10 / 32]))[0]
+        assert cap_amount(pool, 100.0, 0.002, 32)[0] == 0.0
+
+
+class TestPoolSnapshot:
+    """Tests for loading and reloading the snapshot file."""
+
+    def test_reloads_on_change(self, tmp_path: Path) -> None:
+        path = tmp_path / "snapshot.json"
+        snapshot = PoolSnapshot(str(path))
+        assert snapshot.get("aerodrome", "DEGEN") is None
+        assert snapshot.error is not None
+        spec = {"protocol": "Aerodrome", "base": "$degen", "reserve_quote": 10, "reserve_base": 20}
+        path.write_text(json.dumps({"pools": [spec]}))
+        assert snapshot.get("aerodrome", "DEGEN") == ConstantProductPool(10.0, 20.0)
+        path.write_text(json.dumps({"pools": [{**spec, "reserve_quote": 30}]}))
+        os.utime(path, (1, 1))
+        assert snapshot.get("aerodrome", "DEGEN").reserve_quote == 30.0
+        path.write_text(json.dumps({"pools": [{**spec, "kind": "stable"}]}))
+        assert snapshot.get("aerodrome", "DEGEN") is None
+        assert "stable" in snapshot.error
+
+
+class TestStrategyCap:
+    """Tests for decide() capping buys to the slippage budget."""
+
+    def _strategy(self, config: dict, tmp_path: Path, reserve_quote: float) -> MyStrategyStrategy:
+        path = tmp_path / "snapshot.json"
+        pool = {"protocol": "aerodrome", "base": "DEGEN", "reserve_quote": reserve_quote, "reserve_base": 1e6}
+        path.write_text(json.dumps({"pools": [pool]}))
+        cfg = {
+            **config,
+            "swap_protocol": "aerodrome",
+            "trade_amount_usd": 100,
+            "max_trade_amount_usd": 0,
+            "compound_profits": False,
+            "min_trade_amount_usd": 5,
+            "buy_max_slippage": 0.012,
+            "enable_gas_guard": False,
+            "swap_impact": True,
+            "swap_impact_snapshot": str(path),
+        }
+        return MyStrategyStrategy(config=cfg, chain="base")
+
+    def test_buy_is_capped(self, config: dict, tmp_path: Path) -> None:
+        strategy = self._strategy(config, tmp_path, 10_000)
+        intent = strategy.decide(_market())
+        assert intent.amount_usd == Decimal("28.125")
+        assert strategy.get_status()["swap_impact"]["requested_usd"] == "100"
+
+    def test_deep_pool_keeps_size(self, config: dict, tmp_path: Path) -> None:
+        intent = self._strategy(config, tmp_path, 1e9).decide(_market())
+        assert intent.amount_usd == Decimal("100")
+
+    def test_thin_pool_blocks_buy(self, config: dict, tmp_path: Path) -> None:
+        strategy = self._strategy(config, tmp_path, 500)
+        intent = strategy.decide(_market())
+        assert intent.intent_type == "HOLD"
+        assert intent.reason.startswith("Swap impact blocked buy")
+        assert strategy._tick_branch == "swap_impact"
+
+    def test_missing_pool_buys_uncapped(self, config: dict, tmp_path: Path) -> None:
+        strategy = self._strategy(config, tmp_path, 10_000)
+        strategy.base_token_symbol = "BRETT"
+        assert strategy.decide(_market()).amount_usd == Decimal("100")
+
+    def test_skipped_check_warns_once_per_snapshot(self, config: dict, tmp_path: Path, capsys) -> None:
+        """A missing pool warns once per snapshot version and clears the last capping result."""
+        strategy = self._strategy(config, tmp_path, 10_000)
+        strategy.decide(_market())
+        assert strategy.get_status()["swap_impact"] is not None
+        strategy.base_token_symbol = "BRETT"
+        capsys.readouterr()
+        for _ in range(3):
+            assert strategy._cap_for_swap_impact(Decimal("100")) == (Decimal("100"), "")
+        assert strategy.get_status()["swap_impact"] is None
+        assert capsys.readouterr().out.count("Swap impact check skipped") == 1
+        os.utime(tmp_path / "snapshot.json", (1, 1))
+        strategy._cap_for_swap_impact(Decimal("100"))
+        assert capsys.readouterr().out.count("Swap impact check skipped") == 1
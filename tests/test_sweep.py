@@ -0,0 +1,56 @@
+"""
+Tests for the parallel parameter sweep.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ..backtest import run_backtest
+from ..sweep import grid_points, random_points, run_sweep
+
+
+@pytest.fixture
+def candles() -> tuple[np.ndarray, np.ndarray]:
+    """Three days of deterministic 1-minute closes."""
+    rng = np.random.default_rng(11)
+    timestamps = 1_700_000_000 + 60 * np.arange(4_320, dtype=np.int64)
+    prices = 0.01 * np.exp(np.cumsum(rng.normal(0.0, 0.002, timestamps.shape[0])))
+    return timestamps, np.round(prices, 8)
+
+
+class TestSweep:
+    """Tests for run_sweep."""
+
+    def test_grid_points_cover_product(self) -> None:
+        """Every combination of the grid is produced once."""
+        points = grid_points({"buy_rsi": [30, 40], "take_profit_pct": [0.01, 0.02, 0.03]})
+        assert len(points) == 6
+        assert {"buy_rsi": 40, "take_profit_pct": 0.03} in points
+
+    def test_random_points_are_reproducible(self) -> None:
+        """Random search is seeded."""
+        space = {"buy_rsi": {"min": 20, "max": 50}, "compound_factor": [0.5, 1.0]}
+        assert random_points(space, 5, seed=3) == random_points(space, 5, seed=3)
+
+    def test_rejects_unknown_keys(self, config: dict, candles) -> None:
+        """Typos in the spec fail before any work is scheduled."""
+        with pytest.raises(ValueError, match="buy_rsii"):
+            run_sweep(config, [{"buy_rsii": 30}], *candles)
+
+    def test_results_match_single_backtest_and_are_ranked(self, config: dict, candles, tmp_path: Path) -> None:
+        """Workers reproduce run_backtest and rows come back ranked."""
+        cfg = {**config, "rsi_timeframe": "15m", "starting_capital_usd": 100, "trade_amount_usd": 10}
+        points = grid_points({"buy_rsi": [35, 45, 55], "stop_loss_pct": [0.01, 0.03]})
+        output = tmp_path / "sweep.csv"
+
+        rows = run_sweep(cfg, points, *candles, workers=2, output_path=output)
+
+        assert [row["rank"] for row in rows] == list(range(1, len(points) + 1))
+        profits = [row["total_profit_usd"] for row in rows]
+        assert profits == sorted(profits, reverse=True)
+        best = rows[0]
+        expected = run_backtest({**cfg, "buy_rsi": best["buy_rsi"], "stop_loss_pct": best["stop_loss_pct"]}, *candles)
+        assert best["total_profit_usd"] == pytest.approx(float(expected.total_profit_usd))
+        assert output.read_text().startswith("rank,")
@@ -0,0 +1,137 @@
+"""
+Tests for the market tape recorder and replayer.
+"""
+
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ..strategy import MyStrategyStrategy
+from ..tape import RECORD, TapeError, TapeMarket, TapeRecorder, replay_tape
+
+
+class ScriptedMarket:
+    """Random-walk market whose balances follow the strategy's swaps."""
+
+    def __init__(self, quote_token: str, seed: int = 3) -> None:
+        self.quote_token = quote_token
+        self.rng = np.random.default_rng(seed)
+        self.ts = 1_700_000_000
+        self.price_value = 0.01
+        self.quote = Decimal("100")
+        self.base = Decimal("0")
+
+    def advance(self) -> None:
+        self.ts += 60
+        self.price_value *= float(np.exp(self.rng.normal(0.0, 0.01)))
+
+    def now(self) -> float:
+        return float(self.ts)
+
+    def price(self, token: str) -> float:
+        if self.rng.random() < 0.05:
+            raise RuntimeError("price feed down")
+        return round(self.price_value, 10)
+
+    def balance(self, token: str) -> Decimal:
+        return self.quote if token in ("USDC", self.quote_token) else self.base
+
+    def rsi(self, token: str, period: int = 14, timeframe: str = "1h") -> float | None:
+        if self.rng.random() < 0.05:
+            return None
+        return float(self.rng.uniform(10, 90))
+
+    def fill(self, intent) -> None:
+        price = Decimal(str(round(self.price_value, 10)))
+        if intent.amount_usd is not None:
+            self.quote -= Decimal(str(intent.amount_usd))
+            self.base += Decimal(str(intent.amount_usd)) / price
+        else:
+            self.base -= Decimal(str(intent.amount))
+            self.quote += Decimal(str(intent.amount)) * price
+
+
+def _key(intent) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in vars(intent).items()))
+
+
+class TestTape:
+    """Tests for recording decide() inputs and replaying them."""
+
+    def test_replay_reproduces_intents(self, config: dict, tmp_path: Path) -> None:
+        """Replaying a tape through a fresh strategy yields the recorded intents."""
+        path = str(tmp_path / "market.tape")
+        live = MyStrategyStrategy(config={**config, "market_tape_path": path, "cooldown_minutes": 0}, chain="base")
+        market = ScriptedMarket(live.quote_token)
+        live._clock = market.now
+        recorded = []
+        for _ in range(500):
+            market.advance()
+            intent = live.decide(market)
+            if getattr(intent, "from_token", None) is not None:
+                market.fill(intent)
+            recorded.append(_key(intent))
+        live._tape.close()
+        assert any("from_token" in dict(key) for key in recorded)
+
+        replayed = MyStrategyStrategy(config={**config, "cooldown_minutes": 0}, chain="base")
+        assert [_key(intent) for intent in replay_tape(replayed, path)] == recorded
+
+    def test_records_are_fixed_width(self, config: dict, tmp_path: Path) -> None:
+        """Each tick writes one clock record plus one per market read."""
+        path = tmp_path / "market.tape"
+        live = MyStrategyStrategy(config={**config, "market_tape_path": str(path)}, chain="base")
+        market = ScriptedMarket(live.quote_token, seed=11)
+        live._clock = market.now
+        live.decide(market)
+        live._tape.close()
+        tape = TapeMarket(str(path))
+        assert tape.ticks == 1
+        assert (path.stat().st_size - 64) % RECORD.itemsize == 0
+        assert len(tape.records) == live._tape.records
+
+    def test_close_flushes_the_tape(self, config: dict, tmp_path: Path) -> None:
+        """Closing the strategy writes out the tape, so every record is readable afterwards."""
+        path = tmp_path / "market.tape"
+        live = MyStrategyStrategy(config={**config, "market_tape_path": str(path)}, chain="base")
+        market = ScriptedMarket(live.quote_token, seed=5)
+        live._clock = market.now
+        live.decide(market)
+        recorder = live._tape
+        live.close()
+        assert live._tape is None
+        assert recorder._file.closed
+        assert len(TapeMarket(str(path)).records) == recorder.records
+
+    def test_unrecorded_read_raises(self, tmp_path: Path, config: dict) -> None:
+        path = str(tmp_path / "market.tape")
+        live = MyStrategyStrategy(config={**config, "market_tape_path": path}, chain="base")
+        market = ScriptedMarket(live.quote_token)
+        live._clock = market.now
+        live.decide(market)
+        live._tape.close()
+        tape = TapeMarket(path)
+        tape.select(0)
+        with pytest.raises(TapeError):
+            tape.price("UNKNOWN")
+
+    def test_oversized_values_do_not_break_live_reads(self, tmp_path: Path) -> None:
+        """A value or token id too long for its field is flagged or dropped; the live read still returns."""
+        path = str(tmp_path / "market.tape")
+        recorder = TapeRecorder(path)
+        long_price = Decimal("0." + "1" * 80)
+        source = ScriptedMarket("USDC")
+        source.price = lambda token: long_price
+        market = recorder.wrap(source, 1_700_000_000)
+        assert market.price("DEGEN") == long_price
+        assert market.balance("0x" + "a" * 80) == Decimal("0")
+        assert market.balance("USDC") == Decimal("100")
+        recorder.close()
+        assert (recorder.overflowed, recorder.dropped) == (1, 1)
+        tape = TapeMarket(path)
+        tape.select(0)
+        with pytest.raises(TapeError, match="too long"):
+            tape.price("DEGEN")
+        assert tape.balance("USDC") == Decimal("100")
@@ -0,0 +1,110 @@
+"""
+Tests for precomputed trigger levels and the price watcher.
+"""
+
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from ..strategy import MyStrategyStrategy
+from ..triggers import PriceWatcher, TriggerLevels
+
+
+def _market(price: str, base_balance: str = "0", rsi: str = "60") -> MagicMock:
+    market = MagicMock()
+    market.price.return_value = Decimal(price)
+    market.balance.side_effect = lambda token: Decimal(base_balance) if token != "USDC" else Decimal("100")
+    market.rsi.return_value = Decimal(rsi)
+    return market
+
+
+class TestTriggerLevels:
+    """Tests for TriggerLevels."""
+
+    def test_levels_match_config(self) -> None:
+        """Boundaries are absolute prices and a deadline derived from the entry."""
+        levels = TriggerLevels.for_entry(Decimal("2"), 1000, Decimal("0.025"), Decimal("-0.02"), 600)
+        assert levels.take_profit_price == Decimal("2.050")
+        assert levels.stop_loss_price == Decimal("1.960")
+        assert levels.deadline_ts == 1600
+
+    def test_crossed(self) -> None:
+        """Only prices outside the band, or profit past the deadline, count as crossed."""
+        levels = TriggerLevels.for_entry(Decimal("2"), 1000, Decimal("0.025"), Decimal("-0.02"), 600)
+        assert not levels.crossed(Decimal("2.01"), 1100)
+        assert levels.crossed(Decimal("2.05"), 1100)
+        assert levels.crossed(Decimal("1.96"), 1100)
+        assert levels.crossed(Decimal("2.01"), 1600)
+        assert not levels.crossed(Decimal("1.99"), 1600)
+
+    def test_profit_only_exit_has_no_stop(self) -> None:
+        """Without a stop-loss floor, falling prices never cross."""
+        levels = TriggerLevels.for_entry(Decimal("2"), 1000, Decimal("0.025"), None, 600)
+        assert levels.stop_loss_price is None
+        assert not levels.crossed(Decimal("0.5"), 1100)
+
+
+class TestStrategyTriggers:
+    """Tests for trigger levels on MyStrategyStrategy."""
+
+    def test_buy_sets_levels(self, config: dict) -> None:
+        """The BUY branch stores levels next to the entry price."""
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        strategy._clock = lambda: 1000.0
+        result = strategy.decide(_market("0.01", rsi="20"))
+        assert getattr(result, "from_token", None) is not None
+        levels = strategy.get_trigger_levels()
+        assert levels.entry_price == Decimal("0.01")
+        assert levels.take_profit_price == Decimal("0.01") * (1 + strategy.take_profit_pct)
+        assert levels.deadline_ts == 1000 + strategy.max_hold_minutes * 60
+        assert strategy.get_status()["trigger_levels"]["deadline_ts"] == levels.deadline_ts
+
+    def test_restart_fallback_and_reset(self, config: dict) -> None:
+        """An adopted position gets levels; a closed one clears them."""
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        strategy.decide(_market("0.01", base_balance="5"))
+        assert strategy.get_trigger_levels() is not None
+        strategy.decide(_market("0.01"))
+        assert strategy.get_trigger_levels() is None
+
+    def test_levels_restored_from_state(self, config: dict) -> None:
+        """Levels are rebuilt from persisted entry state."""
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        strategy.load_persistent_state({"entry_price": "0.01", "entry_ts": 1000})
+        assert strategy.get_trigger_levels().deadline_ts == 1000 + strategy.max_hold_minutes * 60
+
+
+class TestPriceWatcher:
+    """Tests for PriceWatcher."""
+
+    def test_sleeps_inside_band(self, config: dict) -> None:
+        """Between boundaries the watcher reads only the price."""
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        strategy._clock = lambda: 1000.0
+        strategy.load_persistent_state({"entry_price": "0.01", "entry_ts": 1000})
+        watcher = PriceWatcher(strategy, max_idle_seconds=3600)
+        market = _market("0.0101", base_balance="5")
+        watcher.poll(market)
+        market.reset_mock()
+        for _ in range(10):
+            assert watcher.poll(market) is None
+        assert market.balance.call_count == 0
+        assert market.rsi.call_count == 0
+        assert watcher.stats() == {"polls": 11, "wakes": 1}
+
+    def test_wakes_on_take_profit(self, config: dict) -> None:
+        """Crossing the take-profit price runs decide() and exits."""
+        config = {**config, "enable_gas_guard": False}
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        strategy._clock = lambda: 1000.0
+        strategy.load_persistent_state({"entry_price": "0.01", "entry_ts": 1000})
+        watcher = PriceWatcher(strategy, max_idle_seconds=3600)
+        watcher.poll(_market("0.0101", base_balance="5"))
+        result = watcher.poll(_market("0.0103", base_balance="5"))
+        assert getattr(result, "to_token", None) == strategy.quote_token
+
+    def test_flat_always_wakes(self, config: dict) -> None:
+        """Without a position every poll runs the full decide()."""
+        strategy = MyStrategyStrategy(config=config, chain="base")
+        watcher = PriceWatcher(strategy)
+        assert watcher.poll(_market("0.01")) is not None
+        assert watcher.poll(_market("0.01")) is not None
@@ -0,0 +1,96 @@
+"""
+Precomputed exit boundaries for an open position and a cheap price watcher
+that only wakes the strategy when one of them is crossed.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+# Trigger prices are compared with a small inward margin so rounding in the
+# precomputed boundary can never hide a tick that decide() would act on.
+_WAKE_MARGIN = Decimal("1e-12")
+
+
+@dataclass(frozen=True, slots=True)
+class TriggerLevels:
+    entry_price: Decimal
+    take_profit_price: Decimal
+    stop_loss_price: Decimal | None
+    deadline_ts: int | None
+
+    @classmethod
+    def for_entry(
+        cls,
+        entry_price: Decimal,
+        entry_ts: int | None,
+        take_profit_pct: Decimal,
+        stop_loss_floor_pct: Decimal | None,
+        max_hold_seconds: int,
+    ) -> "TriggerLevels":
+        return cls(
+            entry_price=entry_price,
+            take_profit_price=entry_price * (1 + take_profit_pct),
+            stop_loss_price=entry_price * (1 + stop_loss_floor_pct) if stop_loss_floor_pct is not None else None,
+            deadline_ts=entry_ts + max_hold_seconds if entry_ts is not None else None,
+        )
+
+    def crossed(self, price: Decimal, now_ts: int) -> bool:
+        if price >= self.take_profit_price * (1 - _WAKE_MARGIN):
+            return True
+        if self.stop_loss_price is not None and price <= self.stop_loss_price * (1 + _WAKE_MARGIN):
+            return True
+        return self.deadline_ts is not None and now_ts >= self.deadline_ts and price > self.entry_price
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "entry_price": str(self.entry_price),
+            "take_profit_price": str(self.take_profit_price),
+            "stop_loss_price": str(self.stop_loss_price) if self.stop_loss_price is not None else None,
+            "deadline_ts": self.deadline_ts,
+        }
+
+
+class PriceWatcher:
+    """Polls only the price while a position sits between its boundaries.
+
+    ``poll`` runs the full ``decide()`` when the strategy is flat (entries need
+    RSI), when a boundary is crossed, or at least every ``max_idle_seconds`` so
+    balance changes are still noticed.  Otherwise it returns ``None`` after a
+    single price read.
+    """
+
+    def __init__(self, strategy: Any, max_idle_seconds: int = 900) -> None:
+        self.strategy = strategy
+        self.max_idle_seconds = max_idle_seconds
+        self.polls = 0
+        self.wakes = 0
+        self._last_wake_ts: int | None = None
+
+    def should_wake(self, price: Decimal, now_ts: int) -> bool:
+        levels = self.strategy.get_trigger_levels()
+        if levels is None or price <= 0:
+            return True
+        if self._last_wake_ts is None or now_ts - self._last_wake_ts >= self.max_idle_seconds:
+            return True
+        return levels.crossed(price, now_ts)
+
+    def poll(self, market: Any) -> Any | None:
+        self.polls += 1
+        strategy = self.strategy
+        now_ts = int(strategy._clock())
+        if strategy.get_trigger_levels() is not None:
+            price = strategy._price_with_fallback(
+                market,
+                strategy.base_token_price_id,
+                strategy.base_token_symbol,
+                strategy.base_token_address,
+            )
+            if not self.should_wake(price, now_ts):
+                return None
+        self.wakes += 1
+        self._last_wake_ts = now_ts
+        return strategy.decide(market)
+
+    def stats(self) -> dict[str, Any]:
+        return {"polls": self.polls, "wakes": self.wakes}